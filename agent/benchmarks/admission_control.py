@@ -0,0 +1,117 @@
+"""
+Burst test for admission control and the shared outbound rate limiter.
+
+Runs the FastAPI app in-process against the stub LLM, with the stub enforcing
+synthetic provider rate limits (STUB_LLM_RATE_LIMIT / STUB_SEARCH_RATE_LIMIT),
+and fires a burst of concurrent blog requests from several tenants through
+/copilotkit/agents/execute in three configurations:
+
+    unthrottled   no client-side rate limit, generous admission limits
+    rate limited  token buckets just under the stub's limits
+    admission     rate limited, plus a small concurrency cap and queue
+
+For each it reports completed/rejected/failed runs, provider 429s, p50/p95
+run latency and how quickly rejected runs were turned away.
+
+Run from the agent directory:
+    python -m benchmarks.admission_control [--runs 24] [--tenants 4] [--provider-rate 10]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Dict, List
+from uuid import uuid4
+
+
+def configure_environment(provider_rate: float) -> None:
+    os.environ["HTTP_REPLAY_MODE"] = "stub"
+    os.environ["STUB_LLM_RATE_LIMIT"] = str(provider_rate)
+    os.environ["STUB_SEARCH_RATE_LIMIT"] = str(provider_rate)
+    os.environ.setdefault("CHECKPOINTER_BACKEND", "memory")
+    os.environ.setdefault("SEARCH_CACHE_PATH", "")
+    os.environ.setdefault("SEARCH_INDEX_PATH", "")
+    os.environ.setdefault("SUMMARY_CACHE_BACKEND", "memory")
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    os.environ.setdefault("YDC_API_KEY", "benchmark")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def provider_429s() -> float:
+    from prometheus_client import REGISTRY
+
+    return sum(REGISTRY.get_sample_value("blog_agent_http_request_duration_seconds_count", {"upstream": upstream, "status": "4xx"}) or 0 for upstream in ("openai", "ydc"))
+
+
+async def run_blog_request(client, tenant: str) -> Dict[str, float]:
+    body = {
+        "name": "blog-post-generator",
+        "threadId": str(uuid4()),
+        "state": {},
+        "messages": [{"id": str(uuid4()), "type": "TextMessage", "role": "user", "content": "Write a blog post about the latest trends in AI agents"}],
+        "actions": [],
+    }
+    start = time.perf_counter()
+    try:
+        response = await client.post("/copilotkit/agents/execute", json=body, headers={"x-api-key": tenant})
+        status = "rejected" if response.status_code == 429 else "completed" if response.status_code == 200 else "failed"
+    except Exception:
+        status = "failed"
+    return {"status": status, "latency": time.perf_counter() - start}
+
+
+async def run_scenario(name: str, runs: int, tenants: int, rate: float, admission: Dict[str, float]) -> None:
+    import httpx
+
+    from src.app import admission_controller, app
+    from src.utils.ratelimit import configure_rate_limit
+
+    for upstream in ("openai", "ydc"):
+        configure_rate_limit(upstream, rate, max(1, int(rate)))
+    for attribute, value in admission.items():
+        setattr(admission_controller, attribute, value)
+
+    # let the stub's buckets refill between scenarios
+    await asyncio.sleep(2)
+    errors_before = provider_429s()
+    start = time.perf_counter()
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark", timeout=600) as client:
+        results = await asyncio.gather(*(run_blog_request(client, f"tenant-{i % tenants}") for i in range(runs)))
+    elapsed = time.perf_counter() - start
+
+    by_status: Dict[str, List[float]] = {"completed": [], "rejected": [], "failed": []}
+    for result in results:
+        by_status[result["status"]].append(result["latency"])
+    completed = by_status["completed"]
+    print(
+        f"{name:<13} {len(completed):>9} {len(by_status['rejected']):>8} {len(by_status['failed']):>6} {provider_429s() - errors_before:>13.0f}"
+        f" {percentile(completed, 0.5):>7.2f}s {percentile(completed, 0.95):>7.2f}s {percentile(by_status['rejected'], 0.5) * 1000:>9.1f}ms {elapsed:>7.2f}s"
+    )
+
+
+async def main(runs: int, tenants: int, provider_rate: float) -> None:
+    limited = provider_rate * 0.9
+    generous = {"max_concurrency": runs, "max_per_key": runs, "max_queue": runs, "max_wait": 600}
+    print(f"Burst of {runs} blog requests from {tenants} tenants, stub provider limit {provider_rate} req/s per upstream\n")
+    print(f"{'scenario':<13} {'completed':>9} {'rejected':>8} {'failed':>6} {'provider 429s':>13} {'p50':>8} {'p95':>8} {'reject p50':>11} {'total':>8}")
+    await run_scenario("unthrottled", runs, tenants, 0, generous)
+    await run_scenario("rate limited", runs, tenants, limited, generous)
+    await run_scenario("admission", runs, tenants, limited, {"max_concurrency": 4, "max_per_key": 2, "max_queue": 4, "max_wait": 30})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=24)
+    parser.add_argument("--tenants", type=int, default=4)
+    parser.add_argument("--provider-rate", type=float, default=10)
+    args = parser.parse_args()
+    configure_environment(args.provider_rate)
+    asyncio.run(main(args.runs, args.tenants, args.provider_rate))
@@ -0,0 +1,87 @@
+"""
+Throughput benchmark for batch blog generation against the stub LLM.
+
+Generates a content calendar of topics through BatchRunner at several
+concurrency levels and reports posts/minute, with fresh caches and a fresh
+checkpoint database per level. One in ten topics repeats an earlier one with
+different casing or punctuation, as real calendars do, and is generated once.
+A final pass runs a second batch over the same topics to show searches and
+summaries being reused across batches.
+
+Outbound rate limits are disabled so the numbers reflect the runner itself;
+with LLM_RATE_LIMIT set, throughput is capped at roughly
+LLM_RATE_LIMIT * 60 / 8 posts/minute (8 model calls per post).
+
+Run from the agent directory:
+    python -m benchmarks.batch_throughput [--topics 60] [--concurrency 1 4 16]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+from typing import List
+
+os.environ["HTTP_REPLAY_MODE"] = "stub"
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("YDC_API_KEY", "benchmark")
+os.environ.setdefault("CHECKPOINTER_BACKEND", "memory")
+os.environ.setdefault("SEARCH_CACHE_PATH", "")
+os.environ.setdefault("SEARCH_INDEX_PATH", "")
+os.environ.setdefault("SUMMARY_CACHE_BACKEND", "memory")
+os.environ.setdefault("LLM_RATE_LIMIT", "0")
+os.environ.setdefault("SEARCH_RATE_LIMIT", "0")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from src.batch import BatchRunner  # noqa: E402
+from src.cache.search_cache import get_search_cache  # noqa: E402
+from src.cache.summary_cache import get_summary_cache  # noqa: E402
+from src.checkpoint import SQLiteCheckpointStore  # noqa: E402
+from src.graph.graph import graph  # noqa: E402
+
+SUBJECTS = ["AI agents", "vector databases", "Rust async", "edge computing", "platform engineering", "LLM evaluation", "data contracts", "WebAssembly"]
+ANGLES = ["for beginners", "in production", "trends this year", "cost optimization", "security pitfalls", "case studies", "tooling landscape", "team adoption"]
+
+
+def make_topics(count: int) -> List[str]:
+    topics = [f"{subject} {angle}" for angle in ANGLES for subject in SUBJECTS][:count]
+    for i in range(0, len(topics), 10):
+        topics.insert(i + 5, topics[i].upper() + "?")
+    return topics[:count]
+
+
+async def run_batch(topics: List[str], concurrency: int, batch_id: str, directory: str) -> None:
+    checkpointer = SQLiteCheckpointStore(os.path.join(directory, "checkpoints.sqlite3"))
+    batch_graph = graph.builder.compile(checkpointer=checkpointer)
+    runner = BatchRunner(batch_graph, concurrency)
+    try:
+        async for _ in runner.run(topics, batch_id):
+            pass
+    finally:
+        await checkpointer.close()
+    summary = runner.summary
+    print(
+        f"{batch_id:<10} {concurrency:>11} {summary.topics:>7} {summary.completed:>9} {summary.failed:>6}"
+        f" {summary.search_requests:>13} {summary.search_reuses:>13} {summary.elapsed:>8.1f}s {summary.posts_per_minute:>10.1f}"
+    )
+
+
+async def main(count: int, levels: List[int]) -> None:
+    topics = make_topics(count)
+    print(f"{len(topics)} topics submitted\n")
+    print(f"{'batch':<10} {'concurrency':>11} {'topics':>7} {'completed':>9} {'failed':>6} {'searches sent':>13} {'searches reused':>13} {'elapsed':>9} {'posts/min':>10}")
+    for concurrency in levels:
+        get_search_cache().clear()
+        get_summary_cache().backend.clear()
+        with tempfile.TemporaryDirectory() as directory:
+            await run_batch(topics, concurrency, f"c{concurrency}", directory)
+            if concurrency == levels[-1]:
+                await run_batch(topics, concurrency, "c{0}-again".format(concurrency), directory)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+    asyncio.run(main(args.topics, args.concurrency))
@@ -0,0 +1,63 @@
+"""
+Measure storage size and reconstruction latency of delta-encoded blog post revisions.
+
+Simulates a 50-revision editing session on a ~2000 word post, where each
+revision edits a few paragraphs, and compares full-copy storage with the
+snapshot + delta encoding used by BlogRevisionStore.
+
+Run from the agent directory:
+    python -m benchmarks.blog_revisions
+"""
+
+import random
+import statistics
+import time
+
+from src.checkpoint import revisions
+from src.checkpoint.revisions import BlogRevisionStore
+from src.schema.schema import BlogPost
+
+REVISIONS = 50
+PARAGRAPHS = 60
+WORDS_PER_PARAGRAPH = 35
+
+
+def synthetic_session(seed: int = 7):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(500)]
+    paragraphs = [" ".join(rng.choices(vocabulary, k=WORDS_PER_PARAGRAPH)) for _ in range(PARAGRAPHS)]
+    for revision in range(REVISIONS):
+        for _ in range(rng.randint(1, 3)):
+            paragraphs[rng.randrange(len(paragraphs))] = " ".join(rng.choices(vocabulary, k=WORDS_PER_PARAGRAPH))
+        content = "# Synthetic post\n\n" + "\n\n".join(f"## Section {i // 6}\n{p}" if i % 6 == 0 else p for i, p in enumerate(paragraphs))
+        yield BlogPost(title=f"Synthetic post v{revision}", content=content)
+
+
+def main():
+    posts = list(synthetic_session())
+    full_size = sum(len(post.content.encode("utf-8")) for post in posts)
+
+    # measure cold reconstruction, without the read cache
+    revisions.BLOG_REVISION_CACHE_SIZE = 0
+    store = BlogRevisionStore(":memory:")
+    for post in posts:
+        store.save("thread", post)
+    stored = store.list("thread")
+    delta_size = sum(revision.size for revision in stored)
+
+    latencies = []
+    for revision in stored:
+        start = time.perf_counter()
+        post = store.load("thread", revision.revision)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert post.content == posts[revision.revision].content
+    store.close()
+
+    print(f"Revisions:                {len(stored)} (snapshot every {store.snapshot_interval})")
+    print(f"Full copies:              {full_size / 1024:8.1f} KB")
+    print(f"Snapshots + deltas:       {delta_size / 1024:8.1f} KB ({delta_size / full_size:.1%} of full)")
+    print(f"Reconstruction p50 / max: {statistics.median(latencies):.2f} ms / {max(latencies):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
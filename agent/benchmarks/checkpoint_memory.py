@@ -0,0 +1,86 @@
+"""
+Compare process RSS under many simulated sessions for the plain MemorySaver and the bounded checkpoint stores.
+
+Each backend runs in its own subprocess. Every session writes several multi-KB
+blog post revisions, like a generate + feedback conversation.
+
+Run from the agent directory:
+    python -m benchmarks.checkpoint_memory [sessions]
+"""
+
+import asyncio
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+
+from src.checkpoint import MemoryCheckpointStore, RetentionPolicy, SQLiteCheckpointStore  # noqa: E402
+from src.schema.schema import BlogPost  # noqa: E402
+from src.state.state import AgentState  # noqa: E402
+
+TURNS_PER_SESSION = 6
+POST_WORDS = 2000
+SAMPLES = 5
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def write_post(state: AgentState) -> AgentState:
+    revision = len(state.messages)
+    return {"blog_post": BlogPost(title=f"Revision {revision}", content=" ".join(f"word{revision}-{i}" for i in range(POST_WORDS)))}
+
+
+def create_checkpointer(backend: str):
+    retention = RetentionPolicy(keep_last=2, idle_ttl=3600, compaction_interval=0)
+    if backend == "memory_saver":
+        return MemorySaver()
+    if backend == "memory_store":
+        return MemoryCheckpointStore(retention)
+    return SQLiteCheckpointStore(os.path.join(tempfile.mkdtemp(), "checkpoints.sqlite3"), retention)
+
+
+async def run(backend: str, sessions: int) -> None:
+    builder = StateGraph(AgentState)
+    builder.add_node("write_post", write_post)
+    builder.set_entry_point("write_post")
+    builder.add_edge("write_post", END)
+    checkpointer = create_checkpointer(backend)
+    graph = builder.compile(checkpointer=checkpointer)
+
+    step = max(sessions // SAMPLES, 1)
+    for session in range(sessions):
+        config = {"configurable": {"thread_id": f"session-{session}"}}
+        for turn in range(TURNS_PER_SESSION):
+            await graph.ainvoke({"messages": [HumanMessage(content=f"turn {turn}")]}, config)
+        if (session + 1) % step == 0:
+            print(f"{backend:>14}  sessions={session + 1:>5}  rss={rss_mb():8.1f} MB", flush=True)
+
+    if hasattr(checkpointer, "close"):
+        await checkpointer.close()
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--backend":
+        asyncio.run(run(sys.argv[2], int(sys.argv[3])))
+        return
+
+    sessions = sys.argv[1] if len(sys.argv) > 1 else "500"
+    for backend in ["memory_saver", "memory_store", "sqlite"]:
+        subprocess.run([sys.executable, "-m", "benchmarks.checkpoint_memory", "--backend", backend, sessions], check=True, env={**os.environ, "LOG_LEVEL": "WARNING"})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Cold start profile: import time of the server module and time to liveness and readiness.
+
+Imports src.app in fresh interpreters under `python -X importtime` and
+reports the median import time with the heaviest top-level packages by
+self time, then the time the deferred warmup (CopilotKit, LangGraph, the
+nodes and LLM clients, graph compilation) takes in a fresh process. Finally
+starts the server under uvicorn in each STARTUP_MODE and measures the time
+from launch to the first 200 from /health (liveness) and from /ready
+(readiness). Everything runs on the stub, so no network is needed.
+
+Run from the agent directory:
+    python -m benchmarks.cold_start [--runs 5] [--top 12] [--no-server]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+ENV = {
+    "HTTP_REPLAY_MODE": "stub",
+    "CHECKPOINTER_BACKEND": "memory",
+    "SEARCH_CACHE_PATH": "",
+    "SEARCH_INDEX_PATH": "",
+    "SUMMARY_CACHE_BACKEND": "memory",
+    "LOG_LEVEL": "WARNING",
+}
+WARMUP_SCRIPT = "import time; start = time.perf_counter(); from src.server.startup import _build_sdk; _build_sdk(); print(time.perf_counter() - start)"
+
+
+def environment(**overrides: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(ENV, **overrides)
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    env.setdefault("YDC_API_KEY", "benchmark")
+    return env
+
+
+def profile_imports(module: str) -> Tuple[float, Dict[str, float]]:
+    """Import a module under -X importtime; return the total seconds and the self seconds per top-level package."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], env=environment(), capture_output=True, text=True, check=True)
+    total = 0.0
+    packages: Dict[str, float] = defaultdict(float)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (field.strip() for field in line[len("import time:"):].split("|"))
+        packages[name.split(".")[0]] += int(self_us) / 1e6
+        if name == module:
+            total = int(cumulative_us) / 1e6
+    return total, packages
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_server_start(mode: str, timeout: float = 120) -> Tuple[Optional[float], Optional[float]]:
+    """Start uvicorn in a STARTUP_MODE and return the seconds to the first 200 from /health and from /ready."""
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app:app", "--port", str(port)], env=environment(STARTUP_MODE=mode), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    live = ready = None
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as client:
+            while ready is None and time.perf_counter() - start < timeout:
+                try:
+                    if live is None and client.get("/health").status_code == 200:
+                        live = time.perf_counter() - start
+                    if live is not None and client.get("/ready").status_code == 200:
+                        ready = time.perf_counter() - start
+                except httpx.HTTPError:
+                    pass
+                time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+    return live, ready
+
+
+def main(runs: int, top: int, server: bool) -> None:
+    profile_imports("src.app")  # compile bytecode so every measured run starts from the same cache state
+    totals: List[float] = []
+    packages: Dict[str, List[float]] = defaultdict(list)
+    for _ in range(runs):
+        total, by_package = profile_imports("src.app")
+        totals.append(total)
+        for package, seconds in by_package.items():
+            packages[package].append(seconds)
+
+    print(f"import src.app: {statistics.median(totals):.3f}s median of {runs} runs\n")
+    print(f"{'package':<28} {'self':>8}")
+    heaviest = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))[:top]
+    for package, seconds in heaviest:
+        print(f"{package:<28} {statistics.median(seconds):>7.3f}s")
+
+    warmups = [float(subprocess.run([sys.executable, "-c", WARMUP_SCRIPT], env=environment(), capture_output=True, text=True, check=True).stdout) for _ in range(runs)]
+    print(f"\nwarmup (deferred imports and graph compilation): {statistics.median(warmups):.3f}s median")
+
+    if server:
+        print(f"\n{'startup mode':<14} {'liveness':>9} {'readiness':>10}")
+        for mode in ("lazy", "eager"):
+            live, ready = time_server_start(mode)
+            print(f"{mode:<14} {live or float('nan'):>8.2f}s {ready or float('nan'):>9.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    parser.add_argument("--no-server", dest="server", action="store_false", help="Skip starting the server")
+    args = parser.parse_args()
+    main(args.runs, args.top, args.server)
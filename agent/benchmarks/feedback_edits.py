@@ -0,0 +1,114 @@
+"""
+Wall time and output tokens of patch-based versus full-regeneration feedback edits.
+
+Runs feedback_node on a synthetic ~2000 word, eight section post for edits
+of growing size, once with FEEDBACK_EDIT_MODE=full (the model returns the
+whole post) and once with patch (the model returns edits that are applied
+locally). The model is a local fake that answers with the canned output
+after LATENCY seconds plus TOKEN_DELAY per output token, roughly a hosted
+GPT-4o model, so wall time follows output tokens as it does in production.
+
+The last two cases show the fallbacks: a requested rewrite and an edit
+whose text is not in the post both pay for the edits call and then for the
+full regeneration.
+
+Run from the agent directory:
+    python -m benchmarks.feedback_edits
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Any, List, Tuple
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("BLOG_STREAMING", "false")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from langchain_core.runnables import RunnableLambda  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+
+from src.nodes import blog_edits, feedback_node  # noqa: E402
+from src.schema.schema import BlogEdit, BlogEdits, BlogPost  # noqa: E402
+from src.state.state import AgentState  # noqa: E402
+from src.utils.tokens import count_tokens  # noqa: E402
+
+LATENCY = 0.4
+TOKEN_DELAY = 0.01
+SECTIONS = 8
+PARAGRAPHS_PER_SECTION = 4
+WORDS_PER_PARAGRAPH = 60
+
+rng = random.Random(7)
+VOCABULARY = [f"word{i}" for i in range(800)]
+
+
+def paragraphs(count: int) -> str:
+    return "\n\n".join(" ".join(rng.choices(VOCABULARY, k=WORDS_PER_PARAGRAPH)) for _ in range(count))
+
+
+def make_post() -> BlogPost:
+    body = "\n\n".join(f"## Section {i}\n\n{paragraphs(PARAGRAPHS_PER_SECTION)}" for i in range(1, SECTIONS + 1))
+    return BlogPost(title="Synthetic post", content=f"# Synthetic post\n\n{paragraphs(2)}\n\n{body}\n")
+
+
+def cases(post: BlogPost) -> List[Tuple[str, BlogEdits]]:
+    typo = " ".join(post.content.split("## Section 3\n\n")[1].split(" ")[4:8])
+    return [
+        ("fix a typo", BlogEdits(edits=[BlogEdit(operation="replace_text", section=3, find=typo, content=typo.replace(" ", "  ", 1))])),
+        ("retitle", BlogEdits(edits=[BlogEdit(operation="set_title", content="A better title")])),
+        ("rewrite a section", BlogEdits(edits=[BlogEdit(operation="replace_section", section=2, content=f"## Section 2\n\n{paragraphs(PARAGRAPHS_PER_SECTION)}")])),
+        ("add a section", BlogEdits(edits=[BlogEdit(operation="insert_after_section", section=4, content=f"## New section\n\n{paragraphs(PARAGRAPHS_PER_SECTION)}")])),
+        (
+            "rewrite half",
+            BlogEdits(
+                edits=[BlogEdit(operation="replace_section", section=i, content=f"## Section {i}\n\n{paragraphs(PARAGRAPHS_PER_SECTION)}") for i in range(1, SECTIONS // 2 + 1)]
+            ),
+        ),
+        ("rewrite request", BlogEdits(edits=[], rewrite=True)),
+        ("edit not found", BlogEdits(edits=[BlogEdit(operation="replace_text", section=1, find="not in the post", content="x")])),
+    ]
+
+
+class FakeModels:
+    """Stands in for get_structured_model, answering edits and full posts after a latency proportional to their tokens."""
+
+    def __init__(self, edits: BlogEdits, rewritten: BlogPost):
+        self.outputs = {BlogEdits: edits, BlogPost: rewritten}
+        self.output_tokens = 0
+
+    def __call__(self, name: str, schema: type) -> RunnableLambda:
+        async def answer(messages: Any) -> BaseModel:
+            output = self.outputs[schema]
+            tokens = count_tokens(output.model_dump_json())
+            self.output_tokens += tokens
+            await asyncio.sleep(LATENCY + tokens * TOKEN_DELAY)
+            return output
+
+        return RunnableLambda(answer)
+
+
+async def run(mode: str, post: BlogPost, edits: BlogEdits) -> Tuple[float, int]:
+    models = FakeModels(edits, make_post())
+    blog_edits.get_structured_model = feedback_node.get_structured_model = models
+    feedback_node.FEEDBACK_EDIT_MODE = mode
+    state = AgentState(messages=[HumanMessage(content="Please apply my feedback")], blog_post=post)
+    start = time.perf_counter()
+    await feedback_node.feedback_node(state, config={})
+    return time.perf_counter() - start, models.output_tokens
+
+
+async def main() -> None:
+    post = make_post()
+    print(f"post: {len(post.content.split())} words, {count_tokens(post.content)} tokens\n")
+    print(f"{'edit':<18} {'full':>8} {'tokens':>7} {'patch':>8} {'tokens':>7} {'speedup':>8}")
+    for name, edits in cases(post):
+        full_time, full_tokens = await run("full", post, edits)
+        patch_time, patch_tokens = await run("patch", post, edits)
+        print(f"{name:<18} {full_time:>7.2f}s {full_tokens:>7} {patch_time:>7.2f}s {patch_tokens:>7} {full_time / patch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
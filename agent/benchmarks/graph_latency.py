@@ -0,0 +1,113 @@
+"""
+Offline latency benchmark for the blog post graph.
+
+Drives graph.ainvoke through router -> web_search -> generate_blog and then
+router -> feedback on fresh threads, and reports per-node wall time, p50/p95
+end-to-end latency per turn, prompt/completion tokens and peak traced memory.
+
+LLM and search calls go through the HTTP record/replay layer:
+    --mode stub     synthetic responses, no fixtures needed (default)
+    --mode record   call the real APIs and save fixtures to HTTP_REPLAY_DIR
+    --mode replay   serve the saved fixtures with their recorded latency
+
+Run from the agent directory:
+    python -m benchmarks.graph_latency [--mode stub|record|replay] [--iterations 5]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from typing import Any, Dict, List
+from uuid import uuid4
+
+
+def configure_environment(mode: str) -> None:
+    os.environ["HTTP_REPLAY_MODE"] = mode
+    os.environ.setdefault("HTTP_REPLAY_DIR", os.path.join(os.path.dirname(__file__), "fixtures", "http"))
+    os.environ.setdefault("CHECKPOINTER_BACKEND", "memory")
+    os.environ.setdefault("SEARCH_CACHE_PATH", "")
+    os.environ.setdefault("SEARCH_INDEX_PATH", "")
+    os.environ.setdefault("SUMMARY_CACHE_BACKEND", "memory")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if mode != "record":
+        os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+        os.environ.setdefault("YDC_API_KEY", "benchmark")
+
+
+TURNS = [
+    ("generate", "Write a blog post about the latest trends in AI agents"),
+    ("feedback", "Make the introduction shorter and punchier"),
+]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+async def run_turn(graph: Any, thread_id: str, text: str, node_times: Dict[str, List[float]], usage: Dict[str, int]) -> float:
+    from langchain_core.callbacks import AsyncCallbackHandler
+    from langchain_core.messages import HumanMessage
+
+    class UsageHandler(AsyncCallbackHandler):
+        async def on_llm_end(self, response, **kwargs):
+            for generations in response.generations:
+                for generation in generations:
+                    metadata = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                    usage["prompt"] += metadata.get("input_tokens", 0)
+                    usage["completion"] += metadata.get("output_tokens", 0)
+
+    config = {"configurable": {"thread_id": thread_id}, "callbacks": [UsageHandler()]}
+    started: Dict[str, float] = {}
+    start = time.perf_counter()
+    async for event in graph.astream({"messages": [HumanMessage(content=text)]}, config, stream_mode="debug"):
+        payload = event.get("payload", {})
+        if event["type"] == "task":
+            started[payload["id"]] = time.perf_counter()
+        elif event["type"] == "task_result" and payload["id"] in started:
+            node_times[payload["name"]].append(time.perf_counter() - started.pop(payload["id"]))
+    return time.perf_counter() - start
+
+
+async def main(iterations: int) -> None:
+    from src.cache.search_cache import get_search_cache
+    from src.cache.summary_cache import get_summary_cache
+    from src.graph.graph import graph
+
+    node_times: Dict[str, List[float]] = defaultdict(list)
+    turn_times: Dict[str, List[float]] = defaultdict(list)
+    usage = {"prompt": 0, "completion": 0}
+
+    tracemalloc.start()
+    for _ in range(iterations):
+        get_search_cache().clear()
+        get_summary_cache().backend.clear()
+        thread_id = str(uuid4())
+        for name, text in TURNS:
+            turn_times[name].append(await run_turn(graph, thread_id, text, node_times, usage))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Iterations: {iterations}")
+    print("\nEnd-to-end latency per turn")
+    for name, times in turn_times.items():
+        print(f"  {name:<10} p50 {percentile(times, 0.5):7.3f}s   p95 {percentile(times, 0.95):7.3f}s")
+    print("\nWall time per node (mean)")
+    for name, times in sorted(node_times.items()):
+        print(f"  {name:<14} {statistics.mean(times):7.3f}s  over {len(times)} runs")
+    print(f"\nTokens: {usage['prompt']} prompt, {usage['completion']} completion ({usage['prompt'] / iterations:.0f} / {usage['completion'] / iterations:.0f} per iteration)")
+    print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["stub", "record", "replay"], default="stub")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    configure_environment(args.mode)
+    sys.exit(asyncio.run(main(args.iterations)))
@@ -0,0 +1,137 @@
+"""
+Readiness of one worker under load: how often /ready turns it away, and why.
+
+Starts the server on the stub with a small admission limit, waits for
+/ready, then drives a burst of concurrent conversations through the
+CopilotKit agent endpoint while polling /ready and /health. Reports, per
+phase (idle, load, after), the share of polls answered not ready with the
+reasons given, the worst event loop lag and admission queue depth seen, and
+the p50/p95 latency of the health endpoints themselves, which must stay
+fast while the worker is busy.
+
+Run from the agent directory:
+    python -m benchmarks.health_readiness [--conversations 24] [--concurrency 24] [--max-concurrency 4]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List
+from uuid import uuid4
+
+import httpx
+
+from benchmarks.server_throughput import free_port, percentile, run_turn, stop_server
+
+PHASES = ("idle", "load", "after")
+
+
+def start_server(port: int, directory: str, max_concurrency: int) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(
+        PORT=str(port),
+        HTTP_REPLAY_MODE="stub",
+        CHECKPOINTER_BACKEND="sqlite",
+        CHECKPOINT_DB_PATH=os.path.join(directory, "checkpoints.sqlite3"),
+        SEARCH_CACHE_PATH=os.path.join(directory, "search_cache.sqlite3"),
+        SUMMARY_CACHE_PATH=os.path.join(directory, "summary_cache"),
+        SEARCH_INDEX_PATH="",
+        ADMISSION_MAX_CONCURRENCY=str(max_concurrency),
+        ADMISSION_MAX_PER_KEY=str(max_concurrency),
+        HEALTH_MAX_QUEUE_DEPTH=str(max_concurrency),
+        HEALTH_PROBE_INTERVAL="1",
+        STUB_TOKEN_DELAY="0",
+        LOG_LEVEL="WARNING",
+    )
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    env.setdefault("YDC_API_KEY", "benchmark")
+    command = [sys.executable, "-m", "uvicorn", "src.app:app", "--port", str(port)]
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_ready(client: httpx.AsyncClient, timeout: float = 120) -> float:
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return time.perf_counter() - start
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.05)
+    raise RuntimeError("Server did not become ready")
+
+
+async def poll(client: httpx.AsyncClient, phase: List[str], samples: Dict[str, List[dict]], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        ready = await client.get("/ready")
+        ready_latency = time.perf_counter() - start
+        start = time.perf_counter()
+        await client.get("/health")
+        samples[phase[0]].append({**ready.json(), "ready_latency": ready_latency, "live_latency": time.perf_counter() - start})
+        await asyncio.sleep(0.1)
+
+
+async def run(port: int, conversations: int, concurrency: int) -> None:
+    samples: Dict[str, List[dict]] = {name: [] for name in PHASES}
+    phase = ["idle"]
+    stop = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=300) as client:
+        print(f"ready {await wait_until_ready(client):.2f}s after launch\n")
+        poller = asyncio.ensure_future(poll(client, phase, samples, stop))
+        await asyncio.sleep(2)
+
+        async def conversation() -> None:
+            async with semaphore:
+                await run_turn(client, str(uuid4()), "Write a blog post about the latest trends in AI agents")
+
+        phase[0] = "load"
+        start = time.perf_counter()
+        await asyncio.gather(*(conversation() for _ in range(conversations)))
+        load_seconds = time.perf_counter() - start
+        phase[0] = "after"
+        await asyncio.sleep(2)
+        stop.set()
+        await poller
+
+    print(f"{conversations} conversations at client concurrency {concurrency} in {load_seconds:.1f}s\n")
+    print(f"{'phase':<6} {'polls':>6} {'not ready':>10} {'max lag':>8} {'max queue':>10} {'ready p50/p95':>16} {'health p50/p95':>16}  reasons")
+    for name in PHASES:
+        polls = samples[name]
+        if not polls:
+            continue
+        reasons = Counter(reason for sample in polls for reason in sample["reasons"])
+        not_ready = sum(1 for sample in polls if not sample["ready"]) / len(polls)
+        ready_latency = [sample["ready_latency"] * 1000 for sample in polls]
+        live_latency = [sample["live_latency"] * 1000 for sample in polls]
+        print(
+            f"{name:<6} {len(polls):>6} {not_ready:>10.0%} {max(sample['loop_lag'] for sample in polls):>7.3f}s {max(sample['queue_depth'] for sample in polls):>10}"
+            f" {f'{percentile(ready_latency, 0.5):.1f}/{percentile(ready_latency, 0.95):.1f} ms':>16} {f'{percentile(live_latency, 0.5):.1f}/{percentile(live_latency, 0.95):.1f} ms':>16}"
+            f"  {', '.join(f'{reason} {count}' for reason, count in reasons.most_common()) or '-'}"
+        )
+
+
+def main(conversations: int, concurrency: int, max_concurrency: int) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        port = free_port()
+        process = start_server(port, directory, max_concurrency)
+        try:
+            asyncio.run(run(port, conversations, concurrency))
+        finally:
+            stop_server(process)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=24)
+    parser.add_argument("--concurrency", type=int, default=24)
+    parser.add_argument("--max-concurrency", type=int, default=4, help="ADMISSION_MAX_CONCURRENCY of the server")
+    args = parser.parse_args()
+    main(args.conversations, args.concurrency, args.max_concurrency)
@@ -0,0 +1,119 @@
+"""
+Offline check that every LLM request starts with its node's static prompt prefix, and the prompt cache hit ratio per node.
+
+Drives the compiled graph on the stub through a new-topic turn (single and
+sectioned generation, alternately) and a feedback turn for several topics,
+recording every chat completion request. The check fails, with exit code 1,
+if any request's first message is not exactly the prefix of a registered
+PromptTemplate, if two requests of one template differ in their first
+message, or if a prefix contains something that looks like a date.
+
+The stub emulates provider prompt caching (prefixes of at least 1024 tokens,
+in 128 token steps), so the table also shows the cached share of prompt
+tokens each node would get. Prefixes shorter than 1024 tokens are only
+cached together with whatever identical content follows them.
+
+Run from the agent directory:
+    python -m benchmarks.prompt_prefix [--topics 4]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from typing import Dict, List
+from uuid import uuid4
+
+os.environ["HTTP_REPLAY_MODE"] = "stub"
+os.environ.setdefault("CHECKPOINTER_BACKEND", "memory")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("YDC_API_KEY", "benchmark")
+os.environ.setdefault("SEARCH_CACHE_PATH", "")
+os.environ.setdefault("SEARCH_INDEX_PATH", "")
+os.environ.setdefault("SUMMARY_CACHE_BACKEND", "memory")
+os.environ.setdefault("STUB_LLM_LATENCY", "0.05")
+os.environ.setdefault("STUB_TOKEN_DELAY", "0")
+os.environ.setdefault("STUB_SEARCH_LATENCY", "0.05")
+os.environ.setdefault("LLM_RATE_LIMIT", "0")
+os.environ.setdefault("SEARCH_RATE_LIMIT", "0")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+import httpx  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+
+from src.graph.graph import graph  # noqa: E402
+from src.prompts import PROMPTS  # noqa: E402
+from src.utils.replay import StubTransport  # noqa: E402
+from src.utils.tokens import count_tokens  # noqa: E402
+
+TOPICS = ["AI agents", "vector databases", "Rust async", "edge computing", "platform engineering", "LLM evaluation"]
+DATE_LIKE = re.compile(r"\b(19|20)\d{2}\b")
+
+requests: List[dict] = []
+_chat_completion = StubTransport._chat_completion
+
+
+async def recording_chat_completion(self: StubTransport, request: httpx.Request) -> httpx.Response:
+    requests.append(json.loads(request.content))
+    return await _chat_completion(self, request)
+
+
+def token_sums() -> Dict[str, Dict[str, float]]:
+    sums: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for metric in REGISTRY.collect():
+        if metric.name == "blog_agent_llm_tokens":
+            for sample in metric.samples:
+                if sample.name.endswith("_sum"):
+                    sums[sample.labels["node"]][sample.labels["kind"]] += sample.value
+    return sums
+
+
+def check(requests: List[dict]) -> List[str]:
+    by_prefix = {template.prefix: name for name, template in PROMPTS.items()}
+    failures = [f"{name}: prefix contains a date-like value {DATE_LIKE.search(t.prefix).group()!r}" for name, t in PROMPTS.items() if DATE_LIKE.search(t.prefix)]
+    first_messages: Dict[str, set] = defaultdict(set)
+    for payload in requests:
+        first = payload["messages"][0]["content"]
+        name = by_prefix.get(first)
+        if name is None:
+            failures.append(f"request does not start with a registered prefix: {first[:100]!r}")
+        else:
+            first_messages[name].add(first)
+    failures += [f"{name}: {len(messages)} different first messages" for name, messages in first_messages.items() if len(messages) > 1]
+    print(f"{'template':<20} {'requests':>9} {'prefix tokens':>14}")
+    for name, template in PROMPTS.items():
+        count = sum(1 for payload in requests if payload["messages"][0]["content"] == template.prefix)
+        print(f"{name:<20} {count:>9} {count_tokens(template.prefix):>14}")
+    return failures
+
+
+async def main(topics: int) -> int:
+    StubTransport._chat_completion = recording_chat_completion
+    for i, topic in enumerate(TOPICS[:topics]):
+        config = {"configurable": {"thread_id": str(uuid4())}}
+        mode = "sectioned" if i % 2 else "single"
+        await graph.ainvoke({"messages": [HumanMessage(content=f"Write a blog post about {topic}")], "generation_mode": mode}, config)
+        await graph.ainvoke({"messages": [HumanMessage(content="Make the introduction shorter and punchier")]}, config)
+
+    failures = check(requests)
+    print(f"\n{'node':<20} {'prompt':>9} {'cached':>9} {'ratio':>7}")
+    for node, kinds in sorted(token_sums().items()):
+        ratio = kinds["cached"] / kinds["prompt"] if kinds["prompt"] else 0.0
+        print(f"{node:<20} {kinds['prompt']:>9.0f} {kinds['cached']:>9.0f} {ratio:>7.0%}")
+
+    print()
+    for failure in failures:
+        print(f"FAIL {failure}")
+    print(f"{len(requests)} requests checked, {'prefixes stable' if not failures else f'{len(failures)} failures'}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=4)
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.topics)))
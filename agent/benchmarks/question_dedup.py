@@ -0,0 +1,140 @@
+"""
+Cost and savings of embedding-based search question deduplication.
+
+Part 1 times embedding and clustering question lists of growing size with the
+local hashing embedder, to show the vectorized similarity stays cheap for
+hundreds of questions. The lists ask about random subject and aspect pairs in
+four phrasings; "pairs" is the number of distinct pairs, the clusters an
+ideal semantic embedder would find. The hashing embedder only merges
+rewordings that share vocabulary, so it finds more clusters than that.
+
+Part 2 sweeps the hashing embedder's threshold over the labelled question
+pairs in fixtures/question_pairs.jsonl: for each threshold, the duplicates
+merged (recall) and the must-not-merge pairs wrongly merged. A wrong merge
+answers a question with another question's results, so the threshold sits
+above every must-not-merge pair.
+
+Part 3 runs search_web against the stub for a series of related topics with
+deduplication off and on, from empty caches, and reports the searches and
+summaries sent upstream and the wall time.
+
+Run from the agent directory:
+    python -m benchmarks.question_dedup [--sizes 50 200 1000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import List, Tuple
+
+os.environ["HTTP_REPLAY_MODE"] = "stub"
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("YDC_API_KEY", "benchmark")
+os.environ.setdefault("SEARCH_CACHE_PATH", "")
+os.environ.setdefault("SEARCH_INDEX_PATH", "")
+os.environ.setdefault("SUMMARY_CACHE_BACKEND", "memory")
+os.environ.setdefault("LLM_RATE_LIMIT", "0")
+os.environ.setdefault("SEARCH_RATE_LIMIT", "0")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from src.cache.search_cache import get_search_cache  # noqa: E402
+from src.cache.search_index import get_search_index  # noqa: E402
+from src.cache.summary_cache import get_summary_cache  # noqa: E402
+from src.nodes.question_dedup import cluster_questions  # noqa: E402
+from src.nodes.web_search_node import search_web  # noqa: E402
+from src.state.state import AgentState  # noqa: E402
+from src.utils.embeddings import HashingEmbedder, configure_embedder  # noqa: E402
+
+SUBJECTS = ["AI agents", "vector databases", "Rust async", "edge computing", "platform engineering", "LLM evaluation", "data contracts", "WebAssembly"]
+ASPECTS = ["adoption", "security risks", "cost", "performance", "tooling", "best practices", "use cases", "limitations", "market size", "hiring"]
+PHRASINGS = ["What is the current state of {aspect} for {subject}?", "{subject} {aspect} in 2026?", "How does {subject} handle {aspect}?", "What are the latest {aspect} trends for {subject}?"]
+PAIRS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "question_pairs.jsonl")
+THRESHOLDS = [0.70, 0.74, 0.76, 0.78, 0.80, 0.82, 0.85, 0.90]
+TOPICS = ["AI agents", "AI agents in production", "building AI agents", "vector databases", "vector database performance", "Rust async"]
+
+
+def make_questions(count: int) -> Tuple[List[str], int]:
+    """Questions over random (subject, aspect) pairs in random phrasings, and the number of distinct pairs."""
+    random.seed(count)
+    pairs = random.choices([(subject, aspect) for subject in SUBJECTS for aspect in ASPECTS], k=count)
+    return [random.choice(PHRASINGS).format(subject=subject, aspect=aspect) for subject, aspect in pairs], len(set(pairs))
+
+
+def time_clustering(sizes: List[int]) -> None:
+    embedder = HashingEmbedder()
+    print(f"{'questions':>9} {'distinct':>9} {'pairs':>9} {'clusters':>9} {'embed':>9} {'cluster':>9}")
+    for size in sizes:
+        questions, pairs = make_questions(size)
+        start = time.perf_counter()
+        vectors = embedder.embed_sync(questions)
+        embedded = time.perf_counter()
+        clusters = cluster_questions(vectors, embedder.similarity_threshold)
+        clustered = time.perf_counter()
+        print(f"{size:>9} {len(set(questions)):>9} {pairs:>9} {len(clusters):>9} {(embedded - start) * 1000:>7.1f}ms {(clustered - embedded) * 1000:>7.1f}ms")
+
+
+def load_pairs(path: str = PAIRS_PATH) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        # the fixture writes the current year as {year}
+        return [json.loads(line.replace("{year}", str(time.localtime().tm_year))) for line in f if line.strip()]
+
+
+def sweep_thresholds() -> None:
+    embedder = HashingEmbedder()
+    pairs = load_pairs()
+    scores = []
+    for pair in pairs:
+        vectors = embedder.embed_sync([pair["a"], pair["b"]])
+        scores.append((float(vectors[0] @ vectors[1]), pair["duplicate"]))
+    duplicates = sum(duplicate for _, duplicate in scores)
+    distinct = len(scores) - duplicates
+    print(f"{len(pairs)} labelled pairs: {duplicates} duplicates, {distinct} must not merge\n")
+    print(f"{'threshold':>9} {'merged':>9} {'wrong':>9}")
+    for threshold in THRESHOLDS:
+        merged = sum(score >= threshold and duplicate for score, duplicate in scores)
+        wrong = sum(score >= threshold and not duplicate for score, duplicate in scores)
+        marker = "  <- HashingEmbedder.similarity_threshold" if threshold == embedder.similarity_threshold else ""
+        print(f"{threshold:>9.2f} {merged / duplicates:>8.0%} {wrong:>9}{marker}")
+
+
+async def run_topics(dedup: bool) -> None:
+    configure_embedder(HashingEmbedder() if dedup else None)
+    get_search_cache().clear()
+    get_summary_cache().backend.clear()
+    get_search_index().clear()
+    search_stats = get_search_cache().stats
+    summary_stats = get_summary_cache().stats
+    searches_before, summaries_before = search_stats.misses, summary_stats.misses
+
+    start = time.perf_counter()
+    results = 0
+    for topic in TOPICS:
+        state = AgentState(messages=[HumanMessage(content=f"Write a blog post about {topic}")])
+        update = await search_web(state)
+        results += len(update["search_results"].search_results)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{'on' if dedup else 'off':<6} {len(TOPICS):>6} {results:>8} {search_stats.misses - searches_before:>9}"
+        f" {summary_stats.misses - summaries_before:>10} {elapsed:>8.2f}s"
+    )
+
+
+async def main(sizes: List[int]) -> None:
+    time_clustering(sizes)
+    print()
+    sweep_thresholds()
+    print(f"\n{'dedup':<6} {'topics':>6} {'answers':>8} {'searches':>9} {'summaries':>10} {'elapsed':>9}")
+    await run_topics(dedup=False)
+    await run_topics(dedup=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes))
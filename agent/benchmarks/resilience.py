@@ -0,0 +1,179 @@
+"""
+Exercise the retry, hedging, circuit breaker and deadline layer against a flaky stand-in server.
+
+The stand-in is a local ASGI app in front of the stub LLM and search
+responses. It can fail a fraction of requests with 503, delay a fraction to
+create a latency tail, or fail everything (an outage). Clients reach it
+through httpx.ASGITransport with the real API hostnames, so requests go
+through the same retry, rate limit and metrics stack as in production.
+
+Scenarios, each run with the feature off and on:
+    search errors    30% of searches fail
+    llm errors       30% of chat completions fail
+    search tail      10% of searches take 3s longer; hedging after 0.5s
+    search outage    every search fails; the circuit breaker fails fast
+    deadline         slow completions under a 1s turn budget
+
+Run from the agent directory:
+    python -m benchmarks.resilience [--calls 60]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("YDC_API_KEY", "benchmark")
+os.environ.setdefault("SEARCH_CACHE_PATH", "")
+os.environ.setdefault("SEARCH_INDEX_PATH", "")
+os.environ.setdefault("SUMMARY_CACHE_BACKEND", "memory")
+os.environ.setdefault("LOG_LEVEL", "CRITICAL")
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request, Response  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from src.nodes import web_search_node  # noqa: E402
+from src.schema.nodes import WEB_SEARCH  # noqa: E402
+from src.utils.http import configure_http_client  # noqa: E402
+from src.utils.models import configure_models, get_model  # noqa: E402
+from src.utils.ratelimit import configure_rate_limit  # noqa: E402
+from src.utils.replay import StubTransport  # noqa: E402
+from src.utils.resilience import RetryPolicy, configure_resilience, turn_budget  # noqa: E402
+
+
+class FlakyUpstream:
+    """Per-upstream failure behaviour of the stand-in server."""
+
+    def __init__(self, failure_rate: float = 0.0, slow_rate: float = 0.0, slow_delay: float = 0.0, outage: bool = False):
+        self.failure_rate = failure_rate
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self.outage = outage
+        self.requests = 0
+
+
+def create_flaky_server(behaviour: Dict[str, FlakyUpstream]) -> FastAPI:
+    stub = StubTransport(llm_latency=0.05, token_delay=0.0, search_latency=0.1)
+    app = FastAPI()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def upstream(request: Request, path: str) -> Response:
+        flaky = behaviour["openai" if path.endswith("chat/completions") else "ydc"]
+        flaky.requests += 1
+        if flaky.outage or random.random() < flaky.failure_rate:
+            return Response(status_code=503, content=b'{"error": {"message": "flaky stand-in"}}', media_type="application/json")
+        if random.random() < flaky.slow_rate:
+            await asyncio.sleep(flaky.slow_delay)
+        stub_request = httpx.Request(request.method, str(request.url), headers=request.headers.raw, content=await request.body())
+        stub_response = await stub.handle_async_request(stub_request)
+        return Response(content=await stub_response.aread(), status_code=stub_response.status_code, media_type=stub_response.headers.get("content-type"))
+
+    return app
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+async def measure(call: Callable[[], Awaitable[Any]], calls: int, concurrency: int = 8) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one() -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call()
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return {"success": 1 - failures / calls, "p50": percentile(latencies, 0.5), "p95": percentile(latencies, 0.95), "max": max(latencies)}
+
+
+async def install(behaviour: Dict[str, FlakyUpstream]) -> None:
+    transport = httpx.ASGITransport(app=create_flaky_server(behaviour))
+    await configure_http_client(transport)
+    await configure_models(transport)
+
+
+async def search_call() -> None:
+    await web_search_node.fetch_search_results(f"resilience question {uuid4()}")
+
+
+async def llm_call() -> None:
+    await get_model(WEB_SEARCH).ainvoke([HumanMessage(content="Summarize the search results")])
+
+
+def report(scenario: str, variant: str, result: Dict[str, float], upstream_requests: int) -> None:
+    print(
+        f"{scenario:<15} {variant:<14} {result['success']:>7.0%} {result['p50']:>7.2f}s {result['p95']:>7.2f}s {result['max']:>7.2f}s {upstream_requests:>9}"
+    )
+
+
+async def run_scenario(
+    scenario: str,
+    variant: str,
+    behaviour: Dict[str, FlakyUpstream],
+    call: Callable[[], Awaitable[Any]],
+    calls: int,
+    retries: int = 1,
+    breaker_threshold: int = 0,
+    hedge_after: float = 0.0,
+    budget: float = 0.0,
+    concurrency: int = 8,
+) -> None:
+    await install(behaviour)
+    configure_resilience(RetryPolicy(max_attempts=retries, base_delay=0.05, max_delay=0.5), failure_threshold=breaker_threshold, reset_timeout=60)
+    web_search_node.SEARCH_HEDGE_DELAY = hedge_after
+
+    async def bounded() -> None:
+        if budget:
+            with turn_budget(budget):
+                await call()
+        else:
+            await call()
+
+    result = await measure(bounded, calls, concurrency)
+    report(scenario, variant, result, sum(flaky.requests for flaky in behaviour.values()))
+
+
+async def main(calls: int) -> None:
+    for upstream in ("openai", "ydc"):
+        configure_rate_limit(upstream, 0, 0)
+    random.seed(7)
+
+    def upstreams(**ydc: Any) -> Dict[str, FlakyUpstream]:
+        return {"openai": FlakyUpstream(), "ydc": FlakyUpstream(**ydc)}
+
+    print(f"{'scenario':<15} {'variant':<14} {'success':>7} {'p50':>8} {'p95':>8} {'max':>8} {'upstream':>9}")
+    await run_scenario("search errors", "no retries", upstreams(failure_rate=0.3), search_call, calls)
+    await run_scenario("search errors", "3 attempts", upstreams(failure_rate=0.3), search_call, calls, retries=3)
+    await run_scenario("llm errors", "no retries", {"openai": FlakyUpstream(failure_rate=0.3), "ydc": FlakyUpstream()}, llm_call, calls)
+    await run_scenario("llm errors", "3 attempts", {"openai": FlakyUpstream(failure_rate=0.3), "ydc": FlakyUpstream()}, llm_call, calls, retries=3)
+    await run_scenario("search tail", "no hedging", upstreams(slow_rate=0.1, slow_delay=3), search_call, calls)
+    await run_scenario("search tail", "hedge at 0.5s", upstreams(slow_rate=0.1, slow_delay=3), search_call, calls, hedge_after=0.5)
+    await run_scenario("search outage", "no breaker", upstreams(outage=True), search_call, calls, retries=3, concurrency=1)
+    await run_scenario("search outage", "breaker at 5", upstreams(outage=True), search_call, calls, retries=3, breaker_threshold=5, concurrency=1)
+    slow_llm = {"openai": FlakyUpstream(slow_rate=1.0, slow_delay=2), "ydc": FlakyUpstream()}
+    await run_scenario("deadline", "no budget", slow_llm, llm_call, min(calls, 16))
+    slow_llm = {"openai": FlakyUpstream(slow_rate=1.0, slow_delay=2), "ydc": FlakyUpstream()}
+    await run_scenario("deadline", "1s budget", slow_llm, llm_call, min(calls, 16), budget=1.0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=60)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls))
@@ -0,0 +1,97 @@
+"""
+Measure how often the rule-based router decides, and how often it picks the right route.
+
+Each line of the conversations file is a hand-labelled routing decision:
+    {"messages": [{"role": "human", "content": "..."}], "blog_post": {...}, "search_questions": [...], "label": "web_search"}
+
+The rules are scored against the labels. Agreement with the LLM router is
+only reported for conversations that carry an llm_route recorded from the
+live router with --record, which needs a real OPENAI_API_KEY.
+
+Run from the agent directory:
+    python -m benchmarks.router_agreement [conversations.jsonl]
+    python -m benchmarks.router_agreement --record conversations.jsonl   # record llm_route from the live LLM router
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+
+from src.nodes.router_node import assessment_to_route, router_assessment  # noqa: E402
+from src.nodes.router_rules import ROUTER_RULE_CONFIDENCE, classify_intent  # noqa: E402
+from src.schema.schema import BlogPost, SearchResult, SearchResults  # noqa: E402
+from src.state.state import AgentState  # noqa: E402
+
+DEFAULT_CONVERSATIONS = os.path.join(os.path.dirname(__file__), "fixtures", "router_conversations.jsonl")
+
+
+def load_state(record: Dict[str, Any]) -> AgentState:
+    messages = [HumanMessage(content=m["content"]) if m["role"] == "human" else AIMessage(content=m["content"]) for m in record["messages"]]
+    search_results = [SearchResult(question=q, search_result="") for q in record.get("search_questions", [])]
+    return AgentState(
+        messages=messages,
+        blog_post=BlogPost(**record.get("blog_post", {})),
+        search_results=SearchResults(search_results=search_results),
+    )
+
+
+def evaluate(records: List[Dict[str, Any]]) -> None:
+    decided = correct = recorded = agreed = 0
+    mistakes = []
+    start = time.perf_counter()
+    for record in records:
+        decision = classify_intent(load_state(record))
+        if decision is None or decision.confidence < ROUTER_RULE_CONFIDENCE:
+            continue
+        decided += 1
+        if decision.route == record["label"]:
+            correct += 1
+        else:
+            mistakes.append((record["messages"][-1]["content"], decision.route, record["label"]))
+        if "llm_route" in record:
+            recorded += 1
+            agreed += decision.route == record["llm_route"]
+    latency_ms = (time.perf_counter() - start) * 1000 / max(len(records), 1)
+
+    print(f"Conversations:          {len(records)}")
+    print(f"Decided by rules:       {decided} ({decided / max(len(records), 1):.0%})")
+    print(f"Correct (hand labels):  {correct}/{decided} ({correct / max(decided, 1):.0%})")
+    if recorded:
+        print(f"Agreement with LLM:     {agreed}/{recorded} ({agreed / recorded:.0%}) of decisions with a recorded llm_route")
+    else:
+        print("Agreement with LLM:     not measured, no llm_route recorded (run with --record)")
+    print(f"Mean rule latency:      {latency_ms:.3f} ms")
+    for text, rule_route, label in mistakes:
+        print(f"  wrong: rules={rule_route} label={label}: {text!r}")
+
+
+async def record(path: str, records: List[Dict[str, Any]]) -> None:
+    for item in records:
+        assessment = await router_assessment(load_state(item))
+        item["llm_route"] = assessment_to_route(assessment)
+    with open(path, "w", encoding="utf-8") as f:
+        for item in records:
+            f.write(json.dumps(item) + "\n")
+
+
+def main():
+    args = sys.argv[1:]
+    relabel = "--record" in args
+    args = [arg for arg in args if arg != "--record"]
+    path = args[0] if args else DEFAULT_CONVERSATIONS
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    if relabel:
+        asyncio.run(record(path, records))
+    evaluate(records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Insert and query latency of the persistent search result index at scale.
+
+Fills a fresh on-disk SearchIndex with synthetic entries in batches, then
+measures lookups for one question and for a typical eight-question batch
+against the memory-mapped matrix, from a newly opened index (cold page cache
+aside) and warm. Stored vectors are random unit vectors, except for a few
+real question embeddings planted among them, which each query must find.
+
+The default dimension matches the hashing embedder; pass --dim 1536 for
+text-embedding-3-small.
+
+Run from the agent directory:
+    python -m benchmarks.search_index [--entries 100000] [--dim 1024] [--queries 50]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+import numpy as np  # noqa: E402
+
+from src.cache.search_index import SearchIndex  # noqa: E402
+from src.schema.schema import SearchResult  # noqa: E402
+from src.utils.embeddings import HashingEmbedder, normalize_rows  # noqa: E402
+
+BATCH = 10000
+PLANTED = ["What are the latest trends in AI agents?", "How do vector databases scale?", "What is Rust async used for?", "Edge computing security risks?"]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def time_calls(call: Callable[[], object], count: int) -> List[float]:
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main(entries: int, dim: int, queries: int) -> None:
+    embedder = HashingEmbedder(dim=dim)
+    rng = np.random.default_rng(7)
+    planted = embedder.embed_sync(PLANTED)
+    answer = SearchResult(question="synthetic", search_result="Synthetic answer citing [a source](https://example.com/source).")
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = SearchIndex(directory, initial_capacity=BATCH)
+        start = time.perf_counter()
+        for offset in range(0, entries, BATCH):
+            count = min(BATCH, entries - offset)
+            vectors = normalize_rows(rng.standard_normal((count, dim), dtype=np.float32))
+            results = [answer] * count
+            if offset == 0:
+                vectors[: len(planted)] = planted
+                results = [SearchResult(question=question, search_result=answer.search_result) for question in PLANTED] + results[len(planted) :]
+            index.add(vectors, results, embedder.name)
+        insert_seconds = time.perf_counter() - start
+        index.close()
+        size_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 1e6
+        print(f"{entries} entries x {dim} dims: inserted in {insert_seconds:.1f}s ({entries / insert_seconds:,.0f}/s), {size_mb:.0f} MB on disk")
+
+        single = embedder.embed_sync(["What are the trends in AI agents today?"])
+        batch = embedder.embed_sync([f"{question} today" for question in PLANTED] * 2)
+
+        start = time.perf_counter()
+        index = SearchIndex(directory)
+        first = index.lookup(single, embedder.similarity_threshold, embedder.name)
+        print(f"open + first lookup: {(time.perf_counter() - start) * 1000:.1f} ms, matched {first[0].result.question if first[0] else None!r}")
+
+        matches = index.lookup(batch, embedder.similarity_threshold, embedder.name)
+        print(f"batch of {len(batch)} matched {sum(match is not None for match in matches)}/{len(batch)} planted questions\n")
+
+        print(f"{'query':<16} {'p50':>9} {'p95':>9} {'per question':>13}")
+        for name, vectors in (("1 question", single), (f"{len(batch)} questions", batch)):
+            latencies = time_calls(lambda vectors=vectors: index.lookup(vectors, embedder.similarity_threshold, embedder.name), queries)
+            print(f"{name:<16} {percentile(latencies, 0.5):>7.1f}ms {percentile(latencies, 0.95):>7.1f}ms {percentile(latencies, 0.5) / len(vectors):>11.2f}ms")
+        index.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+    main(args.entries, args.dim, args.queries)
@@ -0,0 +1,72 @@
+"""
+Token savings of compacting search payloads before summarization.
+
+For each recorded search response, compares the tokens of the raw payload as
+it used to be pasted into the summarization prompt with the compact source
+block that replaces it, and reports hits kept, compaction time and the
+prompt cost of the difference at the summarizer model's price.
+
+Payloads come from benchmarks/fixtures/ydc_search_payloads.jsonl (sample
+responses in the YDC format, with the usual tracking parameters, repeated
+pages and boilerplate snippets), plus any YDC responses recorded in
+HTTP_REPLAY_DIR by ``graph_latency --mode record``.
+
+Run from the agent directory:
+    python -m benchmarks.search_payload [--replay-dir fixtures/http]
+"""
+
+import argparse
+import glob
+import json
+import os
+import time
+from typing import Any, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from src.nodes.search_payload import compact_search_payload, parse_hits  # noqa: E402
+from src.utils.metrics import estimate_cost  # noqa: E402
+from src.utils.models import DEFAULT_MODEL  # noqa: E402
+from src.utils.tokens import count_tokens  # noqa: E402
+
+SAMPLE_PAYLOADS = os.path.join(os.path.dirname(__file__), "fixtures", "ydc_search_payloads.jsonl")
+
+
+def load_payloads(replay_dir: str) -> List[Tuple[str, Any]]:
+    with open(SAMPLE_PAYLOADS, encoding="utf-8") as f:
+        payloads = [(row["question"], row["payload"]) for row in map(json.loads, f)]
+    for path in sorted(glob.glob(os.path.join(replay_dir, "*.json"))):
+        with open(path, encoding="utf-8") as f:
+            fixture = json.load(f)
+        url = urlsplit(fixture["request"]["url"])
+        if url.path.endswith("/search") and fixture["status"] == 200:
+            payloads.append((parse_qs(url.query).get("query", [""])[0], json.loads(fixture["body"])))
+    return payloads
+
+
+def main(replay_dir: str) -> None:
+    payloads = load_payloads(replay_dir)
+    print(f"{'question':<58} {'hits':>9} {'raw':>7} {'compact':>8} {'saved':>6} {'time':>8}")
+    total_raw = total_compact = 0
+    for question, payload in payloads:
+        start = time.perf_counter()
+        block = compact_search_payload(question, payload)
+        elapsed = (time.perf_counter() - start) * 1000
+        raw, compact = count_tokens(str(payload)), count_tokens(block)
+        total_raw += raw
+        total_compact += compact
+        kept = block.count("\n\n") + 1
+        print(f"{question[:58]:<58} {len(parse_hits(payload)):>4} -> {kept:<2} {raw:>7} {compact:>8} {1 - compact / raw:>6.0%} {elapsed:>6.1f}ms")
+
+    saved = estimate_cost(DEFAULT_MODEL, total_raw - total_compact, 0)
+    print(f"\ntotal {total_raw} -> {total_compact} prompt tokens ({1 - total_compact / total_raw:.0%} fewer)")
+    print(f"{DEFAULT_MODEL} input cost saved: ${saved:.4f} for {len(payloads)} questions, ${saved / len(payloads) * 1000:.2f} per 1000 questions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replay-dir", default=os.getenv("HTTP_REPLAY_DIR", os.path.join(os.path.dirname(__file__), "fixtures", "http")))
+    args = parser.parse_args()
+    main(args.replay_dir)
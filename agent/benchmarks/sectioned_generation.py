@@ -0,0 +1,100 @@
+"""
+Wall time and token usage of sectioned versus single-call blog generation.
+
+Runs generate_blog against the stub on the same synthetic research (one
+note per search question, of realistic summary length) in both modes and
+reports the time to the first visible content, the time to the final post
+and the prompt and completion tokens spent per mode. STUB_TOKEN_DELAY
+defaults to 10ms per output token here, roughly a hosted GPT-4o model, since
+generation time is dominated by output tokens.
+
+The sectioned mode sends every section its own copy of the style guide and
+its research notes, so it spends more prompt tokens to cut the wall time.
+
+Run from the agent directory:
+    python -m benchmarks.sectioned_generation [--runs 3] [--concurrency 1 2 4 8]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+os.environ["HTTP_REPLAY_MODE"] = "stub"
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("STUB_TOKEN_DELAY", "0.01")
+os.environ.setdefault("STUB_CONTENT_WORDS", "900")
+os.environ.setdefault("LLM_RATE_LIMIT", "0")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+
+from src.nodes import generate_blog_node, sectioned_blog  # noqa: E402
+from src.schema.schema import BlogPost, SearchResult, SearchResults  # noqa: E402
+from src.state.state import AgentState  # noqa: E402
+from src.utils import streaming  # noqa: E402
+
+QUESTIONS = [
+    "What are AI agents and why do they matter?",
+    "What are the latest developments in AI agents?",
+    "How are AI agents used in production today?",
+    "What are the main risks of deploying AI agents?",
+    "Which frameworks support building AI agents?",
+    "How do teams evaluate AI agents?",
+]
+
+
+def make_state(mode: str) -> AgentState:
+    note = " ".join(f"Finding {i} about the topic, citing [source {i}](https://example.com/{i})." for i in range(30))
+    results = [SearchResult(question=question, search_result=note) for question in QUESTIONS]
+    return AgentState(
+        messages=[HumanMessage(content="Write a blog post about AI agents")], search_results=SearchResults(search_results=results), generation_mode=mode
+    )
+
+
+def token_totals() -> Dict[str, float]:
+    totals = {"prompt": 0.0, "completion": 0.0}
+    for metric in REGISTRY.collect():
+        if metric.name == "blog_agent_llm_tokens":
+            for sample in metric.samples:
+                if sample.name.endswith("_sum") and sample.labels["kind"] in totals:
+                    totals[sample.labels["kind"]] += sample.value
+    return totals
+
+
+async def run(mode: str) -> List[float]:
+    """Return [first content, final post, prompt tokens, completion tokens, words] for one generation."""
+    emitted: List[float] = []
+    start = time.perf_counter()
+
+    async def record_emit(state: AgentState, blog_post: BlogPost, config: Any) -> None:
+        emitted.append(time.perf_counter() - start)
+
+    streaming.emit_blog_post = sectioned_blog.emit_blog_post = record_emit
+    before = token_totals()
+    update = await generate_blog_node.generate_blog(make_state(mode), config={})
+    total = time.perf_counter() - start
+    after = token_totals()
+    words = len(update["blog_post"].content.split())
+    return [emitted[0] if emitted else total, total, after["prompt"] - before["prompt"], after["completion"] - before["completion"], words]
+
+
+async def main(runs: int, concurrencies: List[int]) -> None:
+    print(f"{'mode':<14} {'first':>8} {'final':>8} {'prompt':>8} {'output':>8} {'words':>6}")
+    configurations = [("single", 0)] + [("sectioned", concurrency) for concurrency in concurrencies]
+    for mode, concurrency in configurations:
+        sectioned_blog.BLOG_SECTION_CONCURRENCY = concurrency
+        results = [await run(mode) for _ in range(runs)]
+        first, final, prompt, completion, words = (sum(column) / runs for column in zip(*results))
+        label = mode if mode == "single" else f"{mode} x{concurrency}"
+        print(f"{label:<14} {first:>7.2f}s {final:>7.2f}s {prompt:>8.0f} {completion:>8.0f} {words:>6.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.concurrency))
@@ -0,0 +1,158 @@
+"""
+Load test for the production server mode against the stub LLM.
+
+For each worker count, starts `python -m src.app` with SERVER_MODE=production
+and HTTP_REPLAY_MODE=stub, then drives concurrent conversations through the
+CopilotKit agent endpoint: a blog request followed by a feedback turn on the
+same thread. Threads share one SQLite checkpoint file, so the feedback turn
+succeeds whichever worker picks it up. Reports turns/second and p50/p95 turn
+latency per worker count, then stops the server with SIGTERM to exercise the
+graceful drain.
+
+Run from the agent directory:
+    python -m benchmarks.server_throughput [--workers 1 2 4] [--conversations 40] [--concurrency 16]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+from uuid import uuid4
+
+import httpx
+
+AGENT_NAME = "blog-post-generator"
+TURNS = [
+    "Write a blog post about the latest trends in AI agents",
+    "Make the introduction shorter and punchier",
+]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, port: int, directory: str) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update(
+        SERVER_MODE="production",
+        WEB_CONCURRENCY=str(workers),
+        PORT=str(port),
+        HTTP_REPLAY_MODE="stub",
+        CHECKPOINTER_BACKEND="sqlite",
+        CHECKPOINT_DB_PATH=os.path.join(directory, "checkpoints.sqlite3"),
+        PROMETHEUS_MULTIPROC_DIR=os.path.join(directory, "prometheus"),
+        SEARCH_CACHE_PATH="",
+        SEARCH_INDEX_PATH="",
+        SUMMARY_CACHE_BACKEND="memory",
+        STARTUP_MODE="eager",
+        LOG_LEVEL="WARNING",
+    )
+    env.setdefault("OPENAI_API_KEY", "benchmark")
+    env.setdefault("YDC_API_KEY", "benchmark")
+    return subprocess.Popen([sys.executable, "-m", "src.app"], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def wait_until_healthy(client: httpx.AsyncClient, timeout: float = 120) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("Server did not become healthy")
+
+
+async def run_turn(client: httpx.AsyncClient, thread_id: str, text: str) -> Tuple[float, bool]:
+    body = {
+        "name": AGENT_NAME,
+        "threadId": thread_id,
+        "state": {},
+        "messages": [{"id": str(uuid4()), "type": "TextMessage", "role": "user", "content": text}],
+        "actions": [],
+    }
+    start = time.perf_counter()
+    async with client.stream("POST", "/copilotkit/agents/execute", json=body) as response:
+        async for _ in response.aiter_bytes():
+            pass
+    return time.perf_counter() - start, response.status_code == 200
+
+
+async def run_load(port: int, conversations: int, concurrency: int) -> Dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=300) as client:
+        await wait_until_healthy(client)
+
+        async def conversation() -> None:
+            nonlocal failures
+            async with semaphore:
+                thread_id = str(uuid4())
+                for text in TURNS:
+                    latency, ok = await run_turn(client, thread_id, text)
+                    latencies.append(latency)
+                    failures += not ok
+
+        start = time.perf_counter()
+        await asyncio.gather(*(conversation() for _ in range(conversations)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "turns_per_second": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.5),
+        "p95": percentile(latencies, 0.95),
+        "failures": failures,
+    }
+
+
+def stop_server(process: subprocess.Popen) -> float:
+    start = time.perf_counter()
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    return time.perf_counter() - start
+
+
+def main(worker_counts: List[int], conversations: int, concurrency: int) -> None:
+    print(f"Conversations: {conversations} x {len(TURNS)} turns, client concurrency {concurrency}\n")
+    print(f"{'workers':>7}  {'turns/s':>8}  {'p50':>8}  {'p95':>8}  {'failures':>8}  {'shutdown':>8}")
+    for workers in worker_counts:
+        with tempfile.TemporaryDirectory() as directory:
+            port = free_port()
+            process = start_server(workers, port, directory)
+            try:
+                result = asyncio.run(run_load(port, conversations, concurrency))
+            finally:
+                shutdown = stop_server(process)
+        print(
+            f"{workers:>7}  {result['turns_per_second']:>8.2f}  {result['p50']:>7.2f}s  {result['p95']:>7.2f}s  {result['failures']:>8}  {shutdown:>7.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--conversations", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    main(args.workers, args.conversations, args.concurrency)
@@ -0,0 +1,112 @@
+"""
+Hit rate and latency saved by speculative question generation and search.
+
+Drives the compiled graph on fresh threads with a mix of new-topic turns
+(routed to web search) and chat turns (routed to chat), with
+SPECULATIVE_SEARCH off and on, and reports the mean turn time per route,
+the speculation hit rate and the head start committed speculations gave
+search_web.
+
+The router's LLM assessment is replaced by a fake that answers after
+ROUTER_LATENCY with the turn's intended route, since the stub cannot
+classify intent; question generation, searches and summaries go through
+the stub with STUB_LLM_LATENCY raised to a realistic round trip. Chat turns
+show the cost of a cancelled speculation.
+
+Run from the agent directory:
+    python -m benchmarks.speculative_search [--turns 8]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+os.environ["HTTP_REPLAY_MODE"] = "stub"
+os.environ["ROUTER_FAST_PATH"] = "false"
+os.environ.setdefault("STUB_LLM_LATENCY", "0.8")
+os.environ.setdefault("CHECKPOINTER_BACKEND", "memory")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("YDC_API_KEY", "benchmark")
+os.environ.setdefault("SEARCH_CACHE_PATH", "")
+os.environ.setdefault("SEARCH_INDEX_PATH", "")
+os.environ.setdefault("SUMMARY_CACHE_BACKEND", "memory")
+os.environ.setdefault("LLM_RATE_LIMIT", "0")
+os.environ.setdefault("SEARCH_RATE_LIMIT", "0")
+os.environ.setdefault("LOG_LEVEL", "ERROR")
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+from prometheus_client import REGISTRY  # noqa: E402
+
+from src.cache.search_cache import get_search_cache  # noqa: E402
+from src.cache.search_index import get_search_index  # noqa: E402
+from src.cache.summary_cache import get_summary_cache  # noqa: E402
+from src.graph.graph import graph  # noqa: E402
+from src.nodes import router_node, speculation  # noqa: E402
+from src.schema.nodes import CHAT, WEB_SEARCH  # noqa: E402
+from src.schema.schema import AssessIntent, ChatWithUser, Feedback, GenerateBlogPost, SearchWeb  # noqa: E402
+
+ROUTER_LATENCY = 1.0
+TOPICS = ["AI agents", "vector databases", "Rust async", "edge computing", "platform engineering", "LLM evaluation", "data contracts", "WebAssembly"]
+
+
+def assessment(route: str) -> AssessIntent:
+    return AssessIntent(
+        generate_blog_post=GenerateBlogPost(reason="benchmark", boolean_value=False),
+        search_web=SearchWeb(reason="benchmark", boolean_value=route == WEB_SEARCH),
+        chat_with_user=ChatWithUser(reason="benchmark", boolean_value=route == CHAT),
+        feedback=Feedback(reason="benchmark", boolean_value=False),
+    )
+
+
+def sample(name: str, labels: Optional[Dict[str, str]] = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+async def run(turns: int, speculate: bool) -> None:
+    speculation.SPECULATIVE_SEARCH = speculate
+    get_search_cache().clear()
+    get_summary_cache().backend.clear()
+    get_search_index().clear()
+    before = {outcome: sample("blog_agent_speculations_total", {"outcome": outcome}) for outcome in ("committed", "cancelled", "failed")}
+    saved_before = sample("blog_agent_speculation_saved_seconds_sum")
+    times: Dict[str, List[float]] = {WEB_SEARCH: [], CHAT: []}
+
+    for i in range(turns):
+        route = WEB_SEARCH if i % 2 == 0 else CHAT
+        text = f"Write a blog post about {TOPICS[i % len(TOPICS)]}" if route == WEB_SEARCH else "Thanks, what else can you help me with?"
+
+        async def fake_assessment(state, route=route):
+            await asyncio.sleep(ROUTER_LATENCY)
+            return assessment(route)
+
+        router_node.router_assessment = fake_assessment
+        config = {"configurable": {"thread_id": str(uuid4())}}
+        start = time.perf_counter()
+        await graph.ainvoke({"messages": [HumanMessage(content=text)]}, config)
+        times[route].append(time.perf_counter() - start)
+
+    outcomes = {outcome: sample("blog_agent_speculations_total", {"outcome": outcome}) - count for outcome, count in before.items()}
+    started = sum(outcomes.values())
+    saved = sample("blog_agent_speculation_saved_seconds_sum") - saved_before
+    hit_rate = f"{outcomes['committed'] / started:.0%}" if started else "-"
+    print(
+        f"{'on' if speculate else 'off':<12} {statistics.mean(times[WEB_SEARCH]):>9.2f}s {statistics.mean(times[CHAT]):>9.2f}s"
+        f" {int(started):>8} {hit_rate:>9} {saved / max(outcomes['committed'], 1):>9.2f}s"
+    )
+
+
+async def main(turns: int) -> None:
+    print(f"{'speculation':<12} {'web turn':>10} {'chat turn':>10} {'started':>8} {'hit rate':>9} {'saved':>10}")
+    await run(turns, speculate=False)
+    await run(turns, speculate=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.turns))
@@ -0,0 +1,92 @@
+"""
+Compare time-to-first-token of streamed versus one-shot blog generation against a local fake streaming model.
+
+The one-shot run goes through stream_blog_post with BLOG_STREAMING off, so
+it times the real ainvoke path; the fake model takes as long to answer a
+one-shot call as to stream the whole completion.
+
+Run from the agent directory:
+    python -m benchmarks.streaming_generation
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, List, Optional
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun  # noqa: E402
+from langchain_core.language_models import GenericFakeChatModel  # noqa: E402
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage  # noqa: E402
+from langchain_core.output_parsers import PydanticOutputParser  # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult  # noqa: E402
+from langchain_core.runnables import Runnable  # noqa: E402
+
+from src.schema.schema import BlogPost  # noqa: E402
+from src.state.state import AgentState  # noqa: E402
+from src.utils import streaming  # noqa: E402
+
+TOKEN_DELAY = 0.001
+WORDS = 1000
+
+
+class SlowFakeChatModel(GenericFakeChatModel):
+    """Fake chat model that streams its canned response with a fixed per-token delay."""
+
+    async def _astream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        async for chunk in super()._astream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            await asyncio.sleep(TOKEN_DELAY)
+            yield chunk
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        content = "".join([chunk.message.content async for chunk in self._astream(messages, stop=stop, **kwargs)])
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+
+def fake_blog_model() -> Runnable:
+    post = {"title": "The Latest Trends in AI", "content": " ".join(f"word{i}" for i in range(WORDS))}
+    model = SlowFakeChatModel(messages=iter([AIMessage(content=json.dumps(post))]))
+    return model | PydanticOutputParser(pydantic_object=BlogPost)
+
+
+async def measure(state: AgentState, stream: bool) -> List[float]:
+    """Return [time to first visible post, time to final post] for one generation."""
+    emitted: List[float] = []
+    start = time.perf_counter()
+
+    async def record_emit(state: AgentState, blog_post: BlogPost, config: Any) -> None:
+        emitted.append(time.perf_counter() - start)
+
+    streaming.emit_blog_post = record_emit
+    streaming.BLOG_STREAMING = stream
+    result = await streaming.stream_blog_post(fake_blog_model(), state.messages, state, config={})
+    total = time.perf_counter() - start
+    assert result.content and len(result.content.split()) == WORDS
+    # a one-shot post only becomes visible when the node returns it
+    return [emitted[0] if emitted else total, total]
+
+
+async def main():
+    state = AgentState(messages=[HumanMessage(content="Write a blog post")])
+    one_shot_first, one_shot_total = await measure(state, stream=False)
+    streamed_first, streamed_total = await measure(state, stream=True)
+    print(f"One-shot: first visible content after {one_shot_first:.3f}s, final post after {one_shot_total:.3f}s")
+    print(f"Streamed: first visible content after {streamed_first:.3f}s, final post after {streamed_total:.3f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,15 @@
-from . import graph, nodes, schema, state
+import importlib
+
+from .bootstrap import bootstrap
+
+bootstrap()
 
 __all__ = ["graph", "nodes", "schema", "state"]
+
+
+def __getattr__(name: str):
+    # Subpackages are imported on first access: the nodes pull in the LLM
+    # clients and LangGraph, which the server should not wait for at startup
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
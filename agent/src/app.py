@@ -1,24 +1,47 @@
 import logging
+import math
 import os
-from uuid import uuid4
+import shutil
+from typing import List, Literal, Optional
 
 import uvicorn
-from copilotkit import CopilotKitRemoteEndpoint, LangGraphAgent
-from copilotkit.integrations.fastapi import add_fastapi_endpoint
-from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
-from src.graph.graph import graph
+# Importing src loads .env and configures logging before any settings below are read
+from src.batch import BATCH_CONCURRENCY, BATCH_MAX_TOPICS, BatchRunner
+from src.graph.graph import close_checkpointer, get_blog_post_generator_graph, get_checkpointer, is_graph_compiled
+from src.server import AdmissionController, AdmissionMiddleware, HealthMonitor, RunTracker, RunTrackingMiddleware, Warmup, add_copilotkit_endpoint, tenant_key
+from src.utils.http import close_http_client
+from src.utils.metrics import mark_worker_exited, render_metrics
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-load_dotenv() # pylint: disable=wrong-import-position
+
+def cgroup_cpu_limit() -> Optional[int]:
+    """The CPUs the container's cgroup quota allows, rounded up, or None without a quota."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+    except (OSError, ValueError):
+        try:
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f, open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as g:
+                quota, period = f.read().strip(), g.read().strip()
+        except OSError:
+            return None
+    if quota in ("max", "-1"):
+        return None
+    return max(math.ceil(int(quota) / int(period)), 1)
+
+
+# Server settings. SERVER_MODE is development (single process with reload) or production (multiple workers).
+# WEB_CONCURRENCY defaults to the cgroup CPU quota, since os.cpu_count() reports the host's CPUs in a container, and to 1 without one
+SERVER_MODE = os.getenv("SERVER_MODE", "development").lower()
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY") or cgroup_cpu_limit() or 1)
+GRACEFUL_SHUTDOWN_TIMEOUT = float(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", "30"))
+METRICS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", ".cache/prometheus")
 
 app = FastAPI(
     title="Blog Post Generator API",
@@ -35,41 +58,137 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-sdk = CopilotKitRemoteEndpoint(
-    agents=[
-        LangGraphAgent(
-            name="blog-post-generator",
-            description="Blog post generator agent that generates blog posts.",
-            graph=graph,
-        )
-    ],
-)
+# CopilotKit, LangGraph and the LLM clients are imported and the graph compiled by the warmup, not at import
+warmup = Warmup()
+add_copilotkit_endpoint(app, warmup, "/copilotkit")
+
+# Middleware added last runs first: draining is checked before a run is queued for admission
+admission_controller = AdmissionController()
+app.add_middleware(AdmissionMiddleware, controller=admission_controller, path_prefix="/copilotkit/agents/execute")
+run_tracker = RunTracker()
+app.add_middleware(RunTrackingMiddleware, tracker=run_tracker, path_prefix="/copilotkit")
+# a batch runs many turns, each under its own budget, so the request as a whole is not budgeted
+app.add_middleware(RunTrackingMiddleware, tracker=run_tracker, path_prefix="/batch", budget=False)
+health = HealthMonitor(warmup, run_tracker, admission_controller)
+
+
+@app.on_event("startup")
+async def startup():
+    """Start the health monitor and drain on SIGTERM, then warm up before serving in eager mode, or in the background in lazy mode."""
+    health.start()
+    run_tracker.drain_on_signal(GRACEFUL_SHUTDOWN_TIMEOUT)
+    if warmup.mode == "eager":
+        await warmup.wait()
+    else:
+        warmup.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Drain any graph runs left, then release pooled outbound connections and the checkpoint store. SIGTERM has already drained the rest."""
+    await run_tracker.drain(GRACEFUL_SHUTDOWN_TIMEOUT)
+    await health.stop()
+    await close_http_client()
+    if is_graph_compiled():
+        from src.utils.models import close_models
+
+        await close_models()
+    await close_checkpointer()
+    mark_worker_exited()
+
+
+@app.get("/threads/{thread_id}/revisions")
+async def list_blog_revisions(thread_id: str):
+    """List the stored blog post revisions of a thread."""
+    return await get_checkpointer().list_revisions(thread_id)
+
+
+@app.get("/threads/{thread_id}/revisions/{revision}")
+async def get_blog_revision(thread_id: str, revision: int):
+    """Return one blog post revision of a thread."""
+    try:
+        return await get_checkpointer().get_revision(thread_id, revision)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+class BatchRequest(BaseModel):
+    topics: List[str] = Field(min_length=1, max_length=BATCH_MAX_TOPICS, description="The topics to write blog posts about")
+    batch_id: Optional[str] = Field(default=None, description="Id of an earlier batch to resume")
+    concurrency: int = Field(default=BATCH_CONCURRENCY, ge=1, le=64, description="Topics generated at once")
+    generation_mode: Optional[Literal["single", "sectioned"]] = Field(default=None, description="Blog generation mode; None uses BLOG_GENERATION_MODE")
+
+
+@app.post("/batch")
+async def generate_batch(request: BatchRequest, http_request: Request):
+    """Generate blog posts for many topics, streaming one JSON line per topic as it finishes and a summary line last. Each topic is admitted like an agent run."""
+    await warmup.wait()
+    runner = BatchRunner(get_blog_post_generator_graph(), request.concurrency, request.generation_mode, admission_controller, tenant_key(http_request.scope))
+
+    async def stream():
+        async for result in runner.run(request.topics, request.batch_id):
+            yield result.model_dump_json() + "\n"
+        yield runner.summary.model_dump_json() + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@app.get("/metrics")
+async def metrics():
+    """Expose node, LLM, HTTP and cache metrics for Prometheus to scrape."""
+    payload, content_type = render_metrics()
+    return Response(content=payload, media_type=content_type)
 
-add_fastapi_endpoint(app, sdk, "/copilotkit")
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint for Railway deployment."""
-    try:
-        # Basic application state check
-        app_state = {
-            "status": "healthy",
-            "version": "1.0.0",
-            "environment": os.getenv("ENVIRONMENT", "production"),
-            "timestamp": str(uuid4())
-        }
-        
-        logger.info("Health check passed")
-        return app_state
-    except Exception as e:
-        logger.error(f"Health check failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    """Liveness: the process and its event loop answer. Dependencies are checked by /ready."""
+    return {**health.liveness(), "version": "1.0.0", "environment": os.getenv("ENVIRONMENT", "production")}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 200 when this worker should get traffic, 503 with the reasons while it should not."""
+    readiness = await health.readiness()
+    return JSONResponse(readiness.model_dump(), status_code=200 if readiness.ready else 503)
+
+
+@app.get("/health/stats")
+async def health_stats():
+    """Event loop lag, graph runs, admission queue, dependency probes, circuit states and the readiness thresholds."""
+    return await health.stats()
+
+
+def prepare_metrics_dir() -> None:
+    """Point every worker at a fresh shared directory for multi-process Prometheus metrics."""
+    shutil.rmtree(METRICS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = METRICS_MULTIPROC_DIR
+
 
 def main():
-    """Run the uvicorn server."""
+    """Run the uvicorn server, with reload in development or multiple workers in production."""
     try:
         port = int(os.getenv("PORT", "8000"))
-        logger.info(f"Starting server on port {port}")
+        if SERVER_MODE == "production":
+            from src.checkpoint import CHECKPOINTER_BACKEND
+
+            if CHECKPOINTER_BACKEND == "memory" and WEB_CONCURRENCY > 1:
+                raise ValueError("CHECKPOINTER_BACKEND=memory cannot be shared between workers, use sqlite or WEB_CONCURRENCY=1")
+            prepare_metrics_dir()
+            # workers read it to take their share of the outbound rate limits
+            os.environ["WEB_CONCURRENCY"] = str(WEB_CONCURRENCY)
+            logger.info(f"Starting production server on port {port} with {WEB_CONCURRENCY} workers")
+            uvicorn.run(
+                "src.app:app",
+                host="0.0.0.0",
+                port=port,
+                workers=WEB_CONCURRENCY,
+                timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT,
+            )
+            return
+
+        logger.info(f"Starting development server on port {port}")
         uvicorn.run(
             "src.app:app",
             host="0.0.0.0",
@@ -0,0 +1,10 @@
+from .runner import BATCH_CONCURRENCY, BATCH_MAX_TOPICS, BatchItemResult, BatchRunner, BatchSummary, batch_thread_id
+
+__all__ = [
+    "BATCH_CONCURRENCY",
+    "BATCH_MAX_TOPICS",
+    "BatchItemResult",
+    "BatchRunner",
+    "BatchSummary",
+    "batch_thread_id",
+]
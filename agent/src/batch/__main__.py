@@ -0,0 +1,3 @@
+from src.batch.cli import main
+
+main()
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import sys
+from typing import List, Optional, TextIO
+
+from src.batch.runner import BATCH_CONCURRENCY, BatchRunner
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def read_topics(stream: TextIO) -> List[str]:
+    """Read one topic per line, skipping blank lines and # comments."""
+    return [line.strip() for line in stream if line.strip() and not line.lstrip().startswith("#")]
+
+
+async def run(topics: List[str], batch_id: Optional[str], concurrency: int, output: Optional[TextIO], generation_mode: Optional[str] = None) -> int:
+    from src.graph.graph import checkpointer, graph
+    from src.utils.http import close_http_client
+    from src.utils.models import close_models
+
+    runner = BatchRunner(graph, concurrency, generation_mode)
+    try:
+        async for result in runner.run(topics, batch_id):
+            title = result.blog_post.title if result.blog_post else result.error
+            print(f"[{result.status:>9}] {result.elapsed:6.1f}s  {result.topic}  ->  {title}", flush=True)
+            if output is not None:
+                output.write(result.model_dump_json() + "\n")
+                output.flush()
+    finally:
+        await close_http_client()
+        await close_models()
+        await checkpointer.close()
+
+    summary = runner.summary
+    print(
+        f"\nBatch {summary.batch_id}: {summary.completed} completed, {summary.resumed} resumed, {summary.failed} failed of {summary.topics} topics"
+        f" in {summary.elapsed:.1f}s ({summary.posts_per_minute:.1f} posts/minute)"
+    )
+    print(f"Searches: {summary.search_requests} sent, {summary.search_reuses} reused")
+    if summary.failed:
+        print(f"Rerun with --batch-id {summary.batch_id} to retry the failed topics")
+    return 1 if summary.failed else 0
+
+
+def main() -> None:
+    """Generate blog posts for a file of topics, one per line."""
+    parser = argparse.ArgumentParser(description="Generate blog posts for a list of topics, bypassing the router.")
+    parser.add_argument("topics", help="File with one topic per line, or - for stdin")
+    parser.add_argument("--batch-id", help="Resume the batch with this id instead of starting a new one")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Topics generated at once")
+    parser.add_argument("--output", help="Write one JSON result per line to this file")
+    parser.add_argument("--generation-mode", choices=["single", "sectioned"], help="Blog generation mode; defaults to BLOG_GENERATION_MODE")
+    args = parser.parse_args()
+
+    if args.topics == "-":
+        topics = read_topics(sys.stdin)
+    else:
+        with open(args.topics, encoding="utf-8") as stream:
+            topics = read_topics(stream)
+
+    output = open(args.output, "a", encoding="utf-8") if args.output else None
+    try:
+        sys.exit(asyncio.run(run(topics, args.batch_id, args.concurrency, output, args.generation_mode)))
+    finally:
+        if output is not None:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
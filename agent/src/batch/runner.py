@@ -0,0 +1,179 @@
+import asyncio
+import hashlib
+import os
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+from uuid import uuid4
+
+from pydantic import BaseModel, Field
+
+from src.cache.search_cache import get_search_cache, normalize_query
+from src.schema.nodes import ROUTER, WEB_SEARCH
+from src.schema.schema import BlogPost
+from src.utils.logger import get_logger
+from src.utils.resilience import turn_budget
+
+if TYPE_CHECKING:
+    from src.server.admission import AdmissionController
+
+logger = get_logger(__name__)
+
+# Constants for batch generation
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "8"))
+BATCH_MAX_TOPICS = int(os.getenv("BATCH_MAX_TOPICS", "500"))
+BATCH_PROMPT = "Write a blog post about {topic}"
+
+
+class BatchItemResult(BaseModel):
+    topic: str = Field(description="The topic as submitted")
+    thread_id: str = Field(description="The thread holding the topic's checkpoints")
+    status: str = Field(description="completed, resumed (finished by an earlier run) or failed")
+    blog_post: Optional[BlogPost] = Field(default=None, description="The generated blog post")
+    elapsed: float = Field(default=0.0, description="Seconds spent on the topic in this run")
+    error: Optional[str] = Field(default=None, description="The error for failed topics")
+
+
+class BatchSummary(BaseModel):
+    batch_id: str = Field(description="Pass the same id again to resume the batch")
+    topics: int = Field(description="Distinct topics in the batch")
+    completed: int = Field(default=0, description="Topics generated in this run")
+    resumed: int = Field(default=0, description="Topics already finished by an earlier run")
+    failed: int = Field(default=0, description="Topics that failed")
+    search_requests: int = Field(default=0, description="Searches sent upstream")
+    search_reuses: int = Field(default=0, description="Searches answered by the cache or by an identical search in flight")
+    elapsed: float = Field(default=0.0, description="Wall time of the run in seconds")
+    posts_per_minute: float = Field(default=0.0, description="Posts completed per minute of wall time")
+
+
+def batch_thread_id(batch_id: str, topic: str) -> str:
+    """Deterministic thread id for a topic in a batch, so a rerun finds the topic's checkpoints."""
+    digest = hashlib.sha256(normalize_query(topic).encode("utf-8")).hexdigest()[:16]
+    return f"batch-{batch_id}-{digest}"
+
+
+class BatchRunner:
+    """
+    Generates blog posts for a list of topics on the compiled graph.
+
+    Each topic runs on its own thread. The router is skipped: the topic is
+    written as the router's output with the web search route, and the graph
+    continues from there to generate_blog. Because every step is
+    checkpointed, running the same batch id again skips finished topics and
+    continues interrupted ones from their last completed node.
+
+    Each topic gets its own turn latency budget. Given the server's
+    admission controller, each topic also takes an admission slot under the
+    caller's tenant key, so batch topics and interactive runs share the
+    worker's limits; a topic turned away waits out the Retry-After and asks
+    again rather than failing.
+    """
+
+    def __init__(
+        self,
+        graph: Any,
+        concurrency: int = BATCH_CONCURRENCY,
+        generation_mode: Optional[str] = None,
+        admission: Optional["AdmissionController"] = None,
+        tenant: str = "batch",
+    ):
+        self.graph = graph
+        self.concurrency = concurrency
+        self.generation_mode = generation_mode
+        self.admission = admission
+        self.tenant = tenant
+        self.summary: Optional[BatchSummary] = None
+
+    async def run_topic(self, batch_id: str, topic: str) -> BatchItemResult:
+        """Generate, resume or look up the blog post for one topic."""
+        from langchain_core.messages import HumanMessage
+
+        thread_id = batch_thread_id(batch_id, topic)
+        config = {"configurable": {"thread_id": thread_id}}
+        start = time.perf_counter()
+        try:
+            snapshot = await self.graph.aget_state(config)
+            blog_post = snapshot.values.get("blog_post") if snapshot.values else None
+            if blog_post is not None and blog_post.content and not snapshot.next:
+                return BatchItemResult(topic=topic, thread_id=thread_id, status="resumed", blog_post=blog_post)
+
+            with turn_budget(replace=True):
+                if not snapshot.next:
+                    update = {"messages": [HumanMessage(content=BATCH_PROMPT.format(topic=topic))], "route": WEB_SEARCH, "generation_mode": self.generation_mode}
+                    await self.graph.aupdate_state(config, update, as_node=ROUTER)
+                else:
+                    logger.info(f"Resuming batch topic {topic!r} at {snapshot.next}")
+                await self.graph.ainvoke(None, config)
+
+            snapshot = await self.graph.aget_state(config)
+            return BatchItemResult(
+                topic=topic, thread_id=thread_id, status="completed", blog_post=snapshot.values.get("blog_post"), elapsed=time.perf_counter() - start
+            )
+        except Exception as e:
+            logger.error(f"Batch topic {topic!r} failed: {str(e)}", exc_info=True)
+            return BatchItemResult(topic=topic, thread_id=thread_id, status="failed", elapsed=time.perf_counter() - start, error=str(e))
+
+    async def run_admitted_topic(self, batch_id: str, topic: str) -> BatchItemResult:
+        """Run one topic in an admission slot, waiting and asking again while admission control turns it away."""
+        if self.admission is None:
+            return await self.run_topic(batch_id, topic)
+        from src.server.admission import AdmissionRejected
+
+        while True:
+            try:
+                async with self.admission.admit(self.tenant):
+                    return await self.run_topic(batch_id, topic)
+            except AdmissionRejected as e:
+                logger.info(f"Batch topic {topic!r} not admitted ({e.reason}), asking again in {e.retry_after:.0f}s")
+                await asyncio.sleep(e.retry_after)
+
+    async def run(self, topics: List[str], batch_id: Optional[str] = None) -> AsyncIterator[BatchItemResult]:
+        """
+        Run every topic with at most ``concurrency`` in flight, yielding results as they finish.
+
+        Topics that normalize to the same text are generated once. After the
+        last result, ``summary`` holds the run's totals.
+
+        Args:
+            topics (List[str]): The topics to write about
+            batch_id (Optional[str]): Id of the batch to resume, or None to start a new one
+
+        Yields:
+            BatchItemResult: One result per distinct topic, in completion order
+        """
+        # imported here so the server can import the batch models without loading the nodes
+        from src.nodes.web_search_node import search_flight
+
+        batch_id = batch_id or uuid4().hex[:12]
+        unique: Dict[str, str] = {}
+        for topic in topics:
+            unique.setdefault(normalize_query(topic), topic.strip())
+        summary = BatchSummary(batch_id=batch_id, topics=len(unique))
+        logger.info(f"Starting batch {batch_id} with {len(unique)} topics at concurrency {self.concurrency}")
+
+        search_stats = get_search_cache().stats
+        misses_before, hits_before = search_stats.misses, search_stats.hits
+        coalesced_before = search_flight.coalesced
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(topic: str) -> BatchItemResult:
+            async with semaphore:
+                return await self.run_admitted_topic(batch_id, topic)
+
+        start = time.perf_counter()
+        tasks = [asyncio.ensure_future(bounded(topic)) for topic in unique.values()]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                setattr(summary, result.status, getattr(summary, result.status) + 1)
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        summary.elapsed = time.perf_counter() - start
+        summary.posts_per_minute = summary.completed * 60 / summary.elapsed if summary.elapsed else 0.0
+        coalesced = search_flight.coalesced - coalesced_before
+        summary.search_requests = search_stats.misses - misses_before - coalesced
+        summary.search_reuses = search_stats.hits - hits_before + coalesced
+        self.summary = summary
+        logger.info(f"Finished batch {batch_id}: {summary.model_dump()}")
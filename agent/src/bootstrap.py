@@ -0,0 +1,29 @@
+import logging
+
+from dotenv import load_dotenv
+
+_bootstrapped = False
+
+
+def bootstrap() -> None:
+    """
+    Load .env and configure root logging, once per process.
+
+    Runs from the src package itself, before any submodule reads its
+    settings with os.getenv at import time, so the app, the LangGraph CLI
+    and the batch CLI all see the same environment. Calling it again is a
+    no-op.
+    """
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    _bootstrapped = True
+    load_dotenv()
+
+    # imported after load_dotenv so LOG_LEVEL can come from .env
+    from src.utils.logger import DATE_FORMAT, LOG_FORMAT, LOG_LEVEL
+
+    logging.basicConfig(level=LOG_LEVEL if isinstance(logging.getLevelName(LOG_LEVEL), int) else logging.INFO, format=LOG_FORMAT, datefmt=DATE_FORMAT)
+    # Disable noisy HTTP request logs
+    for name in ["httpx", "httpcore"]:
+        logging.getLogger(name).setLevel(logging.WARNING)
@@ -0,0 +1,20 @@
+from .search_cache import CacheStats, SearchCache, get_search_cache, normalize_query
+from .search_index import IndexMatch, SearchIndex, get_search_index
+from .summary_cache import CacheBackend, FileBackend, MemoryBackend, SQLiteBackend, SummaryCache, SummaryCacheStats, get_summary_cache
+
+__all__ = [
+    "CacheBackend",
+    "CacheStats",
+    "FileBackend",
+    "IndexMatch",
+    "MemoryBackend",
+    "SQLiteBackend",
+    "SearchCache",
+    "SearchIndex",
+    "SummaryCache",
+    "SummaryCacheStats",
+    "get_search_cache",
+    "get_search_index",
+    "get_summary_cache",
+    "normalize_query",
+]
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from src.utils.logger import get_logger
+from src.utils.metrics import record_cache_lookup
+
+logger = get_logger(__name__)
+
+# Constants for search cache configuration
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", ".cache/search_cache.sqlite3")
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", str(24 * 60 * 60)))
+SEARCH_CACHE_MEMORY_SIZE = int(os.getenv("SEARCH_CACHE_MEMORY_SIZE", "256"))
+SEARCH_CACHE_DISK_SIZE = int(os.getenv("SEARCH_CACHE_DISK_SIZE", "10000"))
+
+
+class CacheStats(BaseModel):
+    memory_hits: int = Field(default=0, description="Lookups served from the in-process tier")
+    disk_hits: int = Field(default=0, description="Lookups served from the on-disk tier")
+    misses: int = Field(default=0, description="Lookups that found no fresh entry")
+    evictions: int = Field(default=0, description="Entries removed for size or age")
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different phrasings share a cache key."""
+    query = re.sub(r"\s+", " ", query.strip().lower())
+    return query.rstrip("?.!")
+
+
+class SearchCache:
+    """
+    Two-tier cache of raw search responses keyed by normalized query.
+
+    Lookups check an in-process LRU first and fall back to a SQLite table.
+    Entries older than the TTL are treated as misses, and both tiers evict the
+    least recently used entries once they grow past their configured size.
+    Async code should use aget and aset, which keep SQLite off the event loop.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = SEARCH_CACHE_PATH,
+        ttl: float = SEARCH_CACHE_TTL,
+        memory_size: int = SEARCH_CACHE_MEMORY_SIZE,
+        disk_size: int = SEARCH_CACHE_DISK_SIZE,
+    ):
+        self.ttl = ttl
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.stats = CacheStats()
+        self._memory: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        # the memory tier and stats are guarded separately from the SQLite connection, so
+        # lookups on the event loop never wait behind disk I/O in a worker thread
+        self._memory_lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            # WAL lets several server workers read and write the same cache file
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS search_cache_accessed_at ON search_cache (accessed_at)")
+            self._conn.commit()
+
+    def _is_fresh(self, created_at: float, now: float) -> bool:
+        return now - created_at < self.ttl
+
+    def _remember(self, key: str, created_at: float, value: Any) -> None:
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+            self.stats.evictions += 1
+
+    def get(self, query: str) -> Optional[Any]:
+        """Return the cached response for the query, or None on a miss. Blocks on the SQLite tier."""
+        key, now = normalize_query(query), time.time()
+        value = self._get_memory(key, now)
+        if value is None and self._conn is not None:
+            value = self._get_disk(key, now)
+        return self._counted(value)
+
+    async def aget(self, query: str) -> Optional[Any]:
+        """Like get, with the SQLite tier read in a worker thread so the event loop is not blocked."""
+        key, now = normalize_query(query), time.time()
+        value = self._get_memory(key, now)
+        if value is None and self._conn is not None:
+            value = await asyncio.to_thread(self._get_disk, key, now)
+        return self._counted(value)
+
+    def set(self, query: str, value: Any) -> None:
+        """Store a response for the query in both tiers. Blocks on the SQLite tier."""
+        key, now = normalize_query(query), time.time()
+        with self._memory_lock:
+            self._remember(key, now, value)
+        if self._conn is not None:
+            self._set_disk(key, value, now)
+
+    async def aset(self, query: str, value: Any) -> None:
+        """Like set, with the SQLite tier written in a worker thread so the event loop is not blocked."""
+        key, now = normalize_query(query), time.time()
+        with self._memory_lock:
+            self._remember(key, now, value)
+        if self._conn is not None:
+            await asyncio.to_thread(self._set_disk, key, value, now)
+
+    def _get_memory(self, key: str, now: float) -> Optional[Any]:
+        with self._memory_lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            if self._is_fresh(entry[0], now):
+                self._memory.move_to_end(key)
+                self.stats.memory_hits += 1
+                record_cache_lookup("search", hit=True)
+                return entry[1]
+            del self._memory[key]
+            self.stats.evictions += 1
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[Any]:
+        with self._disk_lock:
+            row = self._conn.execute("SELECT value, created_at FROM search_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            fresh = self._is_fresh(row[1], now)
+            if fresh:
+                self._conn.execute("UPDATE search_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            else:
+                self._conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            self._conn.commit()
+        if not fresh:
+            with self._memory_lock:
+                self.stats.evictions += 1
+            return None
+        value = json.loads(row[0])
+        with self._memory_lock:
+            self._remember(key, row[1], value)
+            self.stats.disk_hits += 1
+        record_cache_lookup("search", hit=True)
+        return value
+
+    def _counted(self, value: Optional[Any]) -> Optional[Any]:
+        if value is None:
+            with self._memory_lock:
+                self.stats.misses += 1
+            record_cache_lookup("search", hit=False)
+        return value
+
+    def _set_disk(self, key: str, value: Any, now: float) -> None:
+        payload = json.dumps(value)
+        with self._disk_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            evicted = self._evict_disk(now)
+            self._conn.commit()
+        with self._memory_lock:
+            self.stats.evictions += evicted
+
+    def _evict_disk(self, now: float) -> int:
+        """Delete expired rows and the least recently used ones past disk_size; return how many went."""
+        expired = self._conn.execute("DELETE FROM search_cache WHERE created_at < ?", (now - self.ttl,)).rowcount
+        count = self._conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        overflow = max(count - self.disk_size, 0)
+        if overflow:
+            self._conn.execute(
+                "DELETE FROM search_cache WHERE key IN (SELECT key FROM search_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+        return expired + overflow
+
+    def ping(self) -> None:
+        """Raise if the SQLite tier cannot be read. Does not count as a lookup."""
+        if self._conn is not None:
+            with self._disk_lock:
+                self._conn.execute("SELECT 1 FROM search_cache LIMIT 1").fetchone()
+
+    def clear(self) -> None:
+        """Remove every entry from both tiers."""
+        with self._memory_lock:
+            self._memory.clear()
+        if self._conn is not None:
+            with self._disk_lock:
+                self._conn.execute("DELETE FROM search_cache")
+                self._conn.commit()
+
+
+_search_cache: Optional[SearchCache] = None
+
+
+def get_search_cache() -> SearchCache:
+    """Get the process-wide search cache, creating it on first use."""
+    global _search_cache
+    if _search_cache is None:
+        _search_cache = SearchCache()
+    return _search_cache
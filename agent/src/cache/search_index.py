@@ -0,0 +1,285 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from src.schema.schema import SearchResult
+from src.utils.logger import get_logger
+from src.utils.metrics import record_cache_lookup
+
+logger = get_logger(__name__)
+
+# Constants for the search result index. An empty SEARCH_INDEX_PATH keeps the index in memory.
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", ".cache/search_index")
+SEARCH_INDEX_MAX_AGE = float(os.getenv("SEARCH_INDEX_MAX_AGE", str(7 * 24 * 60 * 60)))
+SEARCH_INDEX_INITIAL_CAPACITY = int(os.getenv("SEARCH_INDEX_INITIAL_CAPACITY", "1024"))
+LOOKUP_ATTEMPTS = 2
+
+LINK_PATTERN = re.compile(r"\]\((https?://[^)\s]+)\)")
+
+
+class IndexMatch(BaseModel):
+    result: SearchResult = Field(description="The stored answer")
+    urls: List[str] = Field(default_factory=list, description="Sources cited by the answer")
+    created_at: float = Field(description="When the answer was summarized, as a Unix timestamp")
+    similarity: float = Field(description="Cosine similarity between the query and the stored question")
+
+
+def cited_urls(text: Optional[str]) -> List[str]:
+    """The distinct URLs of the markdown links in a summary, in order of first citation."""
+    return list(dict.fromkeys(LINK_PATTERN.findall(text or "")))
+
+
+class SearchIndex:
+    """
+    Persistent vector index of summarized search results.
+
+    Question embeddings live in a memory-mapped float32 matrix and their
+    creation times in a parallel float64 array, so a lookup is one matrix
+    product over the mapped rows with stale rows masked out. The answers,
+    cited URLs and timestamps live in a SQLite table keyed by row, which also
+    holds the index's size and generation and serializes writers, so several
+    server workers can share one index directory.
+
+    Inserts append rows, doubling the files when full. Before growing, rows
+    older than ``max_age`` are compacted away into a new generation of files;
+    readers notice the new generation and remap.
+    """
+
+    def __init__(self, path: Optional[str] = SEARCH_INDEX_PATH, max_age: float = SEARCH_INDEX_MAX_AGE, initial_capacity: int = SEARCH_INDEX_INITIAL_CAPACITY):
+        self.path = path
+        self.max_age = max_age
+        self.initial_capacity = max(initial_capacity, 1)
+        self._lock = threading.Lock()
+        self._vectors: Optional[np.ndarray] = None
+        self._created: Optional[np.ndarray] = None
+        self._mapped: Tuple[int, int, int] = (-1, 0, 0)  # generation, capacity, dim
+
+        if path:
+            os.makedirs(path, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(path, "index.sqlite3"), check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        else:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                row INTEGER PRIMARY KEY,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                urls TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (id INTEGER PRIMARY KEY CHECK (id = 0), generation INTEGER, capacity INTEGER, size INTEGER, dim INTEGER, embedder TEXT)")
+        self._conn.execute("INSERT OR IGNORE INTO meta VALUES (0, 0, 0, 0, 0, '')")
+
+    def _meta(self) -> Tuple[int, int, int, int, str]:
+        return self._conn.execute("SELECT generation, capacity, size, dim, embedder FROM meta").fetchone()
+
+    def _files(self, generation: int) -> Tuple[str, str]:
+        return os.path.join(self.path, f"vectors-{generation}.f32"), os.path.join(self.path, f"created-{generation}.f64")
+
+    def _remove_files(self, generation: int) -> None:
+        if not self.path:
+            return
+        for file in self._files(generation):
+            if os.path.exists(file):
+                # other processes keep their mapping of the unlinked file until they remap
+                os.remove(file)
+
+    def _allocate(self, generation: int, capacity: int, dim: int) -> None:
+        """Create or extend the generation's files to ``capacity`` rows."""
+        if not self.path:
+            return
+        for file, itemsize in zip(self._files(generation), (4 * dim, 8)):
+            with open(file, "ab") as f:
+                if f.tell() < capacity * itemsize:
+                    f.truncate(capacity * itemsize)
+
+    def _map(self, generation: int, capacity: int, dim: int) -> None:
+        """Point the arrays at the current files, remapping after growth or compaction by any process."""
+        if self._mapped == (generation, capacity, dim):
+            return
+        if not self.path:
+            vectors = np.zeros((capacity, dim), dtype=np.float32)
+            created = np.zeros(capacity)
+            if self._vectors is not None and self._mapped[2] == dim:
+                rows = min(len(self._vectors), capacity)
+                vectors[:rows], created[:rows] = self._vectors[:rows], self._created[:rows]
+        elif capacity == 0:
+            vectors, created = np.zeros((0, dim), dtype=np.float32), np.zeros(0)
+        else:
+            vectors_file, created_file = self._files(generation)
+            vectors = np.memmap(vectors_file, dtype=np.float32, mode="r+", shape=(capacity, dim))
+            created = np.memmap(created_file, dtype=np.float64, mode="r+", shape=(capacity,))
+        self._vectors, self._created = vectors, created
+        self._mapped = (generation, capacity, dim)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._meta()[2]
+
+    def lookup(self, vectors: np.ndarray, threshold: float, embedder: str) -> List[Optional[IndexMatch]]:
+        """
+        Find, per query row, the closest fresh stored answer at least ``threshold`` similar.
+
+        Args:
+            vectors (np.ndarray): Unit-length query embeddings, one row per question
+            threshold (float): Minimum cosine similarity for a match
+            embedder (str): Name of the embedder that produced the vectors
+
+        Returns:
+            List[Optional[IndexMatch]]: The match per row, or None
+        """
+        matches: List[Optional[IndexMatch]] = [None] * len(vectors)
+        # another worker may compact the index between the scan and the loads, renumbering rows;
+        # the loads run in a read transaction that first checks the scanned generation is still current
+        for _ in range(LOOKUP_ATTEMPTS):
+            with self._lock:
+                try:
+                    scan = self._scan(vectors, embedder)
+                except FileNotFoundError:
+                    # compacted into a new generation since the metadata was read
+                    continue
+                if scan is None:
+                    break
+                generation, best, scores = scan
+                self._conn.execute("BEGIN")
+                try:
+                    if self._meta()[0] == generation:
+                        matches = [self._load(int(row), float(score)) if score >= threshold else None for row, score in zip(best, scores)]
+                        break
+                finally:
+                    self._conn.execute("COMMIT")
+            logger.debug("Search index was compacted during a lookup, scanning again")
+        for match in matches:
+            record_cache_lookup("search_index", hit=match is not None)
+        return matches
+
+    def _scan(self, vectors: np.ndarray, embedder: str) -> Optional[Tuple[int, np.ndarray, np.ndarray]]:
+        """The generation scanned and, per query row, the closest fresh stored row and its similarity; None if nothing comparable is stored."""
+        generation, capacity, size, dim, stored_embedder = self._meta()
+        if size == 0 or dim != vectors.shape[1] or stored_embedder != embedder:
+            return None
+        self._map(generation, capacity, dim)
+        # stored rows on the left keeps the big matrix contiguous for BLAS
+        similarity = (self._vectors[:size] @ vectors.T).T
+        similarity[:, self._created[:size] < time.time() - self.max_age] = -1.0
+        best = similarity.argmax(axis=1)
+        return generation, best, similarity[np.arange(len(vectors)), best]
+
+    def _load(self, row: int, similarity: float) -> Optional[IndexMatch]:
+        entry = self._conn.execute("SELECT question, answer, urls, created_at FROM entries WHERE row = ?", (row,)).fetchone()
+        if entry is None:
+            return None
+        return IndexMatch(
+            result=SearchResult(question=entry[0], search_result=entry[1]), urls=json.loads(entry[2]), created_at=entry[3], similarity=similarity
+        )
+
+    def add(self, vectors: np.ndarray, results: List[SearchResult], embedder: str) -> None:
+        """
+        Append answers under the embeddings of the questions they answer.
+
+        Args:
+            vectors (np.ndarray): Unit-length question embeddings, one row per result
+            results (List[SearchResult]): The summarized answers
+            embedder (str): Name of the embedder that produced the vectors; a different
+                embedder or dimension than the stored one starts the index afresh
+        """
+        if not results:
+            return
+        now = time.time()
+        dim = vectors.shape[1]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                generation, capacity, size, stored_dim, stored_embedder = self._meta()
+                if (stored_dim, stored_embedder) != (dim, embedder):
+                    if size:
+                        logger.warning(f"Search index was built with {stored_embedder} ({stored_dim} dims), starting afresh for {embedder} ({dim} dims)")
+                    self._conn.execute("DELETE FROM entries")
+                    self._remove_files(generation)
+                    generation, capacity, size = generation + 1, 0, 0
+                if size + len(results) > capacity:
+                    generation, capacity, size = self._make_room(generation, capacity, size, dim, len(results), now)
+
+                self._map(generation, capacity, dim)
+                rows = range(size, size + len(results))
+                self._vectors[rows.start : rows.stop] = vectors
+                self._created[rows.start : rows.stop] = now
+                if isinstance(self._vectors, np.memmap):
+                    self._vectors.flush()
+                    self._created.flush()
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (row, question, answer, urls, created_at) VALUES (?, ?, ?, ?, ?)",
+                    [(row, result.question or "", result.search_result or "", json.dumps(cited_urls(result.search_result)), now) for row, result in zip(rows, results)],
+                )
+                self._conn.execute(
+                    "UPDATE meta SET generation = ?, capacity = ?, size = ?, dim = ?, embedder = ?", (generation, capacity, size + len(results), dim, embedder)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _make_room(self, generation: int, capacity: int, size: int, dim: int, incoming: int, now: float) -> Tuple[int, int, int]:
+        """Drop expired rows into a new generation if any, and grow the files if still full; returns the new generation, capacity and size."""
+        live = np.arange(size)
+        if size:
+            self._map(generation, capacity, dim)
+            live = np.flatnonzero(self._created[:size] >= now - self.max_age)
+
+        if len(live) < size:
+            new_capacity = max(self.initial_capacity, capacity)
+            while len(live) + incoming > new_capacity:
+                new_capacity *= 2
+            vectors, created = np.array(self._vectors[live]), np.array(self._created[live])
+            self._allocate(generation + 1, new_capacity, dim)
+            self._map(generation + 1, new_capacity, dim)
+            self._vectors[: len(live)], self._created[: len(live)] = vectors, created
+            cutoff = now - self.max_age
+            self._conn.execute("DELETE FROM entries WHERE created_at < ?", (cutoff,))
+            # ascending order never moves a row onto one that is still occupied
+            self._conn.executemany("UPDATE entries SET row = ? WHERE row = ?", [(new, int(old)) for new, old in enumerate(live) if new != old])
+            logger.info(f"Compacted search index from {size} to {len(live)} entries")
+            self._remove_files(generation)
+            return generation + 1, new_capacity, len(live)
+
+        new_capacity = max(self.initial_capacity, capacity)
+        while size + incoming > new_capacity:
+            new_capacity *= 2
+        self._allocate(generation, new_capacity, dim)
+        return generation, new_capacity, size
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            generation = self._meta()[0]
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("UPDATE meta SET generation = ?, capacity = 0, size = 0", (generation + 1,))
+            self._remove_files(generation)
+
+    def close(self) -> None:
+        with self._lock:
+            self._vectors = self._created = None
+            self._mapped = (-1, 0, 0)
+            self._conn.close()
+
+
+_search_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> SearchIndex:
+    """Get the process-wide search index, creating it on first use."""
+    global _search_index
+    if _search_index is None:
+        _search_index = SearchIndex()
+    return _search_index
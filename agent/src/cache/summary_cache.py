@@ -0,0 +1,269 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+from src.schema.schema import SearchResult
+from src.utils.logger import get_logger
+from src.utils.metrics import record_cache_lookup
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Constants for summary cache configuration
+SUMMARY_CACHE_BACKEND = os.getenv("SUMMARY_CACHE_BACKEND", "sqlite").lower()
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", ".cache/summary_cache")
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "5000"))
+
+
+class CacheBackend(ABC):
+    """
+    Storage for cached values, evicting least recently used entries past max_entries.
+
+    Backends that do I/O set ``blocking`` so async callers run them in a worker thread.
+    """
+
+    blocking = True
+
+    def __init__(self, max_entries: int = SUMMARY_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored value for key, or None if it is missing."""
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Store value under key, evicting old entries if needed."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry."""
+
+    @abstractmethod
+    def ping(self) -> None:
+        """Raise if the storage cannot be reached."""
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU backend."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = SUMMARY_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def ping(self) -> None:
+        # in-process storage is always reachable
+        pass
+
+
+class SQLiteBackend(CacheBackend):
+    """SQLite backend, evicting by last access time."""
+
+    def __init__(self, path: str, max_entries: int = SUMMARY_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS summary_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS summary_cache_accessed_at ON summary_cache (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM summary_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE summary_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO summary_cache (key, value, accessed_at) VALUES (?, ?, ?)", (key, value, time.time()))
+            count = self._conn.execute("SELECT COUNT(*) FROM summary_cache").fetchone()[0]
+            overflow = max(count - self.max_entries, 0)
+            if overflow:
+                self._conn.execute(
+                    "DELETE FROM summary_cache WHERE key IN (SELECT key FROM summary_cache ORDER BY accessed_at ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM summary_cache")
+            self._conn.commit()
+
+    def ping(self) -> None:
+        with self._lock:
+            self._conn.execute("SELECT 1 FROM summary_cache LIMIT 1").fetchone()
+
+
+class FileBackend(CacheBackend):
+    """One file per entry in a directory, evicting by modification time."""
+
+    def __init__(self, directory: str, max_entries: int = SUMMARY_CACHE_MAX_ENTRIES):
+        super().__init__(max_entries)
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                value = f.read()
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".json")]
+            overflow = len(entries) - self.max_entries
+            if overflow > 0:
+                for entry in sorted(entries, key=lambda e: e.stat().st_mtime)[:overflow]:
+                    try:
+                        os.remove(entry.path)
+                        self.evictions += 1
+                    except FileNotFoundError:
+                        pass
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".json"):
+                    os.remove(entry.path)
+
+    def ping(self) -> None:
+        if not os.access(self.directory, os.R_OK | os.W_OK):
+            raise OSError(f"Summary cache directory {self.directory} is not readable and writable")
+
+
+class SummaryCacheStats(BaseModel):
+    hits: int = Field(default=0, description="Summaries served from the cache")
+    misses: int = Field(default=0, description="Summaries that had to be generated")
+    evictions: int = Field(default=0, description="Entries evicted by the backend")
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def summary_cache_key(question: str, search_results: Any, model_name: str) -> str:
+    """Content address for a summary: the question, a hash of the raw search payload and the model name."""
+    payload_hash = hashlib.sha256(json.dumps(search_results, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return hashlib.sha256(f"{model_name}\0{question}\0{payload_hash}".encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """Content-addressed cache of summarized SearchResult entries."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._stats = SummaryCacheStats()
+
+    @property
+    def stats(self) -> SummaryCacheStats:
+        self._stats.evictions = self.backend.evictions
+        return self._stats
+
+    def get(self, question: str, search_results: Any, model_name: str) -> Optional[SearchResult]:
+        """Return the cached summary for this exact question, payload and model, if any. May block on the backend."""
+        return self._decode(self.backend.get(summary_cache_key(question, search_results, model_name)))
+
+    async def aget(self, question: str, search_results: Any, model_name: str) -> Optional[SearchResult]:
+        """Like get, running a blocking backend in a worker thread so the event loop is not blocked."""
+        return self._decode(await self._offload(self.backend.get, summary_cache_key(question, search_results, model_name)))
+
+    def set(self, search_results: Any, model_name: str, result: SearchResult) -> None:
+        """Store a summary under its content address. May block on the backend."""
+        self.backend.set(summary_cache_key(result.question, search_results, model_name), result.model_dump_json())
+
+    async def aset(self, search_results: Any, model_name: str, result: SearchResult) -> None:
+        """Like set, running a blocking backend in a worker thread so the event loop is not blocked."""
+        await self._offload(self.backend.set, summary_cache_key(result.question, search_results, model_name), result.model_dump_json())
+
+    async def _offload(self, function: Callable[..., T], *args: Any) -> T:
+        if self.backend.blocking:
+            return await asyncio.to_thread(function, *args)
+        return function(*args)
+
+    def _decode(self, value: Optional[str]) -> Optional[SearchResult]:
+        if value is None:
+            self._stats.misses += 1
+            record_cache_lookup("summary", hit=False)
+            return None
+        self._stats.hits += 1
+        record_cache_lookup("summary", hit=True)
+        return SearchResult.model_validate_json(value)
+
+
+def create_backend(name: str = SUMMARY_CACHE_BACKEND, path: str = SUMMARY_CACHE_PATH) -> CacheBackend:
+    """Create a cache backend by name: memory, sqlite or file."""
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        return SQLiteBackend(f"{path}.sqlite3")
+    if name == "file":
+        return FileBackend(path)
+    raise ValueError(f"Unknown summary cache backend: {name}")
+
+
+_summary_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache() -> SummaryCache:
+    """Get the process-wide summary cache, creating it on first use."""
+    global _summary_cache
+    if _summary_cache is None:
+        _summary_cache = SummaryCache(create_backend())
+    return _summary_cache
@@ -0,0 +1,27 @@
+import os
+
+from .base import CheckpointStore, CompactionResult, RetentionPolicy
+from .memory import MemoryCheckpointStore
+from .sqlite import SQLiteCheckpointStore
+
+# The checkpoint store backend: sqlite or memory
+CHECKPOINTER_BACKEND = os.getenv("CHECKPOINTER_BACKEND", "sqlite").lower()
+
+
+def create_checkpointer(backend: str = CHECKPOINTER_BACKEND) -> CheckpointStore:
+    """Create the configured checkpoint store."""
+    if backend == "sqlite":
+        return SQLiteCheckpointStore()
+    if backend == "memory":
+        return MemoryCheckpointStore()
+    raise ValueError(f"Unknown checkpointer backend: {backend}")
+
+
+__all__ = [
+    "CheckpointStore",
+    "CompactionResult",
+    "MemoryCheckpointStore",
+    "RetentionPolicy",
+    "SQLiteCheckpointStore",
+    "create_checkpointer",
+]
@@ -0,0 +1,265 @@
+import asyncio
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from pydantic import BaseModel, Field
+
+from src.checkpoint.revisions import BlogPostRevisionRef, BlogRevision, BlogRevisionStore
+from src.schema.schema import BlogPost
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Constants for checkpoint retention
+CHECKPOINT_KEEP_LAST = int(os.getenv("CHECKPOINT_KEEP_LAST", "20"))
+CHECKPOINT_IDLE_TTL = float(os.getenv("CHECKPOINT_IDLE_TTL", str(7 * 24 * 60 * 60)))
+CHECKPOINT_COMPACTION_INTERVAL = float(os.getenv("CHECKPOINT_COMPACTION_INTERVAL", "300"))
+
+
+class RetentionPolicy(BaseModel):
+    keep_last: int = Field(default=CHECKPOINT_KEEP_LAST, description="Checkpoints kept per thread and namespace")
+    idle_ttl: float = Field(default=CHECKPOINT_IDLE_TTL, description="Seconds without writes after which a thread is deleted")
+    compaction_interval: float = Field(default=CHECKPOINT_COMPACTION_INTERVAL, description="Minimum seconds between background compactions")
+
+
+class CompactionResult(BaseModel):
+    checkpoints_deleted: int = Field(default=0, description="Old checkpoints removed beyond keep_last")
+    revisions_deleted: int = Field(default=0, description="Blog post revisions no kept checkpoint refers to")
+    threads_expired: int = Field(default=0, description="Idle threads removed past idle_ttl")
+
+
+class CheckpointStore(BaseCheckpointSaver, ABC):
+    """
+    A checkpointer that delegates storage to a LangGraph saver and bounds its growth.
+
+    Subclasses create the underlying saver and implement compact(). The store
+    records when each thread was last written to, and after a write schedules a
+    background compaction if compaction_interval has passed since the last one.
+
+    The blog_post channel is not stored inline: each checkpoint holds a
+    BlogPostRevisionRef into a BlogRevisionStore, and the post is rebuilt from
+    its revision when the checkpoint is read. The revision store blocks, so
+    the async API runs it in a worker thread.
+
+    The synchronous API (get_tuple, list, put, put_writes) serves
+    graph.update_state and get_state, which CopilotKit calls on the event
+    loop thread. It goes through a separate saver from _create_sync_saver
+    that never waits on the event loop, since the loop is blocked meanwhile.
+    """
+
+    def __init__(self, retention: Optional[RetentionPolicy] = None):
+        super().__init__()
+        self.retention = retention or RetentionPolicy()
+        self._saver: Optional[BaseCheckpointSaver] = None
+        self._sync: Optional[BaseCheckpointSaver] = None
+        self._sync_lock = threading.Lock()
+        self._revisions: Optional[BlogRevisionStore] = None
+        self._init_lock: Optional[asyncio.Lock] = None
+        self._last_compaction = time.monotonic()
+        self._compaction_task: Optional[asyncio.Task] = None
+
+    @abstractmethod
+    async def _create_saver(self) -> BaseCheckpointSaver:
+        """Create the underlying LangGraph saver."""
+
+    @abstractmethod
+    def _create_sync_saver(self) -> BaseCheckpointSaver:
+        """Create the saver behind the synchronous API, over the same storage and usable from any thread."""
+
+    @abstractmethod
+    def _create_revision_store(self) -> BlogRevisionStore:
+        """Create the blog post revision store."""
+
+    @abstractmethod
+    async def compact(self) -> CompactionResult:
+        """Apply the retention policy, deleting old checkpoints and idle threads."""
+
+    @abstractmethod
+    async def _touch_thread(self, thread_id: str) -> None:
+        """Record that the thread was just written to."""
+
+    @abstractmethod
+    def _touch_thread_sync(self, thread_id: str) -> None:
+        """Record that the thread was just written to, without the event loop."""
+
+    async def close(self) -> None:
+        """Cancel background compaction and release the underlying saver."""
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            self._compaction_task = None
+
+    async def ping(self) -> None:
+        """Look up a checkpoint that never exists, raising if the underlying storage cannot be reached."""
+        await (await self.saver()).aget_tuple({"configurable": {"thread_id": "__health__", "checkpoint_ns": ""}})
+
+    def _get_init_lock(self) -> asyncio.Lock:
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        return self._init_lock
+
+    async def saver(self) -> BaseCheckpointSaver:
+        """Return the underlying saver, creating it on first use."""
+        if self._saver is None:
+            async with self._get_init_lock():
+                if self._saver is None:
+                    self._saver = await self._create_saver()
+        return self._saver
+
+    def revisions(self) -> BlogRevisionStore:
+        """Return the blog post revision store, creating it on first use. Blocks on first use."""
+        if self._revisions is None:
+            with self._sync_lock:
+                if self._revisions is None:
+                    self._revisions = self._create_revision_store()
+        return self._revisions
+
+    async def list_revisions(self, thread_id: str) -> List[BlogRevision]:
+        """List the blog post revisions stored for a thread."""
+        return await asyncio.to_thread(lambda: self.revisions().list(thread_id))
+
+    async def get_revision(self, thread_id: str, revision: int) -> BlogPost:
+        """Reconstruct one blog post revision of a thread."""
+        return await asyncio.to_thread(lambda: self.revisions().load(thread_id, revision))
+
+    @staticmethod
+    def _blog_post_to_encode(checkpoint: Checkpoint) -> Optional[BlogPost]:
+        blog_post = checkpoint["channel_values"].get("blog_post")
+        if isinstance(blog_post, dict):
+            blog_post = BlogPost(**blog_post)
+        if not isinstance(blog_post, BlogPost) or (blog_post.title is None and blog_post.content is None):
+            return None
+        return blog_post
+
+    def _encode_blog_post(self, thread_id: str, checkpoint: Checkpoint) -> Checkpoint:
+        blog_post = self._blog_post_to_encode(checkpoint)
+        if blog_post is None:
+            return checkpoint
+        ref = BlogPostRevisionRef(thread_id=thread_id, revision=self.revisions().save(thread_id, blog_post))
+        return {**checkpoint, "channel_values": {**checkpoint["channel_values"], "blog_post": ref}}
+
+    async def _aencode_blog_post(self, thread_id: str, checkpoint: Checkpoint) -> Checkpoint:
+        if self._blog_post_to_encode(checkpoint) is None:
+            return checkpoint
+        return await asyncio.to_thread(self._encode_blog_post, thread_id, checkpoint)
+
+    @staticmethod
+    def _revision_ref(checkpoint_tuple: Optional[CheckpointTuple]) -> Optional[BlogPostRevisionRef]:
+        if checkpoint_tuple is None:
+            return None
+        ref = checkpoint_tuple.checkpoint["channel_values"].get("blog_post")
+        return ref if isinstance(ref, BlogPostRevisionRef) else None
+
+    def _decode_blog_post(self, checkpoint_tuple: Optional[CheckpointTuple]) -> Optional[CheckpointTuple]:
+        ref = self._revision_ref(checkpoint_tuple)
+        if ref is not None:
+            checkpoint_tuple.checkpoint["channel_values"]["blog_post"] = self.revisions().load(ref.thread_id, ref.revision)
+        return checkpoint_tuple
+
+    async def _adecode_blog_post(self, checkpoint_tuple: Optional[CheckpointTuple]) -> Optional[CheckpointTuple]:
+        if self._revision_ref(checkpoint_tuple) is None:
+            return checkpoint_tuple
+        return await asyncio.to_thread(self._decode_blog_post, checkpoint_tuple)
+
+    def _sync_saver(self) -> BaseCheckpointSaver:
+        if self._sync is None:
+            with self._sync_lock:
+                if self._sync is None:
+                    self._sync = self._create_sync_saver()
+        return self._sync
+
+    def _maybe_schedule_compaction(self) -> None:
+        now = time.monotonic()
+        if now - self._last_compaction < self.retention.compaction_interval:
+            return
+        if self._compaction_task is not None and not self._compaction_task.done():
+            return
+        self._last_compaction = now
+        self._compaction_task = asyncio.create_task(self._run_compaction())
+
+    async def _run_compaction(self) -> None:
+        try:
+            result = await self.compact()
+            logger.info(
+                f"Checkpoint compaction deleted {result.checkpoints_deleted} checkpoints and {result.revisions_deleted} blog post revisions"
+                f" and expired {result.threads_expired} threads"
+            )
+        except Exception as e:
+            logger.error(f"Checkpoint compaction failed: {str(e)}", exc_info=True)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await self._adecode_blog_post(await (await self.saver()).aget_tuple(config))
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        async for item in (await self.saver()).alist(config, filter=filter, before=before, limit=limit):
+            yield await self._adecode_blog_post(item)
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint = await self._aencode_blog_post(thread_id, checkpoint)
+        result = await (await self.saver()).aput(config, checkpoint, metadata, new_versions)
+        await self._touch_thread(thread_id)
+        self._maybe_schedule_compaction()
+        return result
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await (await self.saver()).aput_writes(config, writes, task_id, task_path)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self._decode_blog_post(self._sync_saver().get_tuple(config))
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        for item in self._sync_saver().list(config, filter=filter, before=before, limit=limit):
+            yield self._decode_blog_post(item)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint = self._encode_blog_post(thread_id, checkpoint)
+        result = self._sync_saver().put(config, checkpoint, metadata, new_versions)
+        self._touch_thread_sync(thread_id)
+        return result
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self._sync_saver().put_writes(config, writes, task_id, task_path)
@@ -0,0 +1,68 @@
+import asyncio
+import time
+from typing import Dict, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.memory import MemorySaver
+
+from src.checkpoint.base import CheckpointStore, CompactionResult, RetentionPolicy
+from src.checkpoint.revisions import BlogRevisionStore
+
+
+class MemoryCheckpointStore(CheckpointStore):
+    """In-process checkpoint store with the same retention policy as the durable stores."""
+
+    def __init__(self, retention: Optional[RetentionPolicy] = None):
+        super().__init__(retention)
+        self._saver = MemorySaver(serde=self.serde)
+        self._thread_activity: Dict[str, float] = {}
+
+    def get_next_version(self, current, channel):
+        return self._saver.get_next_version(current, channel)
+
+    async def _create_saver(self) -> BaseCheckpointSaver:
+        return MemorySaver(serde=self.serde)
+
+    def _create_sync_saver(self) -> BaseCheckpointSaver:
+        # MemorySaver's synchronous methods never touch the event loop
+        return self._saver
+
+    def _create_revision_store(self) -> BlogRevisionStore:
+        return BlogRevisionStore(":memory:")
+
+    async def _touch_thread(self, thread_id: str) -> None:
+        self._touch_thread_sync(thread_id)
+
+    def _touch_thread_sync(self, thread_id: str) -> None:
+        self._thread_activity[thread_id] = time.time()
+
+    async def compact(self) -> CompactionResult:
+        saver: MemorySaver = await self.saver()
+        revisions = self.revisions()
+        result = CompactionResult()
+
+        cutoff = time.time() - self.retention.idle_ttl
+        for thread_id, updated_at in list(self._thread_activity.items()):
+            if updated_at < cutoff:
+                saver.storage.pop(thread_id, None)
+                for key in [key for key in saver.writes if key[0] == thread_id]:
+                    del saver.writes[key]
+                del self._thread_activity[thread_id]
+                await asyncio.to_thread(revisions.delete_thread, thread_id)
+                result.threads_expired += 1
+
+        for thread_id, namespaces in saver.storage.items():
+            for checkpoint_ns, checkpoints in namespaces.items():
+                # checkpoint ids are time-ordered, so the highest ids are the most recent
+                for checkpoint_id in sorted(checkpoints, reverse=True)[self.retention.keep_last :]:
+                    del checkpoints[checkpoint_id]
+                    saver.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+                    result.checkpoints_deleted += 1
+        result.revisions_deleted = await asyncio.to_thread(revisions.prune, self.retention.keep_last)
+        return result
+
+    async def close(self) -> None:
+        await super().close()
+        if self._revisions is not None:
+            self._revisions.close()
+            self._revisions = None
@@ -0,0 +1,239 @@
+import difflib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+from src.schema.schema import BlogPost
+
+# Constants for blog post revision storage
+BLOG_REVISION_SNAPSHOT_INTERVAL = int(os.getenv("BLOG_REVISION_SNAPSHOT_INTERVAL", "10"))
+BLOG_REVISION_CACHE_SIZE = int(os.getenv("BLOG_REVISION_CACHE_SIZE", "128"))
+
+FULL = "full"
+DELTA = "delta"
+# a post whose content is None, stored so it does not come back as ""
+EMPTY = "empty"
+
+# A delta is a list of operations over the previous revision's lines:
+# an int keeps that many lines, a negative int skips them, a list inserts new lines
+Delta = List[Union[int, List[str]]]
+
+
+class BlogPostRevisionRef(BaseModel):
+    """Stands in for a blog_post value inside a stored checkpoint."""
+
+    thread_id: str = Field(description="The thread the revision belongs to")
+    revision: int = Field(description="The revision number within the thread")
+
+
+class BlogRevision(BaseModel):
+    revision: int = Field(description="The revision number within the thread")
+    title: Optional[str] = Field(None, description="The title of the blog post")
+    kind: str = Field(description="Whether the revision is stored as a full snapshot, a delta or empty content")
+    size: int = Field(description="Stored size of the revision in bytes")
+    created_at: float = Field(description="Unix time the revision was stored")
+
+
+def compute_delta(old: str, new: str) -> Delta:
+    """Encode new as line-level operations against old."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    delta: Delta = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False).get_opcodes():
+        if tag == "equal":
+            delta.append(i2 - i1)
+            continue
+        if i2 > i1:
+            delta.append(i1 - i2)
+        if j2 > j1:
+            delta.append(new_lines[j1:j2])
+    return delta
+
+
+def apply_delta(old: str, delta: Delta) -> str:
+    """Rebuild the new text from the old text and a delta from compute_delta."""
+    old_lines = old.splitlines(keepends=True)
+    position = 0
+    parts: List[str] = []
+    for op in delta:
+        if isinstance(op, list):
+            parts.extend(op)
+        elif op >= 0:
+            parts.extend(old_lines[position : position + op])
+            position += op
+        else:
+            position -= op
+    return "".join(parts)
+
+
+class BlogRevisionStore:
+    """
+    Per-thread blog post revisions stored as periodic full snapshots plus line deltas.
+
+    Unchanged posts reuse the latest revision, so a post that survives many
+    graph steps is stored once. Reading a revision replays deltas from the
+    nearest snapshot; recently read revisions are kept in a small LRU cache.
+
+    Revision numbers are allocated inside a BEGIN IMMEDIATE transaction, so
+    workers sharing the database never store two revisions under one number.
+    Methods block on SQLite; async code runs them in a worker thread.
+    """
+
+    def __init__(self, path: str, snapshot_interval: int = BLOG_REVISION_SNAPSHOT_INTERVAL):
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+        self._cache: "OrderedDict[Tuple[str, int], BlogPost]" = OrderedDict()
+        self._lock = threading.Lock()
+        # autocommit, so the only transactions are the explicit ones in save
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA busy_timeout = 5000")
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS blog_revisions (
+                thread_id TEXT NOT NULL,
+                revision INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                title TEXT,
+                payload TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (thread_id, revision)
+            )
+            """
+        )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _remember(self, thread_id: str, revision: int, blog_post: BlogPost) -> None:
+        self._cache[(thread_id, revision)] = blog_post
+        self._cache.move_to_end((thread_id, revision))
+        while len(self._cache) > BLOG_REVISION_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def save(self, thread_id: str, blog_post: BlogPost) -> int:
+        """Store the blog post as the thread's next revision, or return the latest revision if unchanged."""
+        content_hash = hashlib.sha256(json.dumps([blog_post.title, blog_post.content]).encode("utf-8")).hexdigest()
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                revision = self._save(thread_id, blog_post, content_hash)
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self._remember(thread_id, revision, BlogPost(title=blog_post.title, content=blog_post.content))
+            return revision
+
+    def _save(self, thread_id: str, blog_post: BlogPost, content_hash: str) -> int:
+        latest = self.conn.execute(
+            "SELECT revision, content_hash FROM blog_revisions WHERE thread_id = ? ORDER BY revision DESC LIMIT 1",
+            (thread_id,),
+        ).fetchone()
+        if latest is not None and latest[1] == content_hash:
+            return latest[0]
+
+        revision = latest[0] + 1 if latest is not None else 0
+        if blog_post.content is None:
+            kind, payload = EMPTY, ""
+        elif latest is None or revision % self.snapshot_interval == 0:
+            kind, payload = FULL, blog_post.content
+        else:
+            previous = self._load(thread_id, latest[0])
+            kind, payload = DELTA, json.dumps(compute_delta(previous.content or "", blog_post.content), separators=(",", ":"))
+
+        self.conn.execute(
+            "INSERT INTO blog_revisions (thread_id, revision, kind, title, payload, content_hash, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (thread_id, revision, kind, blog_post.title, payload, content_hash, time.time()),
+        )
+        return revision
+
+    def load(self, thread_id: str, revision: int) -> BlogPost:
+        """Reconstruct a revision from the nearest full snapshot at or before it."""
+        with self._lock:
+            return self._load(thread_id, revision)
+
+    def _load(self, thread_id: str, revision: int) -> BlogPost:
+        cached = self._cache.get((thread_id, revision))
+        if cached is not None:
+            self._cache.move_to_end((thread_id, revision))
+            return cached
+
+        rows = self.conn.execute(
+            """
+            SELECT revision, kind, title, payload FROM blog_revisions
+            WHERE thread_id = ? AND revision <= ? AND revision >= (
+                SELECT MAX(revision) FROM blog_revisions WHERE thread_id = ? AND revision <= ? AND kind != ?
+            )
+            ORDER BY revision ASC
+            """,
+            (thread_id, revision, thread_id, revision, DELTA),
+        ).fetchall()
+        if not rows or rows[-1][0] != revision:
+            raise KeyError(f"Blog post revision {revision} not found for thread {thread_id}")
+
+        content: Optional[str] = None
+        for _, kind, _, payload in rows:
+            if kind == FULL:
+                content = payload
+            elif kind == EMPTY:
+                content = None
+            else:
+                content = apply_delta(content or "", json.loads(payload))
+        blog_post = BlogPost(title=rows[-1][2], content=content)
+        self._remember(thread_id, revision, blog_post)
+        return blog_post
+
+    def list(self, thread_id: str) -> List[BlogRevision]:
+        """List a thread's revisions, oldest first."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT revision, title, kind, LENGTH(payload), created_at FROM blog_revisions WHERE thread_id = ? ORDER BY revision ASC",
+                (thread_id,),
+            ).fetchall()
+        return [BlogRevision(revision=row[0], title=row[1], kind=row[2], size=row[3], created_at=row[4]) for row in rows]
+
+    def prune(self, keep_last: int) -> int:
+        """
+        Delete each thread's revisions older than its keep_last most recent.
+
+        Every checkpoint adds at most one revision, so a thread's keep_last
+        most recent checkpoints only refer to its keep_last most recent
+        revisions. The snapshot the oldest kept delta starts from is kept too.
+
+        Returns:
+            int: The number of revisions deleted
+        """
+        with self._lock:
+            deleted = self.conn.execute(
+                """
+                DELETE FROM blog_revisions WHERE rowid IN (
+                    SELECT r.rowid FROM blog_revisions r WHERE r.revision < (
+                        SELECT MAX(base.revision) FROM blog_revisions base
+                        WHERE base.thread_id = r.thread_id AND base.kind != ? AND base.revision <= (
+                            SELECT MAX(latest.revision) FROM blog_revisions latest WHERE latest.thread_id = r.thread_id
+                        ) - ? + 1
+                    )
+                )
+                """,
+                (DELTA, keep_last),
+            ).rowcount
+            if deleted:
+                self._cache.clear()
+        return deleted
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Remove every revision of a thread."""
+        with self._lock:
+            self.conn.execute("DELETE FROM blog_revisions WHERE thread_id = ?", (thread_id,))
+            for key in [key for key in self._cache if key[0] == thread_id]:
+                del self._cache[key]
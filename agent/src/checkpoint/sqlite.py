@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sqlite3
+import time
+from typing import Any, Optional
+
+import aiosqlite
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from src.checkpoint.base import CheckpointStore, CompactionResult, RetentionPolicy
+from src.checkpoint.revisions import BlogRevisionStore
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Constants for the SQLite checkpoint store
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", ".cache/checkpoints.sqlite3")
+
+
+async def connect_sqlite(path: str, **kwargs: Any) -> aiosqlite.Connection:
+    """Open an aiosqlite connection whose worker thread does not keep the process alive."""
+    conn = aiosqlite.connect(path, **kwargs)
+    conn.daemon = True
+    return await conn
+
+
+THREAD_ACTIVITY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS thread_activity (thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS thread_activity_updated_at ON thread_activity (updated_at);
+"""
+
+
+class SQLiteCheckpointStore(CheckpointStore):
+    """
+    Checkpoint store backed by a local SQLite database through AsyncSqliteSaver.
+
+    The synchronous API uses a SqliteSaver on its own connection to the same
+    file. The async connection runs in autocommit mode, so no write
+    transaction stays open across an await while the event loop thread is
+    blocked in a synchronous call that needs the write lock.
+    """
+
+    def __init__(self, path: str = CHECKPOINT_DB_PATH, retention: Optional[RetentionPolicy] = None):
+        super().__init__(retention)
+        self.path = path
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._sync_conn: Optional[sqlite3.Connection] = None
+
+    def get_next_version(self, current, channel):
+        return AsyncSqliteSaver.get_next_version(self, current, channel)
+
+    def _make_directory(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    async def _create_saver(self) -> BaseCheckpointSaver:
+        self._make_directory()
+        self._conn = await connect_sqlite(self.path, isolation_level=None)
+        await self._conn.execute("PRAGMA busy_timeout = 5000")
+        await self._conn.executescript(THREAD_ACTIVITY_SCHEMA)
+        saver = AsyncSqliteSaver(self._conn, serde=self.serde)
+        await saver.setup()
+        logger.info(f"Opened SQLite checkpoint store at {self.path}")
+        return saver
+
+    def _create_sync_saver(self) -> BaseCheckpointSaver:
+        self._make_directory()
+        self._sync_conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._sync_conn.execute("PRAGMA busy_timeout = 5000")
+        self._sync_conn.executescript(THREAD_ACTIVITY_SCHEMA)
+        saver = SqliteSaver(self._sync_conn, serde=self.serde)
+        saver.setup()
+        return saver
+
+    def _create_revision_store(self) -> BlogRevisionStore:
+        self._make_directory()
+        return BlogRevisionStore(self.path)
+
+    async def _touch_thread(self, thread_id: str) -> None:
+        saver = await self.saver()
+        async with saver.lock:
+            await self._conn.execute("INSERT OR REPLACE INTO thread_activity (thread_id, updated_at) VALUES (?, ?)", (thread_id, time.time()))
+            await self._conn.commit()
+
+    def _touch_thread_sync(self, thread_id: str) -> None:
+        saver: SqliteSaver = self._sync_saver()
+        with saver.cursor() as cursor:
+            cursor.execute("INSERT OR REPLACE INTO thread_activity (thread_id, updated_at) VALUES (?, ?)", (thread_id, time.time()))
+
+    async def compact(self) -> CompactionResult:
+        saver = await self.saver()
+        revisions = await asyncio.to_thread(self.revisions)
+        result = CompactionResult()
+        async with saver.lock:
+            cursor = await self._conn.execute("SELECT thread_id FROM thread_activity WHERE updated_at < ?", (time.time() - self.retention.idle_ttl,))
+            expired = [row[0] for row in await cursor.fetchall()]
+            for thread_id in expired:
+                await self._conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+                await self._conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+                await self._conn.execute("DELETE FROM thread_activity WHERE thread_id = ?", (thread_id,))
+                await asyncio.to_thread(revisions.delete_thread, thread_id)
+            result.threads_expired = len(expired)
+
+            # checkpoint ids are time-ordered, so the highest ids are the most recent
+            cursor = await self._conn.execute(
+                """
+                DELETE FROM checkpoints WHERE rowid IN (
+                    SELECT rowid FROM (
+                        SELECT rowid, ROW_NUMBER() OVER (PARTITION BY thread_id, checkpoint_ns ORDER BY checkpoint_id DESC) AS position
+                        FROM checkpoints
+                    ) WHERE position > ?
+                )
+                """,
+                (self.retention.keep_last,),
+            )
+            result.checkpoints_deleted = cursor.rowcount
+            await self._conn.execute(
+                """
+                DELETE FROM writes WHERE NOT EXISTS (
+                    SELECT 1 FROM checkpoints c
+                    WHERE c.thread_id = writes.thread_id AND c.checkpoint_ns = writes.checkpoint_ns AND c.checkpoint_id = writes.checkpoint_id
+                )
+                """
+            )
+            await self._conn.commit()
+        result.revisions_deleted = await asyncio.to_thread(revisions.prune, self.retention.keep_last)
+        return result
+
+    async def close(self) -> None:
+        await super().close()
+        if self._sync_conn is not None:
+            self._sync_conn.close()
+            self._sync_conn = None
+            self._sync = None
+        if self._revisions is not None:
+            self._revisions.close()
+            self._revisions = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+            self._saver = None
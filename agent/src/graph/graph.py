@@ -1,69 +1,115 @@
-import logging
-
-from dotenv import load_dotenv
-from langgraph.checkpoint.memory import MemorySaver
-from langgraph.graph import END, StateGraph
-
-from src.nodes.chat_node import chat_with_user
-from src.nodes.feedback_node import feedback_node
-from src.nodes.generate_blog_node import generate_blog
-from src.nodes.router_node import goto_route, router
-from src.nodes.web_search_node import search_web
-from src.schema.nodes import CHAT, FEEDBACK, GENERATE_BLOG, ROUTER, WEB_SEARCH
-from src.state.state import AgentState
-
-_ = load_dotenv()
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-)
-
-logger = logging.getLogger(__name__)
-
-# Disable noisy HTTP request logs
-for log_name in ["httpx", "httpcore"]:
-    log = logging.getLogger(log_name)
-    log.setLevel(logging.WARNING)
-
-
-
-graph = StateGraph(AgentState)
-
-# Add nodes
-graph.add_node(ROUTER, router)
-graph.add_node(GENERATE_BLOG, generate_blog)
-graph.add_node(CHAT, chat_with_user)
-graph.add_node(WEB_SEARCH, search_web)
-graph.add_node(FEEDBACK, feedback_node)
-# Set entry point
-graph.set_entry_point(ROUTER)
-
-# Add conditional edges
-graph.add_conditional_edges(
-    ROUTER,
-    goto_route,
-    {
-        GENERATE_BLOG: GENERATE_BLOG,
-        WEB_SEARCH: WEB_SEARCH,
-        CHAT: CHAT,
-        FEEDBACK: FEEDBACK,
-        END: END,
-    },
-)
-
-graph.add_edge(WEB_SEARCH, GENERATE_BLOG)
-graph.add_edge(GENERATE_BLOG, END)
-graph.add_edge(CHAT, END)
-graph.add_edge(FEEDBACK, END)
-memory = MemorySaver()
-logger.info("State graph built successfully")
-graph = graph.compile(checkpointer=memory)
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional
 
-def get_blog_post_generator_graph():
+from src.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from src.checkpoint import CheckpointStore
+
+logger = get_logger(__name__)
+
+_lock = threading.Lock()
+_checkpointer: Optional["CheckpointStore"] = None
+_graph: Optional[Any] = None
+
+
+def build_graph() -> Any:
     """
-    Returns the compiled blog post generator graph.
+    Build the uncompiled blog post generator StateGraph.
+
+    LangGraph, the nodes and, through them, the LLM clients are imported
+    here rather than at module import, so importing this module stays cheap.
     """
+    from langgraph.graph import END, StateGraph
+
+    from src.nodes.chat_node import chat_with_user
+    from src.nodes.feedback_node import feedback_node
+    from src.nodes.generate_blog_node import generate_blog
+    from src.nodes.router_node import goto_route, router
+    from src.nodes.web_search_node import search_web
+    from src.schema.nodes import CHAT, FEEDBACK, GENERATE_BLOG, ROUTER, WEB_SEARCH
+    from src.state.state import AgentState
+    from src.utils.metrics import instrument_node
+
+    graph = StateGraph(AgentState)
+
+    # Add nodes, each wrapped to record latency and in-flight metrics
+    graph.add_node(ROUTER, instrument_node(ROUTER, router))
+    graph.add_node(GENERATE_BLOG, instrument_node(GENERATE_BLOG, generate_blog))
+    graph.add_node(CHAT, instrument_node(CHAT, chat_with_user))
+    graph.add_node(WEB_SEARCH, instrument_node(WEB_SEARCH, search_web))
+    graph.add_node(FEEDBACK, instrument_node(FEEDBACK, feedback_node))
+    # Set entry point
+    graph.set_entry_point(ROUTER)
+
+    # Add conditional edges
+    graph.add_conditional_edges(
+        ROUTER,
+        goto_route,
+        {
+            GENERATE_BLOG: GENERATE_BLOG,
+            WEB_SEARCH: WEB_SEARCH,
+            CHAT: CHAT,
+            FEEDBACK: FEEDBACK,
+            END: END,
+        },
+    )
+
+    graph.add_edge(WEB_SEARCH, GENERATE_BLOG)
+    graph.add_edge(GENERATE_BLOG, END)
+    graph.add_edge(CHAT, END)
+    graph.add_edge(FEEDBACK, END)
     return graph
 
+
+def get_checkpointer() -> "CheckpointStore":
+    """
+    Returns the process-wide checkpoint store, creating it on first use.
+    """
+    from src.checkpoint import create_checkpointer
+
+    global _checkpointer
+    with _lock:
+        if _checkpointer is None:
+            _checkpointer = create_checkpointer()
+        return _checkpointer
+
+
+async def close_checkpointer() -> None:
+    """Close the checkpoint store if this process created one."""
+    if _checkpointer is not None:
+        await _checkpointer.close()
+
+
+def get_blog_post_generator_graph():
+    """
+    Returns the compiled blog post generator graph, building and compiling it on first use.
+
+    Safe to call from several threads: the graph is compiled once.
+    """
+    global _graph
+    if _graph is not None:
+        return _graph
+    checkpointer = get_checkpointer()
+    with _lock:
+        if _graph is None:
+            start = time.perf_counter()
+            _graph = build_graph().compile(checkpointer=checkpointer)
+            logger.info(f"State graph built and compiled in {time.perf_counter() - start:.2f}s")
+        return _graph
+
+
+def is_graph_compiled() -> bool:
+    """Whether the graph has been compiled in this process."""
+    return _graph is not None
+
+
+def __getattr__(name: str):
+    # `from src.graph.graph import graph, checkpointer` and the LangGraph CLI
+    # (langgraph.json) still work, compiling the graph when first accessed
+    if name == "graph":
+        return get_blog_post_generator_graph()
+    if name == "checkpointer":
+        return get_checkpointer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,212 @@
+import re
+from typing import Callable, Dict, List, Optional
+
+from src.prompts import BLOG_EDITS_PROMPT
+from src.schema.nodes import FEEDBACK
+from src.schema.schema import BlogEdit, BlogEdits, BlogPost
+from src.state.history import log_prompt_tokens, select_history
+from src.state.state import AgentState
+from src.utils.logger import get_logger
+from src.utils.metrics import FEEDBACK_EDITS
+from src.utils.models import get_structured_model
+
+logger = get_logger(__name__)
+
+SECTION_HEADING = re.compile(r"^##\s+\S")
+FENCE = re.compile(r"^\s*(```|~~~)")
+
+
+class EditError(ValueError):
+    """Raised when the model's edits do not apply cleanly to the post."""
+
+
+def split_sections(content: str) -> List[str]:
+    """
+    Split markdown at its H2 headings, ignoring headings inside code fences.
+
+    Section 0 is everything before the first H2 heading (the title and
+    introduction, possibly empty); every other section starts with its
+    heading. Joining the sections with "" gives back the content.
+    """
+    sections = [""]
+    fenced = False
+    for line in content.splitlines(keepends=True):
+        if FENCE.match(line):
+            fenced = not fenced
+        elif not fenced and SECTION_HEADING.match(line):
+            sections.append("")
+        sections[-1] += line
+    return sections
+
+
+def render_sections(sections: List[str]) -> str:
+    """The post with each section wrapped in a numbered tag for the model to address."""
+    return "\n".join(f'<section n="{number}">\n{section.strip()}\n</section>' for number, section in enumerate(sections))
+
+
+def _block(content: str) -> str:
+    return content.strip("\n") + "\n\n"
+
+
+def _section_number(edit: BlogEdit, sections: List[str], minimum: int = 0) -> int:
+    if edit.section is None or not minimum <= edit.section < len(sections):
+        raise EditError(f"{edit.operation} needs a section between {minimum} and {len(sections) - 1}, got {edit.section}")
+    return edit.section
+
+
+def _required_content(edit: BlogEdit, message: str) -> str:
+    if not edit.content or not edit.content.strip():
+        raise EditError(message)
+    return edit.content
+
+
+def _starting_with_heading(content: Optional[str], message: str) -> str:
+    if not content or not SECTION_HEADING.match(content.lstrip()):
+        raise EditError(message)
+    return content.lstrip()
+
+
+class _EditPlan:
+    """The edits collected against the post's original sections, applied together by render()."""
+
+    def __init__(self, blog_post: BlogPost):
+        self.blog_post = blog_post
+        self.sections = split_sections(blog_post.content)
+        self.texts = list(self.sections)
+        self.replaced: Dict[int, str] = {}
+        self.inserted: Dict[int, List[str]] = {}
+        self.title = blog_post.title
+
+    def replace(self, number: int, text: str) -> None:
+        if number in self.replaced:
+            raise EditError(f"Section {number} is replaced or deleted more than once")
+        self.replaced[number] = text
+
+    def render(self) -> BlogPost:
+        texts = list(self.texts)
+        for number, text in self.replaced.items():
+            if texts[number] != self.sections[number]:
+                raise EditError(f"Section {number} is both replaced and edited")
+            texts[number] = text
+
+        old_title = self.blog_post.title
+        if old_title is not None and self.title != old_title:
+            # keep the post's H1 in step with its title
+            texts[0] = re.sub(rf"^#\s+{re.escape(old_title)}[ \t]*$", lambda _: f"# {self.title}", texts[0], count=1, flags=re.MULTILINE)
+
+        blocks = []
+        for number, text in enumerate(texts):
+            blocks += [_block(block) for block in [text, *self.inserted.get(number, [])] if block.strip()]
+        content = "".join(blocks).rstrip("\n") + "\n"
+        if content.strip() == self.blog_post.content.strip() and self.title == old_title:
+            raise EditError("Edits left the post unchanged")
+        return BlogPost(title=self.title, content=content)
+
+
+def _set_title(plan: _EditPlan, edit: BlogEdit) -> None:
+    plan.title = _required_content(edit, "set_title needs the new title").strip()
+
+
+def _replace_text(plan: _EditPlan, edit: BlogEdit) -> None:
+    number = _section_number(edit, plan.sections)
+    if not edit.find:
+        raise EditError(f"replace_text in section {number} needs the text to find")
+    count = plan.texts[number].count(edit.find)
+    if count != 1:
+        raise EditError(f"replace_text found {count} occurrences of {edit.find!r} in section {number}")
+    plan.texts[number] = plan.texts[number].replace(edit.find, edit.content or "")
+
+
+def _insert_after_section(plan: _EditPlan, edit: BlogEdit) -> None:
+    number = _section_number(edit, plan.sections)
+    content = _starting_with_heading(edit.content, f"Section inserted after section {number} must start with an H2 heading")
+    plan.inserted.setdefault(number, []).append(content)
+
+
+def _replace_section(plan: _EditPlan, edit: BlogEdit) -> None:
+    number = _section_number(edit, plan.sections)
+    content = _required_content(edit, f"replace_section {number} needs the new content").lstrip()
+    # the introduction is the only section without a heading
+    if number > 0:
+        _starting_with_heading(content, f"Replacement for section {number} must start with its H2 heading")
+    plan.replace(number, content)
+
+
+def _delete_section(plan: _EditPlan, edit: BlogEdit) -> None:
+    plan.replace(_section_number(edit, plan.sections, minimum=1), "")
+
+
+EDIT_HANDLERS: Dict[str, Callable[[_EditPlan, BlogEdit], None]] = {
+    "set_title": _set_title,
+    "replace_text": _replace_text,
+    "insert_after_section": _insert_after_section,
+    "replace_section": _replace_section,
+    "delete_section": _delete_section,
+}
+
+
+def apply_edits(blog_post: BlogPost, edits: List[BlogEdit]) -> BlogPost:
+    """
+    Apply section and span edits to a blog post.
+
+    Section numbers refer to the post as it was shown to the model, whatever
+    the order of the edits. Each section may be replaced or deleted once and
+    text replacements must match exactly once within their section, so an
+    edit that cannot be placed unambiguously fails the whole batch instead of
+    applying part of it.
+
+    Args:
+        blog_post (BlogPost): The current post
+        edits (List[BlogEdit]): The edits returned by the model
+
+    Returns:
+        BlogPost: The edited post
+
+    Raises:
+        EditError: If there are no edits or any edit does not apply
+    """
+    if not edits:
+        raise EditError("No edits returned")
+    plan = _EditPlan(blog_post)
+    for edit in edits:
+        handler = EDIT_HANDLERS.get(edit.operation)
+        if handler is None:
+            raise EditError(f"Unknown edit operation {edit.operation!r}")
+        handler(plan, edit)
+    return plan.render()
+
+
+async def edit_blog_post(state: AgentState) -> Optional[BlogPost]:
+    """
+    Ask the model for targeted edits to the current post and apply them locally.
+
+    The model sees the post split into numbered sections and returns only the
+    edits, so the output tokens, and with them the latency, scale with the
+    size of the change rather than the size of the post.
+
+    Args:
+        state (AgentState): The current state with the blog post and the feedback
+
+    Returns:
+        Optional[BlogPost]: The edited post, or None if the model asked for a full rewrite
+
+    Raises:
+        EditError: If the edits do not apply
+    """
+    sections = split_sections(state.blog_post.content)
+    messages = [
+        *BLOG_EDITS_PROMPT.messages(title=state.blog_post.title, sections=render_sections(sections)),
+        *select_history(state, FEEDBACK),
+    ]
+    log_prompt_tokens(FEEDBACK, messages)
+
+    response: BlogEdits = await get_structured_model(FEEDBACK, BlogEdits).ainvoke(messages)
+    if response.rewrite:
+        logger.info("Feedback asks for a rewrite, regenerating the blog post")
+        FEEDBACK_EDITS.labels(outcome="rewrite").inc()
+        return None
+
+    blog_post = apply_edits(state.blog_post, response.edits)
+    FEEDBACK_EDITS.labels(outcome="patched").inc()
+    logger.info(f"Applied {len(response.edits)} edits to the blog post: {', '.join(edit.operation for edit in response.edits)}")
+    return blog_post
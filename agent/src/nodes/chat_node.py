@@ -1,9 +1,12 @@
 import logging
 
-from langchain_core.messages import AIMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from langchain_core.messages import AIMessage
 
+from src.prompts import CHAT_PROMPT
+from src.schema.nodes import CHAT
+from src.state.history import log_prompt_tokens, select_history
 from src.state.state import AgentState
+from src.utils.models import get_model
 
 logger = logging.getLogger(__name__)
 
@@ -11,14 +14,9 @@ logger = logging.getLogger(__name__)
 async def chat_with_user(state: AgentState) -> AgentState:
     """Node for general chat interactions."""
     logger.info("Starting chat with user")
-    system_message = SystemMessage(
-        content="""
-        You are a helpful assistant that can discuss blog writing
-        and help users with their blog-related questions.
-        """
-    )
-
-    model = ChatOpenAI(model="gpt-4o")
-    response = await model.ainvoke([system_message, *state.messages[-5:]])
+    model = get_model(CHAT)
+    messages = [*CHAT_PROMPT.messages(), *select_history(state, CHAT)]
+    log_prompt_tokens(CHAT, messages)
+    response = await model.ainvoke(messages)
 
     return {"messages": [AIMessage(content=response.content)]}
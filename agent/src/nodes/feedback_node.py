@@ -1,42 +1,55 @@
-from langchain_core.messages import SystemMessage
-from langchain_openai import ChatOpenAI
+import os
+
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END
 
+from src.nodes.blog_edits import edit_blog_post
+from src.prompts import FEEDBACK_PROMPT
+from src.schema.nodes import FEEDBACK
 from src.schema.schema import BlogPost
+from src.state.history import log_prompt_tokens, select_history
 from src.state.state import AgentState
 from src.utils.logger import get_logger
+from src.utils.metrics import FEEDBACK_EDITS
+from src.utils.models import get_structured_model
+from src.utils.streaming import stream_blog_post
 
 logger = get_logger(__name__)
 
+# "patch" asks the model for targeted edits and applies them locally, "full" regenerates the whole post
+FEEDBACK_EDIT_MODE = os.getenv("FEEDBACK_EDIT_MODE", "patch").lower()
+
+
+async def feedback_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    """Node for updating the blog post based on feedback, by patching it where possible."""
+    logger.info("Starting blog post feedback process")
+    if FEEDBACK_EDIT_MODE == "patch" and state.blog_post and state.blog_post.content:
+        try:
+            blog_post = await edit_blog_post(state)
+            if blog_post is not None:
+                return {"route": END, "blog_post": blog_post}
+        except Exception as e:
+            FEEDBACK_EDITS.labels(outcome="failed").inc()
+            logger.warning(f"Blog post edits failed, regenerating the whole post: {str(e)}")
+    return {"route": END, "blog_post": await rewrite_blog_post(state, config)}
+
 
-async def feedback_node(state: AgentState) -> AgentState:
-    """Node for updating the blog post based on feedback."""
-    logger.info("Starting blog post generation process")
+async def rewrite_blog_post(state: AgentState, config: RunnableConfig) -> BlogPost:
+    """Regenerate the whole blog post with the feedback applied, streamed to the UI."""
     try:
         messages = [
-            SystemMessage(
-                content=f"""
-                You are a helpful assistant that updates the blog post based on the feedback.
-
-                The blog post is:
-                <BlogPost>
-                {state.blog_post}
-                </BlogPost>
-
-                Pay attention to the user messages below for the feedback and update the blog post accordingly.
-                Make sure to keep the original content of the blog post, just update the parts that are mentioned in the feedback.
-                """
-            ),
-            *state.messages[-5:],
+            *FEEDBACK_PROMPT.messages(blog_post=state.blog_post),
+            *select_history(state, FEEDBACK),
         ]
+        log_prompt_tokens(FEEDBACK, messages)
 
-        model = ChatOpenAI(model="gpt-4o")
+        model = get_structured_model(FEEDBACK, BlogPost)
 
-        response: BlogPost = await model.with_structured_output(BlogPost).ainvoke(messages)
+        response: BlogPost = await stream_blog_post(model, messages, state, config)
 
         logger.info("Blog post updated successfully")
 
-        return {"route": END, "blog_post": response}
+        return response
 
     except Exception as e:
         logger.error(f"Error in blog post generation: {str(e)}", exc_info=True)
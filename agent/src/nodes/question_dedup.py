@@ -0,0 +1,139 @@
+import asyncio
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from src.cache.search_index import get_search_index
+from src.schema.schema import SearchResult
+from src.utils.embeddings import Embedder, get_embedder
+from src.utils.logger import get_logger
+from src.utils.metrics import QUESTION_DEDUP
+
+logger = get_logger(__name__)
+
+
+def _optional_float(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+# Constants for question deduplication. Unset thresholds use the embedder's own default.
+QUESTION_DEDUP_THRESHOLD = _optional_float("QUESTION_DEDUP_THRESHOLD")
+# Reusing an answer from an earlier run is riskier than merging within a run, so it needs a closer match
+ANSWER_REUSE_THRESHOLD = _optional_float("ANSWER_REUSE_THRESHOLD")
+ANSWER_REUSE_MARGIN = 0.05
+
+
+class QuestionCluster(BaseModel):
+    question: str = Field(description="The representative question, the only one searched")
+    neighbors: List[str] = Field(default_factory=list, description="Near-duplicate questions answered by the representative")
+    answer: Optional[SearchResult] = Field(default=None, description="An earlier answer close enough to reuse instead of searching")
+
+
+def cluster_questions(vectors: np.ndarray, threshold: float) -> List[List[int]]:
+    """
+    Greedy threshold clustering of unit-length vectors.
+
+    Rows are visited in order; each row not yet clustered starts a cluster
+    with every later unclustered row at least ``threshold`` similar to it.
+    The first question of a cluster is its representative, so the model's
+    own ordering decides which wording is searched.
+
+    Args:
+        vectors (np.ndarray): One unit-length row per question
+        threshold (float): Minimum cosine similarity to join a cluster
+
+    Returns:
+        List[List[int]]: Row indices per cluster, representative first
+    """
+    similarity = vectors @ vectors.T
+    unclustered = np.ones(len(vectors), dtype=bool)
+    clusters: List[List[int]] = []
+    for row in range(len(vectors)):
+        if not unclustered[row]:
+            continue
+        unclustered[row] = False
+        members = np.flatnonzero(unclustered & (similarity[row] >= threshold))
+        unclustered[members] = False
+        clusters.append([row, *members.tolist()])
+    return clusters
+
+
+def _thresholds(embedder: Embedder) -> Tuple[float, float]:
+    dedup = QUESTION_DEDUP_THRESHOLD if QUESTION_DEDUP_THRESHOLD is not None else embedder.similarity_threshold
+    reuse = ANSWER_REUSE_THRESHOLD if ANSWER_REUSE_THRESHOLD is not None else min(dedup + ANSWER_REUSE_MARGIN, 1.0)
+    return dedup, reuse
+
+
+async def dedupe_questions(questions: List[str]) -> Tuple[List[QuestionCluster], Optional[np.ndarray]]:
+    """
+    Group near-duplicate questions and find earlier answers that can be reused.
+
+    Questions are embedded in one batch and clustered by similarity; only each
+    cluster's representative needs a search. Representatives close enough to
+    a fresh answer in the search index reuse it and need no search at all. If
+    embedding is disabled or fails, every question is its own cluster.
+
+    Args:
+        questions (List[str]): The generated search questions
+
+    Returns:
+        Tuple[List[QuestionCluster], Optional[np.ndarray]]: The clusters in question order, and the
+            representatives' embeddings to pass to remember_answers, or None without embeddings
+    """
+    singletons = [QuestionCluster(question=question) for question in questions]
+    embedder = get_embedder()
+    if embedder is None or len(questions) == 0:
+        return singletons, None
+    try:
+        vectors = await embedder.embed(questions)
+    except Exception as e:
+        logger.warning(f"Question embedding failed, searching every question: {str(e)}")
+        return singletons, None
+
+    dedup_threshold, reuse_threshold = _thresholds(embedder)
+    groups = cluster_questions(vectors, dedup_threshold)
+    representatives = vectors[[group[0] for group in groups]]
+    try:
+        # the index scan is a large matrix product, kept off the event loop
+        matches = await asyncio.to_thread(get_search_index().lookup, representatives, reuse_threshold, embedder.name)
+    except Exception as e:
+        logger.warning(f"Search index lookup failed, searching every cluster: {str(e)}")
+        matches = [None] * len(groups)
+    answers = [match.result if match is not None else None for match in matches]
+    clusters = [
+        QuestionCluster(question=questions[group[0]], neighbors=[questions[i] for i in group[1:]], answer=answer) for group, answer in zip(groups, answers)
+    ]
+
+    merged = len(questions) - len(clusters)
+    reused = sum(cluster.answer is not None for cluster in clusters)
+    QUESTION_DEDUP.labels(outcome="merged").inc(merged)
+    QUESTION_DEDUP.labels(outcome="reused").inc(reused)
+    QUESTION_DEDUP.labels(outcome="searched").inc(len(clusters) - reused)
+    for cluster in clusters:
+        if cluster.neighbors:
+            logger.info(f"Merged {cluster.neighbors} into search question {cluster.question!r}")
+        if cluster.answer is not None:
+            logger.info(f"Reusing the earlier answer to {cluster.answer.question!r} for {cluster.question!r}")
+    logger.info(f"Deduplicated {len(questions)} questions into {len(clusters)} clusters with the {embedder.name} embedder: {len(clusters) - reused} to search, {reused} answered from the index")
+    return clusters, representatives
+
+
+async def remember_answers(vectors: Optional[np.ndarray], answers: List[Optional[SearchResult]]) -> None:
+    """
+    Add new answers to the search index for reuse by later runs.
+
+    Args:
+        vectors (Optional[np.ndarray]): The representatives' embeddings from dedupe_questions
+        answers (List[Optional[SearchResult]]): The answer per representative, None where it failed or was reused
+    """
+    embedder = get_embedder()
+    rows = [i for i, answer in enumerate(answers) if answer is not None]
+    if vectors is None or embedder is None or not rows:
+        return
+    try:
+        await asyncio.to_thread(get_search_index().add, vectors[rows], [answers[i] for i in rows], embedder.name)
+    except Exception as e:
+        logger.warning(f"Could not add answers to the search index: {str(e)}")
@@ -1,44 +1,60 @@
-from typing import Any
-
-from langchain_core.messages import SystemMessage
-from langchain_openai import ChatOpenAI
+import asyncio
+import logging
+import os
+import time
+from typing import Any, List, Optional
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END
 
-from src.schema.nodes import CHAT, FEEDBACK, GENERATE_BLOG, WEB_SEARCH
+from src.nodes.router_rules import ROUTER_RULE_CONFIDENCE, classify_intent
+from src.nodes.speculation import resolve_speculation, start_speculation
+from src.prompts import ROUTER_PROMPT
+from src.schema.nodes import CHAT, FEEDBACK, GENERATE_BLOG, ROUTER, WEB_SEARCH
 from src.schema.schema import AssessIntent
+from src.state.digest import format_blog_post_digest, format_search_results_digest
+from src.state.history import log_prompt_tokens, select_history, update_history_summary
 from src.state.state import AgentState
 from src.utils.logger import get_logger
+from src.utils.models import get_structured_model
+from src.utils.tokens import count_tokens
 
 logger = get_logger(__name__)
 
+# Whether confident rule-based decisions may skip the LLM router
+ROUTER_FAST_PATH = os.getenv("ROUTER_FAST_PATH", "true").lower() == "true"
+
+ROUTE_DESCRIPTIONS = {
+    GENERATE_BLOG: "blog post generation",
+    FEEDBACK: "feedback",
+    WEB_SEARCH: "web search",
+    CHAT: "chat",
+}
+
+
+def log_prompt_size(state: AgentState, messages: List[BaseMessage]) -> None:
+    """Log the router prompt size, and at debug level what it would be with the full state inlined."""
+    log_prompt_tokens(ROUTER, messages)
+    if logger.isEnabledFor(logging.DEBUG):
+        full_state_tokens = count_tokens(f"{state.blog_post}\n{state.search_results}")
+        digest_tokens = count_tokens(f"{format_blog_post_digest(state.blog_post)}\n{format_search_results_digest(state.search_results)}")
+        logger.debug(f"Router state digest tokens: {digest_tokens} (full state would be {full_state_tokens})")
+
 
 async def router_assessment(state: AgentState) -> AssessIntent:
     """Assess the user's intent and determine the next action."""
     logger.info("Starting router assessment")
     try:
-        system_message = SystemMessage(
-            content=f"""
-            You are a blog post writing assistant that helps users create high-quality blog posts.
-            Your goal is to determine the appropriate next action based on the user's request.
-
-            Current blog post state:
-            {state.blog_post if state.blog_post else "No blog post generated yet"}
+        messages = [
+            *ROUTER_PROMPT.messages(blog_post=format_blog_post_digest(state.blog_post), search_results=format_search_results_digest(state.search_results)),
+            *select_history(state, ROUTER),
+        ]
+        log_prompt_size(state, messages)
 
-            Current search results state:
-            {state.search_results if state.search_results else "No search results yet"}
+        model = get_structured_model(ROUTER, AssessIntent)
 
-            Analyze the conversation and determine:
-            1. If we need to search for information (only if no search results exist)
-            2. If we need to generate/modify a blog post (only if search results exist)
-            3. If we should just chat with the user
-            4. If we need to update the blog post based on the user's feedback. If the user is providing feedback on the existing blog post, we need to update the blog post based on the feedback and not generate a new blog post.
-            Provide your assessment following the AssessIntent schema.
-            """
-        )
-
-        model = ChatOpenAI(model="gpt-4o")
-
-        assessment = await model.with_structured_output(AssessIntent).ainvoke([system_message, *state.messages[-5:]])
+        assessment = await model.ainvoke(messages)
 
         logger.info(f"Router assessment complete: {assessment.dict()}")
         return assessment
@@ -56,25 +72,59 @@ def goto_route(state: AgentState) -> Any:
     return state.route
 
 
-async def router(state: AgentState) -> AgentState:
-    """Main router function that determines the next action."""
+def assessment_to_route(assessment: AssessIntent) -> str:
+    """Map the LLM's AssessIntent to a route."""
+    if assessment.generate_blog_post.boolean_value:
+        return GENERATE_BLOG
+    elif assessment.feedback.boolean_value:
+        return FEEDBACK
+    elif assessment.search_web.boolean_value:
+        return WEB_SEARCH
+    return CHAT
+
+
+async def router(state: AgentState, config: RunnableConfig) -> AgentState:
+    """
+    Main router function that determines the next action.
+
+    While the LLM assesses a turn without search results, question generation
+    and the first searches start speculatively; they are kept for search_web
+    if the route is web search and cancelled otherwise.
+    """
     logger.info("Starting main router function")
+    summary_task: Optional[asyncio.Task] = None
     try:
-        assessment = await router_assessment(state)
-
-        if assessment.generate_blog_post.boolean_value:
-            logger.info("Routing to blog post generation")
-            return {"route": GENERATE_BLOG}
-        elif assessment.feedback.boolean_value:
-            logger.info("Routing to feedback")
-            return {"route": FEEDBACK}
-        elif assessment.search_web.boolean_value:
-            logger.info("Routing to web search")
-            return {"route": WEB_SEARCH}
+        start = time.perf_counter()
+        # fold old messages into the history summary while the route is decided
+        summary_task = asyncio.create_task(update_history_summary(state))
+        decision = classify_intent(state) if ROUTER_FAST_PATH else None
+
+        if decision is not None and decision.confidence >= ROUTER_RULE_CONFIDENCE:
+            route, source = decision.route, f"rules ({decision.reason})"
         else:
-            logger.info("Routing to chat")
-            return {"route": CHAT}
+            start_speculation(state, config)
+            try:
+                assessment = await router_assessment(state)
+            except BaseException:
+                resolve_speculation(config, END)
+                raise
+            route, source = assessment_to_route(assessment), "llm"
+            resolve_speculation(config, route)
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Routing to {ROUTE_DESCRIPTIONS[route]} (source: {source}, latency: {latency_ms:.1f}ms)")
+
+        update: AgentState = {"route": route}
+        try:
+            update.update(await summary_task or {})
+        except Exception as e:
+            logger.error(f"Error updating history summary: {str(e)}", exc_info=True)
+        return update
 
     except Exception as e:
         logger.error(f"Error in main router: {str(e)}", exc_info=True)
         raise
+    finally:
+        # a failed or cancelled routing decision leaves the summary task running
+        if summary_task is not None and not summary_task.done():
+            summary_task.cancel()
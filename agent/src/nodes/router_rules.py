@@ -0,0 +1,79 @@
+import os
+import re
+from typing import Optional
+
+from langchain_core.messages import HumanMessage
+from pydantic import BaseModel, Field
+
+from src.schema.nodes import CHAT, FEEDBACK, WEB_SEARCH
+from src.state.state import AgentState
+
+# Minimum confidence for a rule decision to skip the LLM router
+ROUTER_RULE_CONFIDENCE = float(os.getenv("ROUTER_RULE_CONFIDENCE", "0.9"))
+
+CREATE_PATTERN = re.compile(r"\b(write|generate|create|draft|make|compose|produce)\b.*\b(blog|post|article)\b")
+TOPIC_PATTERN = re.compile(r"\b(about|on|regarding|covering)\b\s+\S+")
+EDIT_PATTERN = re.compile(
+    r"\b(change|fix|update|edit|rewrite|rephrase|shorten|lengthen|expand|remove|delete|replace|"
+    r"tweak|improve|typo|tone|make it|make the|add a|add an|add more|more concise|less formal|more formal)\b"
+)
+SMALL_TALK_PATTERN = re.compile(r"^(hi|hello|hey|thanks|thank you|thx|ok|okay|cool|great|nice|bye|good (morning|afternoon|evening))[\s!.]*$")
+# Questions that ask for information or advice, as opposed to requests phrased as questions ("can you write ...?")
+QUESTION_PATTERN = re.compile(r"^(what|how|why|when|where|which|who|is|are|does|do|should)\b.*\?$")
+NEGATION_PATTERN = re.compile(r"\b(do not|don'?t|don’t|not yet|no need to|never|stop|rather not|instead of)\b")
+
+
+class RouteDecision(BaseModel):
+    route: str = Field(description="The node to route to")
+    confidence: float = Field(description="How sure the rule is, between 0 and 1")
+    reason: str = Field(description="The rule that produced the decision")
+
+
+def last_user_message(state: AgentState) -> Optional[str]:
+    """Return the text of the most recent human message, if any."""
+    for message in reversed(state.messages):
+        if isinstance(message, HumanMessage) and isinstance(message.content, str):
+            return message.content
+    return None
+
+
+def classify_intent(state: AgentState) -> Optional[RouteDecision]:
+    """
+    Cheap deterministic intent classification from state and the last user message.
+
+    Returns a decision only for cases the rules are confident about, and None
+    when the LLM router should decide.
+    """
+    text = last_user_message(state)
+    if not text:
+        return None
+    text = " ".join(text.lower().split())
+
+    has_blog_post = bool(state.blog_post and state.blog_post.content)
+    has_search_results = bool(state.search_results and state.search_results.search_results)
+
+    if SMALL_TALK_PATTERN.match(text):
+        return RouteDecision(route=CHAT, confidence=0.95, reason="small talk")
+
+    # "don't write a post yet" mentions a blog post without asking for one
+    if NEGATION_PATTERN.search(text):
+        return None
+
+    # "how do I write a good blog post?" asks about writing rather than for a post
+    if QUESTION_PATTERN.match(text):
+        if has_blog_post:
+            # may be about the post or a request to change it; leave it to the LLM
+            return None
+        return RouteDecision(route=CHAT, confidence=0.9, reason="general question")
+
+    wants_new_post = bool(CREATE_PATTERN.search(text))
+    if wants_new_post and not has_search_results and not has_blog_post:
+        confidence = 0.97 if TOPIC_PATTERN.search(text) else 0.9
+        return RouteDecision(route=WEB_SEARCH, confidence=confidence, reason="new blog request without search results")
+
+    if has_blog_post and not wants_new_post and EDIT_PATTERN.search(text):
+        # "can you explain how to improve SEO?" names an edit without asking for one
+        confidence = 0.8 if text.endswith("?") else 0.9
+        return RouteDecision(route=FEEDBACK, confidence=confidence, reason="edit request on existing blog post")
+
+    return None
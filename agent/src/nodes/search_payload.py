@@ -0,0 +1,206 @@
+import os
+import re
+from typing import Any, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from src.nodes.question_dedup import cluster_questions
+from src.utils.embeddings import HashingEmbedder
+from src.utils.logger import get_logger
+from src.utils.metrics import SEARCH_PAYLOAD_TOKENS
+from src.utils.models import DEFAULT_MODEL
+from src.utils.tokens import count_tokens
+
+logger = get_logger(__name__)
+
+# Constants for compacting search payloads before summarization
+SEARCH_MAX_HITS = int(os.getenv("SEARCH_MAX_HITS", "6"))
+SEARCH_MAX_SNIPPETS_PER_HIT = int(os.getenv("SEARCH_MAX_SNIPPETS_PER_HIT", "3"))
+SEARCH_SNIPPET_MAX_CHARS = int(os.getenv("SEARCH_SNIPPET_MAX_CHARS", "600"))
+# Hits and snippets sharing less than this with the question are dropped; the best hit is always kept
+SEARCH_MIN_RELEVANCE = float(os.getenv("SEARCH_MIN_RELEVANCE", "0.1"))
+# Snippets at least this similar to one already kept add nothing and are dropped
+SNIPPET_DUPLICATE_THRESHOLD = 0.9
+
+TRACKING_PARAMS = re.compile(r"^(utm_\w+|fbclid|gclid|ref|ref_src)$")
+
+_embedder = HashingEmbedder(dim=512)
+
+
+class SearchHit(BaseModel):
+    url: str = Field(description="The page URL")
+    title: str = Field(default="", description="The page title")
+    description: str = Field(default="", description="The page description")
+    snippets: List[str] = Field(default_factory=list, description="Passages of the page matching the query")
+    relevance: float = Field(default=0.0, description="Similarity of the hit to the question, set by rank_hits")
+
+
+def clean_url(url: str) -> str:
+    """The URL without its fragment and tracking parameters."""
+    parts = urlsplit(url.strip())
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if not TRACKING_PARAMS.match(key)])
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL for deduplication: cleaned, https, lowercase host without www and no trailing slash."""
+    parts = urlsplit(clean_url(url))
+    return urlunsplit(("https", re.sub(r"^www\.", "", parts.netloc.lower()), parts.path.rstrip("/"), parts.query, ""))
+
+
+def _text(value: Any) -> str:
+    return " ".join(str(value).split()) if value else ""
+
+
+def parse_hits(payload: Any) -> List[SearchHit]:
+    """
+    Parse a YDC search response into typed hits, dropping every field the summarizer does not use.
+
+    Accepts both the ``hits`` list of the search endpoint and the
+    ``results.web`` list of the newer API.
+    """
+    if not isinstance(payload, dict):
+        return []
+    raw_hits = payload.get("hits")
+    if raw_hits is None:
+        raw_hits = (payload.get("results") or {}).get("web") or []
+    hits = []
+    for raw in raw_hits:
+        if not isinstance(raw, dict) or not raw.get("url"):
+            continue
+        snippets = raw.get("snippets") or []
+        if isinstance(snippets, str):
+            snippets = [snippets]
+        hits.append(
+            SearchHit(url=clean_url(str(raw["url"])), title=_text(raw.get("title")), description=_text(raw.get("description")), snippets=[_text(s) for s in snippets if _text(s)])
+        )
+    return hits
+
+
+def dedupe_hits(hits: List[SearchHit]) -> List[SearchHit]:
+    """Merge hits for the same page and drop repeated snippets, keeping first occurrences."""
+    by_url = {}
+    for hit in hits:
+        key = normalize_url(hit.url)
+        if key in by_url:
+            by_url[key].snippets.extend(hit.snippets)
+            by_url[key].description = by_url[key].description or hit.description
+        else:
+            by_url[key] = hit.model_copy(deep=True)
+
+    seen = set()
+    for hit in by_url.values():
+        unique = []
+        for snippet in hit.snippets:
+            key = snippet.lower()
+            if key not in seen and key != hit.description.lower():
+                seen.add(key)
+                unique.append(snippet)
+        hit.snippets = unique
+    return list(by_url.values())
+
+
+def _truncate(text: str, limit: int) -> str:
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit(" ", 1)[0] + " …"
+
+
+def rank_hits(
+    question: str,
+    hits: List[SearchHit],
+    max_hits: int = SEARCH_MAX_HITS,
+    max_snippets: int = SEARCH_MAX_SNIPPETS_PER_HIT,
+    min_relevance: float = SEARCH_MIN_RELEVANCE,
+) -> List[SearchHit]:
+    """
+    Keep the hits and snippets most relevant to the question.
+
+    The question, each hit's title and description, and every snippet are
+    embedded in one batch with the local hashing embedder. Snippets nearly
+    identical to a better one (across all hits) are dropped, each hit keeps
+    its ``max_snippets`` most relevant snippets, and hits are ranked by the
+    mean of their heading and best snippet similarity. Snippets and hits
+    below ``min_relevance`` are dropped, except the best hit.
+
+    Args:
+        question (str): The search question
+        hits (List[SearchHit]): Deduplicated hits
+        max_hits (int): Hits to keep
+        max_snippets (int): Snippets to keep per hit
+        min_relevance (float): Similarity to the question below which snippets and hits are dropped
+
+    Returns:
+        List[SearchHit]: At most ``max_hits`` hits, most relevant first
+    """
+    if not hits:
+        return []
+    snippets: List[Tuple[int, str]] = [(i, snippet) for i, hit in enumerate(hits) for snippet in hit.snippets]
+    texts = [question] + [f"{hit.title} {hit.description}" for hit in hits] + [snippet for _, snippet in snippets]
+    vectors = _embedder.embed_sync(texts)
+    heading_scores = vectors[1 : len(hits) + 1] @ vectors[0]
+    snippet_vectors = vectors[len(hits) + 1 :]
+    snippet_scores = snippet_vectors @ vectors[0]
+
+    kept: List[List[Tuple[float, str]]] = [[] for _ in hits]
+    if snippets:
+        order = np.argsort(-snippet_scores)
+        for group in cluster_questions(snippet_vectors[order], SNIPPET_DUPLICATE_THRESHOLD):
+            best = order[group[0]]
+            if snippet_scores[best] < min_relevance:
+                continue
+            hit_index, snippet = snippets[best]
+            kept[hit_index].append((float(snippet_scores[best]), snippet))
+
+    ranked = []
+    for hit, heading_score, hit_snippets in zip(hits, heading_scores, kept):
+        hit_snippets = sorted(hit_snippets, reverse=True)[:max_snippets]
+        best_snippet = hit_snippets[0][0] if hit_snippets else 0.0
+        ranked.append(hit.model_copy(update={"snippets": [snippet for _, snippet in hit_snippets], "relevance": (float(heading_score) + best_snippet) / 2}))
+    ranked.sort(key=lambda hit: hit.relevance, reverse=True)
+    return [hit for i, hit in enumerate(ranked[:max_hits]) if i == 0 or hit.relevance >= min_relevance]
+
+
+def render_hits(hits: List[SearchHit], snippet_max_chars: int = SEARCH_SNIPPET_MAX_CHARS) -> str:
+    """Render hits as a numbered, citation-friendly text block."""
+    blocks = []
+    for number, hit in enumerate(hits, 1):
+        lines = [f"[{number}] {hit.title or hit.url} ({hit.url})"]
+        if hit.description:
+            lines.append(_truncate(hit.description, snippet_max_chars))
+        lines += [f"- {_truncate(snippet, snippet_max_chars)}" for snippet in hit.snippets]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def compact_search_payload(question: str, payload: Any, model: str = DEFAULT_MODEL) -> str:
+    """
+    Turn a raw search response into a compact source block for the summarizer.
+
+    Falls back to the raw payload when it has no recognizable hits, so an
+    unexpected response format degrades to the old behaviour instead of an
+    empty prompt.
+
+    Args:
+        question (str): The search question
+        payload (Any): The parsed JSON search response
+        model (str): The summarizing model, for token counting
+
+    Returns:
+        str: The rendered source block
+    """
+    hits = parse_hits(payload)
+    raw_tokens = count_tokens(str(payload), model)
+    if not hits:
+        logger.warning(f"No hits parsed from the search payload for {question!r}, sending it unchanged")
+        return str(payload)
+
+    ranked = rank_hits(question, dedupe_hits(hits))
+    block = render_hits(ranked)
+    compact_tokens = count_tokens(block, model)
+    SEARCH_PAYLOAD_TOKENS.labels(stage="raw").observe(raw_tokens)
+    SEARCH_PAYLOAD_TOKENS.labels(stage="compact").observe(compact_tokens)
+    logger.info(f"Compacted search payload for {question!r}: {len(hits)} -> {len(ranked)} hits, {raw_tokens} -> {compact_tokens} tokens")
+    return block
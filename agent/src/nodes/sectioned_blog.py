@@ -0,0 +1,188 @@
+import asyncio
+import os
+import re
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from src.prompts import BLOG_OUTLINE_PROMPT, BLOG_SECTION_PROMPT, BLOG_TRANSITIONS_PROMPT
+from src.schema.nodes import BLOG_OUTLINE, BLOG_SECTION, BLOG_TRANSITIONS
+from src.schema.schema import BlogOutline, BlogPost, SearchResult, SectionTransitions
+from src.state.history import log_prompt_tokens, select_history
+from src.state.state import AgentState
+from src.utils.logger import get_logger
+from src.utils.models import get_model, get_structured_model
+from src.utils.streaming import emit_blog_post
+
+logger = get_logger(__name__)
+
+# Constants for sectioned blog generation
+BLOG_SECTION_CONCURRENCY = int(os.getenv("BLOG_SECTION_CONCURRENCY", "4"))
+BLOG_TARGET_WORDS = int(os.getenv("BLOG_TARGET_WORDS", "1800"))
+BLOG_MIN_SECTION_WORDS = 150
+# One short call after the sections are written adds a bridging sentence between adjacent sections
+BLOG_HARMONIZE = os.getenv("BLOG_HARMONIZE", "true").lower() == "true"
+# Characters of each research note shown to the outline planner
+OUTLINE_NOTE_CHARS = 400
+# Posts longer than this get a table of contents, as the single-call prompt asks for
+TOC_MIN_WORDS = 1500
+# Characters of each section's end and the next one's start shown to the transition writer
+TRANSITION_CONTEXT_CHARS = 300
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*)$")
+
+
+def _notes(search_results: List[SearchResult], numbers: List[int], limit: Optional[int] = None) -> str:
+    notes = []
+    for number in numbers:
+        result = search_results[number - 1]
+        text = result.search_result or ""
+        if limit is not None and len(text) > limit:
+            text = text[:limit].rsplit(" ", 1)[0] + " …"
+        notes.append(f"[{number}] {result.question}\n{text}")
+    return "\n\n".join(notes)
+
+
+async def generate_outline(state: AgentState, search_results: List[SearchResult]) -> BlogOutline:
+    """Plan the post: title, sections with key points mapped to research notes, and SEO metadata."""
+    notes = _notes(search_results, list(range(1, len(search_results) + 1)), OUTLINE_NOTE_CHARS)
+    messages = [
+        *BLOG_OUTLINE_PROMPT.messages(year=datetime.now().year, notes=notes or "No research notes."),
+        *select_history(state, BLOG_OUTLINE),
+    ]
+    log_prompt_tokens(BLOG_OUTLINE, messages)
+    return await get_structured_model(BLOG_OUTLINE, BlogOutline).ainvoke(messages)
+
+
+async def generate_section(state: AgentState, outline: BlogOutline, index: int, search_results: List[SearchResult], words: int) -> str:
+    """Write one section of the outline as markdown, from the research notes mapped to it."""
+    section = outline.sections[index]
+    numbers = [number for number in dict.fromkeys(section.sources) if 1 <= number <= len(search_results)]
+    # sections without notes, like the introduction, see an excerpt of every note instead
+    notes = _notes(search_results, numbers) if numbers else _notes(search_results, list(range(1, len(search_results) + 1)), OUTLINE_NOTE_CHARS)
+    # the plan is the same for every section of the post, so it stays in the shared part of the prompt
+    plan = "\n".join(f"{i + 1}. {s.heading}" for i, s in enumerate(outline.sections))
+    key_points = "\n".join(f"- {point}" for point in section.key_points)
+    messages = [
+        *BLOG_SECTION_PROMPT.messages(
+            title=outline.title, year=datetime.now().year, plan=plan, number=index + 1, heading=section.heading, words=words, key_points=key_points, notes=notes or "No research notes."
+        ),
+        *select_history(state, BLOG_SECTION),
+    ]
+    response = await get_model(BLOG_SECTION).ainvoke(messages)
+    return response.content if isinstance(response.content, str) else str(response.content)
+
+
+def slugify(heading: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", heading.lower()).strip("-")
+
+
+def normalize_section(heading: str, markdown: str) -> str:
+    """Give a drafted section exactly one H2 heading and demote any other H1/H2 headings inside it to H3."""
+    lines = markdown.strip().splitlines()
+    if lines and HEADING_PATTERN.match(lines[0]):
+        lines = lines[1:]
+    body = []
+    for line in lines:
+        match = HEADING_PATTERN.match(line)
+        body.append(f"### {match.group(2)}" if match and len(match.group(1)) <= 2 else line)
+    return f"## {heading}\n\n" + "\n".join(body).strip()
+
+
+async def generate_transitions(outline: BlogOutline, drafts: List[str]) -> List[str]:
+    """
+    Write one bridging sentence per pair of adjacent sections, from the end of each and the start of the next.
+
+    Sections written in parallel never see each other, so without these the
+    post jumps from one section to the next. Returns no transitions if the
+    call fails or answers with the wrong number of them.
+    """
+    sections = [normalize_section(section.heading, draft).split("\n\n") for section, draft in zip(outline.sections, drafts)]
+    boundaries = "\n\n".join(
+        f"{i + 1}. From \"{outline.sections[i].heading}\" to \"{outline.sections[i + 1].heading}\"\n"
+        f"End of the first: {sections[i][-1][-TRANSITION_CONTEXT_CHARS:]}\n"
+        f"Start of the next: {(sections[i + 1][1] if len(sections[i + 1]) > 1 else '')[:TRANSITION_CONTEXT_CHARS]}"
+        for i in range(len(sections) - 1)
+    )
+    messages = BLOG_TRANSITIONS_PROMPT.messages(title=outline.title, boundaries=boundaries)
+    try:
+        response = await get_structured_model(BLOG_TRANSITIONS, SectionTransitions).ainvoke(messages)
+    except Exception as e:
+        logger.warning(f"Section transitions failed, stitching without them: {str(e)}")
+        return []
+    if len(response.transitions) != len(sections) - 1:
+        if response.transitions:
+            logger.warning(f"Got {len(response.transitions)} section transitions for {len(sections) - 1} boundaries, stitching without them")
+        return []
+    return response.transitions
+
+
+def stitch_sections(outline: BlogOutline, drafts: List[str], transitions: Optional[List[str]] = None) -> str:
+    """
+    Join drafted sections into one post in outline order.
+
+    Headings are normalized, each transition is appended to the section it
+    leads out of, a table of contents is added for long posts and the
+    outline's SEO metadata is appended, matching what the single-call prompt
+    asks the model to produce.
+    """
+    sections = [normalize_section(section.heading, draft) for section, draft in zip(outline.sections, drafts)]
+    for i, transition in enumerate((transitions or [])[: len(sections) - 1]):
+        sections[i] += f"\n\n{transition.strip()}"
+    parts = [f"# {outline.title}"]
+    if sum(len(section.split()) for section in sections) > TOC_MIN_WORDS:
+        parts.append("## Table of Contents\n\n" + "\n".join(f"- [{s.heading}](#{slugify(s.heading)})" for s in outline.sections))
+    parts += sections
+    parts.append(f"## Meta Description and SEO Keywords\n\n**Meta description:** {outline.meta_description}\n\n**Keywords:** {', '.join(outline.keywords)}")
+    return "\n\n".join(parts) + "\n"
+
+
+async def generate_sectioned_blog(state: AgentState, config: Optional[RunnableConfig] = None) -> BlogPost:
+    """
+    Generate a blog post as an outline followed by sections written in parallel.
+
+    One completion for a whole post spends most of its time generating output
+    tokens one after another. Here a short outline call plans the sections and
+    maps research notes to them, then up to BLOG_SECTION_CONCURRENCY sections
+    are written at once, each from only its own notes, and the drafts are
+    stitched together locally, with bridging sentences from one short call
+    between them. The post is emitted to the UI as each leading run of
+    sections completes.
+
+    Args:
+        state (AgentState): The current state with search results
+        config (Optional[RunnableConfig]): The node's config, for emitting progress to CopilotKit
+
+    Returns:
+        BlogPost: The stitched blog post
+
+    Raises:
+        ValueError: If the outline has fewer than two sections
+    """
+    start = time.perf_counter()
+    search_results = state.search_results.search_results or []
+    outline = await generate_outline(state, search_results)
+    if len(outline.sections) < 2:
+        raise ValueError(f"Outline has {len(outline.sections)} sections, need at least 2")
+    logger.info(f"Outlined {outline.title!r} with {len(outline.sections)} sections in {time.perf_counter() - start:.2f}s")
+
+    words = max(BLOG_TARGET_WORDS // len(outline.sections), BLOG_MIN_SECTION_WORDS)
+    semaphore = asyncio.Semaphore(BLOG_SECTION_CONCURRENCY)
+    drafts: List[Optional[str]] = [None] * len(outline.sections)
+
+    async def write(index: int) -> None:
+        async with semaphore:
+            drafts[index] = await generate_section(state, outline, index, search_results, words)
+        done = next((i for i, draft in enumerate(drafts) if draft is None), len(drafts))
+        if done > index:
+            # the sections up to the first unfinished one can be shown in order
+            partial = stitch_sections(outline.model_copy(update={"sections": outline.sections[:done]}), drafts[:done])
+            await emit_blog_post(state, BlogPost(title=outline.title, content=partial), config)
+
+    await asyncio.gather(*(write(i) for i in range(len(outline.sections))))
+    transitions = await generate_transitions(outline, drafts) if BLOG_HARMONIZE else []
+    content = stitch_sections(outline, drafts, transitions)
+    logger.info(f"Generated {len(outline.sections)} sections ({len(content.split())} words) in {time.perf_counter() - start:.2f}s")
+    return BlogPost(title=outline.title, content=content)
@@ -0,0 +1,139 @@
+import asyncio
+import os
+import time
+from typing import Dict, List, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from src.schema.nodes import WEB_SEARCH
+from src.state.state import AgentState
+from src.utils.logger import get_logger
+from src.utils.metrics import SPECULATION_SAVED, SPECULATIONS
+
+logger = get_logger(__name__)
+
+# Constants for speculative search on new-topic turns
+SPECULATIVE_SEARCH = os.getenv("SPECULATIVE_SEARCH", "true").lower() == "true"
+# Questions whose searches are started while the router is still deciding
+SPECULATIVE_SEARCHES = int(os.getenv("SPECULATIVE_SEARCHES", "4"))
+# Committed speculations not claimed by search_web within this many seconds are dropped
+SPECULATION_TTL = float(os.getenv("SPECULATION_TTL", "300"))
+
+
+def _retrieve(task: asyncio.Task) -> None:
+    # an abandoned task that failed must not log "exception was never retrieved"
+    if not task.cancelled():
+        task.exception()
+
+
+class Speculation:
+    """
+    Question generation and first searches for a thread, started before the route is known.
+
+    The task generates the search questions and then starts the searches for
+    the first SPECULATIVE_SEARCHES of them through fetch_search_results, so
+    search_web later joins them in flight or finds them in the search cache.
+    """
+
+    def __init__(self, state: AgentState):
+        # imported here because the web search node imports this module
+        from src.nodes.web_search_node import fetch_search_results, generate_questions
+
+        self.started_at = time.perf_counter()
+        self.searches: List[asyncio.Task] = []
+
+        async def run() -> List[str]:
+            questions = await generate_questions(state)
+            self.searches = [asyncio.create_task(fetch_search_results(question)) for question in questions[:SPECULATIVE_SEARCHES]]
+            for search in self.searches:
+                search.add_done_callback(_retrieve)
+            return questions
+
+        self.task = asyncio.create_task(run())
+
+    def cancel(self) -> None:
+        """Stop question generation and abandon the searches; searches already sent still finish into the search cache."""
+        self.task.cancel()
+        self.task.add_done_callback(_retrieve)
+        for search in self.searches:
+            search.cancel()
+
+
+_speculations: Dict[str, Speculation] = {}
+
+
+def _thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+
+def start_speculation(state: AgentState, config: Optional[RunnableConfig]) -> Optional[Speculation]:
+    """
+    Start generating questions and searching for a new-topic turn while the router runs.
+
+    Only turns without search results speculate, since those are the turns
+    the router can send to web search.
+
+    Args:
+        state (AgentState): The state the router is assessing
+        config (Optional[RunnableConfig]): The router's config, for the thread id
+
+    Returns:
+        Optional[Speculation]: The speculation, or None if this turn does not speculate
+    """
+    thread_id = _thread_id(config)
+    if not SPECULATIVE_SEARCH or thread_id is None or (state.search_results and state.search_results.search_results):
+        return None
+    now = time.perf_counter()
+    for stale_id, stale in list(_speculations.items()):
+        if now - stale.started_at > SPECULATION_TTL:
+            stale.cancel()
+            del _speculations[stale_id]
+    if thread_id in _speculations:
+        _speculations.pop(thread_id).cancel()
+    speculation = Speculation(state)
+    _speculations[thread_id] = speculation
+    return speculation
+
+
+def resolve_speculation(config: Optional[RunnableConfig], route: str) -> None:
+    """Keep the thread's speculation for search_web if the router chose web search, otherwise cancel it."""
+    thread_id = _thread_id(config)
+    speculation = _speculations.get(thread_id) if thread_id is not None else None
+    if speculation is None:
+        return
+    if route == WEB_SEARCH:
+        SPECULATIONS.labels(outcome="committed").inc()
+        return
+    del _speculations[thread_id]
+    speculation.cancel()
+    SPECULATIONS.labels(outcome="cancelled").inc()
+    logger.info(f"Cancelled speculative search: the router chose {route}")
+
+
+async def claim_speculation(config: Optional[RunnableConfig]) -> Optional[List[str]]:
+    """
+    Take the thread's committed speculation and wait for its questions.
+
+    Args:
+        config (Optional[RunnableConfig]): The search_web node's config, for the thread id
+
+    Returns:
+        Optional[List[str]]: The speculated questions, or None if there is no
+            speculation or it failed, in which case search_web generates them itself
+    """
+    thread_id = _thread_id(config)
+    speculation = _speculations.pop(thread_id, None) if thread_id is not None else None
+    if speculation is None:
+        return None
+    claimed_at = time.perf_counter()
+    try:
+        questions = await speculation.task
+    except Exception as e:
+        SPECULATIONS.labels(outcome="failed").inc()
+        logger.warning(f"Speculative question generation failed, generating questions again: {str(e)}")
+        return None
+    # everything the speculation did before search_web started overlapped with the router
+    saved = claimed_at - speculation.started_at
+    SPECULATION_SAVED.observe(saved)
+    logger.info(f"Using speculative search questions with {len(speculation.searches)} searches started, saved {saved:.2f}s")
+    return questions
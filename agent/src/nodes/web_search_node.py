@@ -1,19 +1,42 @@
+import asyncio
 import os
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-import requests
-from langchain_core.messages import HumanMessage, SystemMessage
+import httpx
+from langchain_core.runnables import RunnableConfig
 from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
 
-from src.schema.nodes import GENERATE_BLOG
+from src.cache.search_cache import get_search_cache, normalize_query
+from src.cache.summary_cache import get_summary_cache, summary_cache_key
+from src.nodes.question_dedup import dedupe_questions, remember_answers
+from src.nodes.search_payload import compact_search_payload
+from src.nodes.speculation import claim_speculation
+from src.prompts import GENERATE_QUESTIONS_PROMPT, SUMMARIZE_SEARCH_PROMPT
+from src.schema.nodes import GENERATE_BLOG, GENERATE_QUESTIONS, WEB_SEARCH
 from src.schema.schema import SearchResult, SearchResults
+from src.state.history import log_prompt_tokens, select_history
 from src.state.state import AgentState
+from src.utils.http import get_http_client
 from src.utils.logger import get_logger
+from src.utils.models import get_model, get_structured_model
+from src.utils.resilience import hedged
+from src.utils.singleflight import SingleFlight
 
 logger = get_logger(__name__)
 
+YDC_SEARCH_URL = os.getenv("YDC_SEARCH_URL", "https://api.ydc-index.io/search")
+SEARCH_CONCURRENCY = int(os.getenv("SEARCH_CONCURRENCY", "4"))
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))
+SEARCH_QUESTION_TIMEOUT = float(os.getenv("SEARCH_QUESTION_TIMEOUT", "90"))
+# Start a duplicate search if the first has not answered after this many seconds, 0 to disable
+SEARCH_HEDGE_DELAY = float(os.getenv("SEARCH_HEDGE_DELAY", "0"))
+
+# Identical questions in flight at once, e.g. from parallel threads or batch topics, share one search and one summary
+search_flight = SingleFlight("search")
+summary_flight = SingleFlight("summary")
+
 
 class SearchInput(BaseModel):
     questions: List[str] = Field(
@@ -34,21 +57,11 @@ class SearchInput(BaseModel):
 async def generate_questions(state: AgentState) -> List[str]:
     logger.info("Generating search questions from user input")
     try:
-        SYSTEM_PROMPT = f"""
-        You are an expert web researcher. Your task is to formulate relevant questions
-        for searching information about the blog topic requested by the user.
-
-        The current year is {datetime.now().year}.
-        The current date is {datetime.now().strftime("%Y-%m-%d")}.
-        Create a list of 5-8 specific questions that will help gather comprehensive
-        information for the blog post.
+        now = datetime.now()
+        messages = [*GENERATE_QUESTIONS_PROMPT.messages(year=now.year, date=now.strftime("%Y-%m-%d")), *select_history(state, GENERATE_QUESTIONS)]
+        log_prompt_tokens(GENERATE_QUESTIONS, messages)
 
-        Review the last messages and create a list of questions that will help gather comprehensive
-        information for the blog post.
-        """
-        messages = [SystemMessage(SYSTEM_PROMPT), *state.messages[-5:]]
-
-        model = ChatOpenAI(model="gpt-4o").with_structured_output(SearchInput)
+        model = get_structured_model(GENERATE_QUESTIONS, SearchInput)
 
         response: SearchInput = await model.ainvoke(messages)
         logger.info(f"Generated {len(response.questions)} questions for web search")
@@ -58,77 +71,133 @@ async def generate_questions(state: AgentState) -> List[str]:
         raise
 
 
-async def search_web(state: AgentState) -> AgentState:
-    logger.info("Starting web search process")
+async def fetch_search_results(question: str) -> dict:
+    """Query the YDC index for a single search question, serving repeats from the search cache."""
+    cache = get_search_cache()
+    cached = await cache.aget(question)
+    if cached is not None:
+        logger.info(f"Search cache hit for question: {question}")
+        return cached
+
+    async def search() -> httpx.Response:
+        response = await get_http_client().get(
+            YDC_SEARCH_URL,
+            params={"query": question},
+            headers={"X-API-Key": str(os.getenv("YDC_API_KEY"))},
+        )
+        response.raise_for_status()
+        return response
+
+    async def search_and_cache() -> dict:
+        response = await hedged(search, SEARCH_HEDGE_DELAY, upstream="ydc")
+        search_results = response.json()
+        await cache.aset(question, search_results)
+        return search_results
+
+    return await search_flight.do(normalize_query(question), search_and_cache)
+
+
+async def summarize_search_results(model: ChatOpenAI, question: str, search_results: dict) -> SearchResult:
+    """Summarize the search results, compacted to the relevant hits and snippets, into a markdown answer for the question."""
+    # token counting, embedding and snippet clustering are CPU-bound, so they run off the event loop
+    sources = await asyncio.to_thread(compact_search_payload, question, search_results, model.model_name)
+    messages = SUMMARIZE_SEARCH_PROMPT.messages(question=question, sources=sources)
+
+    response = await model.ainvoke(messages)
+    return SearchResult(question=question, search_result=response.content)
+
+
+async def process_question(
+    model: ChatOpenAI,
+    question: str,
+    index: int,
+    total: int,
+    search_semaphore: asyncio.Semaphore,
+    summary_semaphore: asyncio.Semaphore,
+) -> Optional[SearchResult]:
+    """Search and summarize a single question, returning None if it fails."""
+    logger.info(f"Processing search question {index}/{total}: {question}")
     try:
-        headers = {"X-API-Key": str(os.getenv("YDC_API_KEY"))}
-        results = []
-        messages = state.messages[-5:]
-
-        model = ChatOpenAI(model="gpt-4o")
-        questions = await generate_questions(state)
-
-        for i, question in enumerate(questions, 1):
-            logger.info(f"Processing search question {i}/{len(questions)}: {question}")
-            try:
-                search_results = requests.get(
-                    "https://api.ydc-index.io/search",
-                    params={"query": question},
-                    headers=headers,
-                )
-                search_results.raise_for_status()
-
-                messages = [
-                    SystemMessage(
-                        """
-                        You are a blog writer. Your task is to write a blog post based on the topic provided by the user.
-                        Ensure you provide an answer that is a direct and clear response to the question.
-                        """
-                    ),
-                    HumanMessage(
-                        content=f"""
-                        Use the following search results to help answer the question:
-
-                        SEARCH QUERY formed from the user question:
-                        -------------
-                        {question}
-                        -------------
-                        SEARCH RESULTS:
-                        ---------------
-                        {search_results.json()}
-                        ---------------
-                        Instructions:
-                        1. Provide a direct and clear answer to the question.
-                        2. Focus only on information relevant to the question asked.
-                        3. Do not include any additional information not directly related to the question.
-                        4. Make sure you only provide the answer to the question asked and nothing else.
-                        5. Provide a detailed and accurate response based on the information available in a professional manner in markdown format.
-                        6. Cite all the sources of your information in the response based on the search results. This is very important. DO NOT make up sources or miss any.
-                        7. Your response should just be a summary of search results as an answer with sources.
-                        8. when mentioning sources, use markdown links with the name of the source as the text and the url as the link to make them clickable. example: [AI trends](https://www.google.com/ai-trends)
-                        """
-                    ),
-                ]
-
-                response = await model.ainvoke(messages)
-
-                results.append(SearchResult(question=question, search_result=response.content))
-                logger.info(f"Successfully processed search results for question {i}")
-
-            except requests.RequestException as e:
-                logger.error(
-                    f"Error in web search for question {question}: {str(e)}",
-                    exc_info=True,
-                )
-                continue
-            except Exception as e:
-                logger.error(
-                    f"Error processing search results for question {question}: {str(e)}",
-                    exc_info=True,
-                )
-                continue
+        async with search_semaphore:
+            search_results = await fetch_search_results(question)
+
+        summary_cache = get_summary_cache()
+        result = await summary_cache.aget(question, search_results, model.model_name)
+        if result is not None:
+            logger.info(f"Summary cache hit for question {index}")
+            return result
+
+        async def summarize() -> SearchResult:
+            async with summary_semaphore:
+                result = await summarize_search_results(model, question, search_results)
+            await summary_cache.aset(search_results, model.model_name, result)
+            return result
+
+        result = await summary_flight.do(summary_cache_key(question, search_results, model.model_name), summarize)
+        logger.info(f"Successfully processed search results for question {index}")
+        return result
+
+    except httpx.HTTPError as e:
+        logger.error(
+            f"Error in web search for question {question}: {str(e)}",
+            exc_info=True,
+        )
+        return None
+    except Exception as e:
+        logger.error(
+            f"Error processing search results for question {question}: {str(e)}",
+            exc_info=True,
+        )
+        return None
+
+
+async def process_question_with_timeout(
+    model: ChatOpenAI,
+    question: str,
+    index: int,
+    total: int,
+    search_semaphore: asyncio.Semaphore,
+    summary_semaphore: asyncio.Semaphore,
+) -> Optional[SearchResult]:
+    """Run process_question under the per-question timeout."""
+    try:
+        return await asyncio.wait_for(
+            process_question(model, question, index, total, search_semaphore, summary_semaphore),
+            timeout=SEARCH_QUESTION_TIMEOUT,
+        )
+    except asyncio.TimeoutError:
+        logger.error(f"Timed out after {SEARCH_QUESTION_TIMEOUT}s processing question {question}")
+        return None
+
 
+async def search_web(state: AgentState, config: Optional[RunnableConfig] = None) -> AgentState:
+    logger.info("Starting web search process")
+    try:
+        model = get_model(WEB_SEARCH)
+        # questions generated, and searches started, while the router was deciding
+        questions = await claim_speculation(config) or await generate_questions(state)
+
+        clusters, vectors = await dedupe_questions(questions)
+        pending = [cluster.question for cluster in clusters if cluster.answer is None]
+
+        search_semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+        summary_semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+        # gather keeps the results in question order
+        processed = iter(
+            await asyncio.gather(
+                *[process_question_with_timeout(model, question, i, len(pending), search_semaphore, summary_semaphore) for i, question in enumerate(pending, 1)]
+            )
+        )
+        answers = [cluster.answer if cluster.answer is not None else next(processed) for cluster in clusters]
+        await remember_answers(vectors, [None if cluster.answer is not None else answer for cluster, answer in zip(clusters, answers)])
+        results = [result for result in answers if result is not None]
+
+        stats = get_search_cache().stats
+        summary_stats = get_summary_cache().stats
         logger.info(f"Completed web search process with {len(results)} results")
+        logger.info(f"Search cache stats: {stats.hits} hits, {stats.misses} misses, {stats.evictions} evictions")
+        logger.info(f"Summary cache stats: {summary_stats.hits} hits, {summary_stats.misses} misses, {summary_stats.evictions} evictions")
         search_results = SearchResults(search_results=results)
         return {"route": GENERATE_BLOG, "search_results": search_results}
 
@@ -0,0 +1,30 @@
+from .prompts import (
+    BLOG_EDITS_PROMPT,
+    BLOG_OUTLINE_PROMPT,
+    BLOG_SECTION_PROMPT,
+    BLOG_TRANSITIONS_PROMPT,
+    CHAT_PROMPT,
+    FEEDBACK_PROMPT,
+    GENERATE_BLOG_PROMPT,
+    GENERATE_QUESTIONS_PROMPT,
+    HISTORY_SUMMARY_PROMPT,
+    ROUTER_PROMPT,
+    SUMMARIZE_SEARCH_PROMPT,
+)
+from .template import PROMPTS, PromptTemplate
+
+__all__ = [
+    "BLOG_EDITS_PROMPT",
+    "BLOG_OUTLINE_PROMPT",
+    "BLOG_SECTION_PROMPT",
+    "BLOG_TRANSITIONS_PROMPT",
+    "CHAT_PROMPT",
+    "FEEDBACK_PROMPT",
+    "GENERATE_BLOG_PROMPT",
+    "GENERATE_QUESTIONS_PROMPT",
+    "HISTORY_SUMMARY_PROMPT",
+    "PROMPTS",
+    "PromptTemplate",
+    "ROUTER_PROMPT",
+    "SUMMARIZE_SEARCH_PROMPT",
+]
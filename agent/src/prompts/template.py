@@ -0,0 +1,72 @@
+import hashlib
+import re
+import textwrap
+from string import Formatter
+from typing import Any, Dict, List
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+FIELD_PATTERN = re.compile(r"(?<!\{)\{[A-Za-z_]\w*\}(?!\})")
+
+
+def _clean(text: str) -> str:
+    return textwrap.dedent(text).strip()
+
+
+class PromptTemplate:
+    """
+    A node's prompt as a static prefix followed by a volatile suffix.
+
+    Provider-side prompt caching reuses the longest prefix a request shares
+    with recent ones, so everything that changes between requests (dates,
+    search results, the post, the conversation) belongs in the suffix, after
+    every fixed instruction. The prefix is sent as its own system message,
+    built once when the template is defined and shared by every request; the
+    suffix is formatted per request and sent as a second message.
+
+    Every template registers itself in PROMPTS by name, so the prefixes can
+    be checked offline.
+    """
+
+    def __init__(self, name: str, prefix: str, suffix: str = "", suffix_role: str = "system"):
+        self.name = name
+        self.prefix = _clean(prefix)
+        self.suffix = _clean(suffix)
+        if FIELD_PATTERN.search(self.prefix):
+            raise ValueError(f"Prompt {name} has a placeholder in its static prefix: {FIELD_PATTERN.search(self.prefix).group()}")
+        if suffix_role not in ("system", "human"):
+            raise ValueError(f"Unknown suffix role: {suffix_role}")
+        self.suffix_role = suffix_role
+        self.fields = tuple(field for _, field, _, _ in Formatter().parse(self.suffix) if field)
+        self.prefix_message = SystemMessage(content=self.prefix)
+        self.prefix_hash = hashlib.sha256(self.prefix.encode("utf-8")).hexdigest()[:16]
+        if name in PROMPTS:
+            raise ValueError(f"Prompt {name} is defined twice")
+        PROMPTS[name] = self
+
+    def format_suffix(self, **values: Any) -> str:
+        """
+        Fill in the volatile suffix.
+
+        Raises:
+            KeyError: If a placeholder of the suffix has no value
+        """
+        return self.suffix.format(**values)
+
+    def messages(self, **values: Any) -> List[BaseMessage]:
+        """
+        The prompt messages for one request: the shared prefix message and, if the template has one, the formatted suffix.
+
+        Args:
+            **values: A value for every placeholder of the suffix
+
+        Returns:
+            List[BaseMessage]: The messages to send before the conversation history
+        """
+        if not self.suffix:
+            return [self.prefix_message]
+        suffix = self.format_suffix(**values)
+        return [self.prefix_message, SystemMessage(content=suffix) if self.suffix_role == "system" else HumanMessage(content=suffix)]
+
+
+PROMPTS: Dict[str, PromptTemplate] = {}
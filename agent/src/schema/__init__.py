@@ -1,4 +1,20 @@
-from .nodes import CHAT, GENERATE_BLOG, ROUTER, WEB_SEARCH
+from .nodes import CHAT, FEEDBACK, GENERATE_BLOG, GENERATE_QUESTIONS, HISTORY_SUMMARY, ROUTER, WEB_SEARCH
 from .schema import AssessIntent, BlogPost, ChatWithUser, GenerateBlogPost, ReasonedBoolean, SearchResult, SearchResults, SearchWeb
 
-__all__ = ["CHAT", "GENERATE_BLOG", "ROUTER", "WEB_SEARCH", "AssessIntent", "BlogPost", "SearchResult", "SearchResults", "ReasonedBoolean", "GenerateBlogPost", "ChatWithUser", "SearchWeb"]
+__all__ = [
+    "CHAT",
+    "FEEDBACK",
+    "GENERATE_BLOG",
+    "GENERATE_QUESTIONS",
+    "HISTORY_SUMMARY",
+    "ROUTER",
+    "WEB_SEARCH",
+    "AssessIntent",
+    "BlogPost",
+    "SearchResult",
+    "SearchResults",
+    "ReasonedBoolean",
+    "GenerateBlogPost",
+    "ChatWithUser",
+    "SearchWeb",
+]
@@ -3,3 +3,8 @@ GENERATE_BLOG = "generate_blog"
 ROUTER = "router"
 WEB_SEARCH = "web_search"
 FEEDBACK = "feedback"
+GENERATE_QUESTIONS = "generate_questions"
+HISTORY_SUMMARY = "history_summary"
+BLOG_OUTLINE = "blog_outline"
+BLOG_SECTION = "blog_section"
+BLOG_TRANSITIONS = "blog_transitions"
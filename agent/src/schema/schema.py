@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -72,3 +72,47 @@ class SearchResult(BaseModel):
 
 class SearchResults(BaseModel):
     search_results: Optional[List[SearchResult]] = Field(None, description="List of search results with their corresponding questions")
+
+
+class OutlineSection(BaseModel):
+    heading: str = Field(description="The H2 heading of the section")
+    key_points: List[str] = Field(description="The points the section must cover, in order")
+    sources: List[int] = Field(description="Numbers of the research notes the section draws on")
+
+
+class BlogOutline(BaseModel):
+    title: str = Field(description="The title of the blog post")
+    sections: List[OutlineSection] = Field(
+        description="""
+        The sections of the post in reading order: an introduction that hooks the reader first,
+        then the body sections, and a closing section with key takeaways and next steps.
+        """
+    )
+    meta_description: str = Field(description="An SEO meta description of at most 160 characters")
+    keywords: List[str] = Field(description="SEO keywords for the post")
+
+
+class SectionTransitions(BaseModel):
+    transitions: List[str] = Field(
+        description="One short sentence per pair of adjacent sections, in order, closing the first section and leading into the next"
+    )
+
+
+class BlogEdit(BaseModel):
+    operation: Literal["replace_section", "insert_after_section", "delete_section", "replace_text", "set_title"] = Field(
+        description="""
+        replace_section: replace section `section` with `content`.
+        insert_after_section: insert `content`, a new section starting with its H2 heading, after section `section` (0 inserts before the first heading).
+        delete_section: remove section `section`.
+        replace_text: replace the exact text `find`, which occurs once in section `section`, with `content`.
+        set_title: change the title of the post to `content`.
+        """
+    )
+    section: Optional[int] = Field(default=None, description="The number of the section to edit, as marked in the post")
+    find: Optional[str] = Field(default=None, description="For replace_text, the exact text to replace, long enough to occur only once in the section")
+    content: Optional[str] = Field(default=None, description="The new markdown, replacement text or title")
+
+
+class BlogEdits(BaseModel):
+    edits: List[BlogEdit] = Field(description="The smallest edits to the post that apply the feedback")
+    rewrite: bool = Field(default=False, description="True only if the feedback asks to rewrite most of the post, in which case edits is empty")
@@ -0,0 +1,20 @@
+from .admission import AdmissionController, AdmissionMiddleware, AdmissionRejected, tenant_key
+from .health import DependencyStatus, HealthMonitor, LoopLagMonitor, Readiness
+from .runs import RunTracker, RunTrackingMiddleware
+from .startup import STARTUP_MODE, Warmup, add_copilotkit_endpoint
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionMiddleware",
+    "AdmissionRejected",
+    "DependencyStatus",
+    "HealthMonitor",
+    "LoopLagMonitor",
+    "Readiness",
+    "RunTracker",
+    "RunTrackingMiddleware",
+    "STARTUP_MODE",
+    "Warmup",
+    "add_copilotkit_endpoint",
+    "tenant_key",
+]
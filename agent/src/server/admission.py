@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from src.server.runs import ASGIApp, Receive, Scope, Send
+from src.utils.logger import get_logger
+from src.utils.metrics import ADMISSION_ACTIVE, ADMISSION_QUEUE_DEPTH, ADMISSION_REJECTED, ADMISSION_WAIT
+
+logger = get_logger(__name__)
+
+# Constants for admission control of graph runs, per worker
+ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "16"))
+ADMISSION_MAX_PER_KEY = int(os.getenv("ADMISSION_MAX_PER_KEY", "4"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "32"))
+ADMISSION_MAX_WAIT = float(os.getenv("ADMISSION_MAX_WAIT", "10"))
+
+
+class AdmissionRejected(Exception):
+    """Raised when a run cannot be admitted: the queue is full or the wait exceeded its bound."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Run rejected by admission control: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Caps concurrent graph runs globally and per API key.
+
+    Runs that cannot start immediately wait in a bounded queue for at most
+    ``max_wait`` seconds. A full queue rejects at once, so callers get a fast
+    429 instead of piling more load onto the model provider.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = ADMISSION_MAX_CONCURRENCY,
+        max_per_key: int = ADMISSION_MAX_PER_KEY,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        max_wait: float = ADMISSION_MAX_WAIT,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_per_key = max_per_key
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.queued = 0
+        self._per_key: Dict[str, int] = {}
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # created lazily so the condition belongs to the server's running loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _can_start(self, key: str) -> bool:
+        return self.active < self.max_concurrency and self._per_key.get(key, 0) < self.max_per_key
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        ADMISSION_REJECTED.labels(reason=reason).inc()
+        logger.warning(f"Rejected graph run ({reason}): {self.active} active, {self.queued} queued")
+        return AdmissionRejected(reason, retry_after=max(1.0, self.max_wait / 2))
+
+    @asynccontextmanager
+    async def admit(self, key: str) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for the duration of the block.
+
+        Args:
+            key (str): The tenant the run belongs to, e.g. a hashed API key
+
+        Raises:
+            AdmissionRejected: If the queue is full or the run waited longer than max_wait
+        """
+        condition = self._get_condition()
+        start = time.monotonic()
+        async with condition:
+            if not self._can_start(key):
+                if self.queued >= self.max_queue:
+                    raise self._reject("queue_full")
+                self.queued += 1
+                ADMISSION_QUEUE_DEPTH.inc()
+                try:
+                    await asyncio.wait_for(condition.wait_for(lambda: self._can_start(key)), self.max_wait)
+                except asyncio.TimeoutError:
+                    raise self._reject("timeout") from None
+                finally:
+                    self.queued -= 1
+                    ADMISSION_QUEUE_DEPTH.dec()
+            self.active += 1
+            self._per_key[key] = self._per_key.get(key, 0) + 1
+        ADMISSION_WAIT.observe(time.monotonic() - start)
+        ADMISSION_ACTIVE.inc()
+
+        try:
+            yield
+        finally:
+            ADMISSION_ACTIVE.dec()
+            async with condition:
+                self.active -= 1
+                self._per_key[key] -= 1
+                if not self._per_key[key]:
+                    del self._per_key[key]
+                condition.notify_all()
+
+
+def tenant_key(scope: Scope) -> str:
+    """Identify the caller by API key, falling back to the client address. Keys are hashed before use."""
+    headers = dict(scope.get("headers") or [])
+    credential = headers.get(b"x-api-key") or headers.get(b"authorization")
+    if credential:
+        return "key:" + hashlib.sha256(credential).hexdigest()[:16]
+    client = scope.get("client")
+    return f"addr:{client[0]}" if client else "anonymous"
+
+
+class AdmissionMiddleware:
+    """ASGI middleware admitting POST requests under a path prefix through an AdmissionController."""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController, path_prefix: str):
+        self.app = app
+        self.controller = controller
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            async with self.controller.admit(tenant_key(scope)):
+                await self.app(scope, receive, send)
+        except AdmissionRejected as e:
+            body = json.dumps({"detail": str(e)}).encode()
+            headers = [(b"content-type", b"application/json"), (b"retry-after", str(int(e.retry_after)).encode())]
+            await send({"type": "http.response.start", "status": 429, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
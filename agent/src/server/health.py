@@ -0,0 +1,261 @@
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.cache.search_cache import get_search_cache
+from src.cache.summary_cache import get_summary_cache
+from src.server.admission import ADMISSION_MAX_QUEUE, AdmissionController
+from src.server.runs import RunTracker
+from src.server.startup import Warmup
+from src.utils.logger import get_logger
+from src.utils.metrics import EVENT_LOOP_LAG, NOT_READY
+from src.utils.resilience import circuit_states
+
+logger = get_logger(__name__)
+
+# Constants for the health monitor, per worker. A threshold of 0 disables its check
+HEALTH_LAG_INTERVAL = float(os.getenv("HEALTH_LAG_INTERVAL", "0.25"))
+HEALTH_LAG_WINDOW = int(os.getenv("HEALTH_LAG_WINDOW", "8"))
+HEALTH_MAX_LOOP_LAG = float(os.getenv("HEALTH_MAX_LOOP_LAG", "0.5"))
+HEALTH_MAX_QUEUE_DEPTH = int(os.getenv("HEALTH_MAX_QUEUE_DEPTH", str(max(ADMISSION_MAX_QUEUE // 2, 1))))
+HEALTH_MAX_IN_FLIGHT = int(os.getenv("HEALTH_MAX_IN_FLIGHT", "0"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+HEALTH_PROBE_INTERVAL = float(os.getenv("HEALTH_PROBE_INTERVAL", "5"))
+HEALTH_REQUIRED_DEPENDENCIES = [name.strip() for name in os.getenv("HEALTH_REQUIRED_DEPENDENCIES", "checkpointer,search_cache,summary_cache").split(",") if name.strip()]
+
+Probe = Callable[[], Awaitable[None]]
+
+
+class DependencyStatus(BaseModel):
+    ok: bool = Field(description="Whether the dependency answered its probe in time")
+    latency: float = Field(description="Seconds the probe took")
+    error: Optional[str] = Field(default=None, description="Why the probe failed")
+
+
+class Readiness(BaseModel):
+    ready: bool = Field(description="Whether this worker should receive new traffic")
+    reasons: List[str] = Field(default_factory=list, description="Why it should not, e.g. warming_up, draining, loop_lag, backlog or <dependency>_unreachable")
+    loop_lag: float = Field(description="Worst event loop lag over the recent window, in seconds")
+    queue_depth: int = Field(description="Graph runs waiting for admission")
+    in_flight: int = Field(description="Graph runs executing")
+    dependencies: Dict[str, DependencyStatus] = Field(default_factory=dict, description="The latest probe of each dependency")
+    circuits: Dict[str, str] = Field(default_factory=dict, description="Upstream circuit breaker states")
+
+
+class LoopLagMonitor:
+    """
+    Measure event loop lag: how late a task sleeping ``interval`` seconds wakes up.
+
+    Every callback on a saturated loop, from CPU-bound work, blocking calls or
+    a long ready queue, waits about this long before it runs. A wakeup that
+    is overdue right now counts too, so a loop stalled by one long blocking
+    call shows its lag as soon as a request gets through.
+    """
+
+    def __init__(self, interval: float = HEALTH_LAG_INTERVAL, window: int = HEALTH_LAG_WINDOW):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._expected: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(time.monotonic() - self._expected, 0.0)
+            self._samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            EVENT_LOOP_LAG.observe(lag)
+
+    @property
+    def lag(self) -> float:
+        """The worst lag over the recent window, including a wakeup that is overdue now."""
+        overdue = max(time.monotonic() - self._expected, 0.0) if self._expected is not None else 0.0
+        return max(overdue, *self._samples) if self._samples else overdue
+
+
+async def probe_checkpointer() -> None:
+    from src.graph.graph import get_checkpointer
+
+    # created off the loop: the first call imports the checkpoint backends
+    checkpointer = await asyncio.to_thread(get_checkpointer)
+    await checkpointer.ping()
+
+
+async def probe_search_cache() -> None:
+    await asyncio.to_thread(lambda: get_search_cache().ping())
+
+
+async def probe_summary_cache() -> None:
+    await asyncio.to_thread(lambda: get_summary_cache().backend.ping())
+
+
+DEFAULT_PROBES: Dict[str, Probe] = {"checkpointer": probe_checkpointer, "search_cache": probe_search_cache, "summary_cache": probe_summary_cache}
+
+
+class HealthMonitor:
+    """
+    Liveness, readiness and runtime stats for one worker.
+
+    Liveness only says the process and its event loop answer. Readiness says
+    whether the load balancer should send this worker new traffic: not while
+    warming up or draining, not while the event loop lag or the admission
+    backlog is over its threshold, and not while a required dependency fails
+    its probe. Probes run at most every ``probe_interval`` seconds, shared by
+    concurrent checks, with a timeout each.
+
+    Open upstream circuits are reported but do not fail readiness: every
+    replica shares the upstreams, so taking this one out of rotation would
+    not help.
+    """
+
+    def __init__(
+        self,
+        warmup: Warmup,
+        run_tracker: RunTracker,
+        admission: AdmissionController,
+        lag_monitor: Optional[LoopLagMonitor] = None,
+        probes: Optional[Dict[str, Probe]] = None,
+        probe_interval: float = HEALTH_PROBE_INTERVAL,
+        probe_timeout: float = HEALTH_PROBE_TIMEOUT,
+    ):
+        self.warmup = warmup
+        self.run_tracker = run_tracker
+        self.admission = admission
+        self.lag_monitor = lag_monitor or LoopLagMonitor()
+        self.probes = DEFAULT_PROBES if probes is None else probes
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.started_at = time.time()
+        self._dependencies: Dict[str, DependencyStatus] = {}
+        self._probed_at: Optional[float] = None
+        self._probing: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start measuring event loop lag; call from the server's running loop."""
+        self.lag_monitor.start()
+
+    async def stop(self) -> None:
+        await self.lag_monitor.stop()
+
+    async def check_dependencies(self) -> Dict[str, DependencyStatus]:
+        """
+        Probe every dependency, reusing the last results for ``probe_interval`` seconds.
+
+        Returns:
+            Dict[str, DependencyStatus]: The status of each dependency by name
+        """
+        if self._probed_at is not None and time.monotonic() - self._probed_at < self.probe_interval:
+            return self._dependencies
+        if self._probing is None or self._probing.done():
+            self._probing = asyncio.ensure_future(self._probe_all())
+        # shielded so a client disconnecting mid-check does not cancel the probes other checks wait on
+        await asyncio.shield(self._probing)
+        return self._dependencies
+
+    async def _probe_all(self) -> None:
+        statuses = await asyncio.gather(*(self._probe(name, probe) for name, probe in self.probes.items()))
+        self._dependencies = dict(zip(self.probes, statuses))
+        self._probed_at = time.monotonic()
+
+    async def _probe(self, name: str, probe: Probe) -> DependencyStatus:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe(), self.probe_timeout)
+            return DependencyStatus(ok=True, latency=time.perf_counter() - start)
+        except asyncio.TimeoutError:
+            error = f"No answer within {self.probe_timeout}s"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        logger.warning(f"Health probe {name} failed: {error}")
+        return DependencyStatus(ok=False, latency=time.perf_counter() - start, error=error)
+
+    def liveness(self) -> Dict[str, Any]:
+        """The process is up and its event loop answers."""
+        return {
+            "status": "alive",
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def readiness(self) -> Readiness:
+        """Whether this worker should receive new traffic, and why not. Counts the reasons in NOT_READY."""
+        readiness = await self.evaluate()
+        for reason in readiness.reasons:
+            NOT_READY.labels(reason=reason).inc()
+        return readiness
+
+    async def evaluate(self) -> Readiness:
+        """Evaluate readiness without recording it."""
+        reasons: List[str] = []
+        if not self.warmup.ready:
+            reasons.append("warming_up")
+        if self.run_tracker.draining:
+            reasons.append("draining")
+        lag = self.lag_monitor.lag
+        if HEALTH_MAX_LOOP_LAG > 0 and lag > HEALTH_MAX_LOOP_LAG:
+            reasons.append("loop_lag")
+        if HEALTH_MAX_QUEUE_DEPTH > 0 and self.admission.queued >= HEALTH_MAX_QUEUE_DEPTH:
+            reasons.append("backlog")
+        if HEALTH_MAX_IN_FLIGHT > 0 and self.run_tracker.in_flight >= HEALTH_MAX_IN_FLIGHT:
+            reasons.append("in_flight")
+        # the checkpointer only exists once the warmup has compiled the graph
+        dependencies = await self.check_dependencies() if self.warmup.ready else {}
+        reasons += [f"{name}_unreachable" for name, status in dependencies.items() if name in HEALTH_REQUIRED_DEPENDENCIES and not status.ok]
+        return Readiness(
+            ready=not reasons,
+            reasons=reasons,
+            loop_lag=lag,
+            queue_depth=self.admission.queued,
+            in_flight=self.run_tracker.in_flight,
+            dependencies=dependencies,
+            circuits=circuit_states(),
+        )
+
+    async def stats(self) -> Dict[str, Any]:
+        """Everything readiness looks at, with the counters and thresholds behind it."""
+        readiness = await self.evaluate()
+        return {
+            **self.liveness(),
+            "readiness": readiness.model_dump(),
+            "event_loop": {"lag": readiness.loop_lag, "max_lag": self.lag_monitor.max_lag, "interval": self.lag_monitor.interval},
+            "runs": {
+                "in_flight": self.run_tracker.in_flight,
+                "started": self.run_tracker.started,
+                "completed": self.run_tracker.completed,
+                "draining": self.run_tracker.draining,
+            },
+            "admission": {
+                "active": self.admission.active,
+                "queued": self.admission.queued,
+                "max_concurrency": self.admission.max_concurrency,
+                "max_queue": self.admission.max_queue,
+            },
+            "warmup": {"mode": self.warmup.mode, "ready": self.warmup.ready, "seconds": self.warmup.seconds, "error": self.warmup.error},
+            "thresholds": {
+                "max_loop_lag": HEALTH_MAX_LOOP_LAG,
+                "max_queue_depth": HEALTH_MAX_QUEUE_DEPTH,
+                "max_in_flight": HEALTH_MAX_IN_FLIGHT,
+                "required_dependencies": HEALTH_REQUIRED_DEPENDENCIES,
+            },
+        }
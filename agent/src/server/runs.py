@@ -0,0 +1,157 @@
+import asyncio
+import json
+import signal
+import threading
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from src.utils.logger import get_logger
+from src.utils.resilience import turn_budget
+
+logger = get_logger(__name__)
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+
+class RunTracker:
+    """
+    Count the graph runs currently executing in this worker.
+
+    Once draining starts new runs are refused, and drain() waits for the
+    runs already in flight to finish so shutdown does not cut them off.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.started = 0
+        self.completed = 0
+        self.draining = False
+        self._idle: Optional[asyncio.Event] = None
+
+    def _get_idle_event(self) -> asyncio.Event:
+        # created lazily so the event belongs to the server's running loop
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            if self.in_flight == 0:
+                self._idle.set()
+        return self._idle
+
+    @asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        """Mark a run as in flight for the duration of the block."""
+        self.in_flight += 1
+        self.started += 1
+        self._get_idle_event().clear()
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            if self.in_flight == 0:
+                self._get_idle_event().set()
+
+    async def drain(self, timeout: float) -> bool:
+        """
+        Stop admitting runs and wait for the in-flight ones to finish.
+
+        Args:
+            timeout (float): Maximum seconds to wait
+
+        Returns:
+            bool: True if every run finished within the timeout
+        """
+        self.draining = True
+        if self.in_flight:
+            logger.info(f"Draining {self.in_flight} in-flight graph runs")
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self._get_idle_event().wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Shutdown timed out after {timeout}s with {self.in_flight} graph runs still in flight")
+            return False
+        logger.info(f"Drained graph runs in {time.monotonic() - start:.2f}s")
+        return True
+
+    def drain_on_signal(self, timeout: float, sig: int = signal.SIGTERM) -> bool:
+        """
+        Drain before the server's own handler sees a shutdown signal.
+
+        uvicorn closes its listening sockets as soon as it handles SIGTERM and
+        only runs the lifespan shutdown once every connection has closed, so
+        draining from there is too late to turn anything away. This wraps the
+        handler uvicorn installed: the first signal starts draining, so new
+        runs get a 503 and readiness reports ``draining`` while the server
+        still accepts connections, and the signal is passed on once the
+        in-flight runs finish or the timeout passes. A second signal is passed
+        on at once. Call from the server's startup, on its running loop.
+
+        Args:
+            timeout (float): Maximum seconds to drain before passing the signal on
+            sig (int): The signal to intercept
+
+        Returns:
+            bool: False if the handler could not be installed, off the main thread
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        loop = asyncio.get_running_loop()
+        previous = signal.getsignal(sig)
+
+        def pass_on(signum: int, frame: Any) -> None:
+            signal.signal(signum, previous)
+            if callable(previous):
+                previous(signum, frame)
+            else:
+                signal.raise_signal(signum)
+
+        async def drain_then_pass_on(signum: int, frame: Any) -> None:
+            await self.drain(timeout)
+            # unless a second signal already passed it on
+            if signal.getsignal(signum) is handle:
+                pass_on(signum, frame)
+
+        def handle(signum: int, frame: Any) -> None:
+            if self.draining:
+                pass_on(signum, frame)
+                return
+            logger.info(f"Received {signal.Signals(signum).name}, draining before shutdown")
+            self.draining = True
+            loop.call_soon_threadsafe(lambda: asyncio.ensure_future(drain_then_pass_on(signum, frame)))
+
+        signal.signal(sig, handle)
+        return True
+
+
+class RunTrackingMiddleware:
+    """
+    ASGI middleware tracking agent requests under a path prefix until their streamed response completes.
+
+    Each tracked request runs under a turn latency budget, which bounds the
+    deadlines of the outbound calls the graph run makes, unless ``budget`` is
+    off for requests that run many turns and budget each one themselves.
+    """
+
+    def __init__(self, app: ASGIApp, tracker: RunTracker, path_prefix: str, budget: bool = True):
+        self.app = app
+        self.tracker = tracker
+        self.path_prefix = path_prefix
+        self.budget = budget
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        if self.tracker.draining:
+            body = json.dumps({"detail": "Server is shutting down"}).encode()
+            await send({"type": "http.response.start", "status": 503, "headers": [(b"content-type", b"application/json"), (b"retry-after", b"1")]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        with turn_budget() if self.budget else nullcontext():
+            async with self.tracker.track():
+                await self.app(scope, receive, send)
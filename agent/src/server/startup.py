@@ -0,0 +1,114 @@
+import asyncio
+import os
+import time
+from typing import Any, Optional
+
+from fastapi import FastAPI, Request
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# STARTUP_MODE is lazy (serve at once and warm up in the background) or eager (warm up before serving)
+STARTUP_MODE = os.getenv("STARTUP_MODE", "lazy").lower()
+STARTUP_MODES = ("lazy", "eager")
+COPILOTKIT_AGENT_NAME = "blog-post-generator"
+
+
+def _build_sdk() -> Any:
+    """Import CopilotKit, compile the graph and build the remote endpoint; blocking, so run it off the event loop."""
+    from copilotkit import CopilotKitRemoteEndpoint, LangGraphAgent
+
+    from src.graph.graph import get_blog_post_generator_graph
+
+    return CopilotKitRemoteEndpoint(
+        agents=[
+            LangGraphAgent(
+                name=COPILOTKIT_AGENT_NAME,
+                description="Blog post generator agent that generates blog posts.",
+                graph=get_blog_post_generator_graph(),
+            )
+        ],
+    )
+
+
+class Warmup:
+    """
+    Build the graph and the CopilotKit endpoint once per worker, off the event loop.
+
+    Importing CopilotKit, LangGraph and the LLM clients and compiling the
+    graph takes seconds, so the server starts answering liveness checks
+    first and does this in a worker thread. Requests that need the graph
+    wait for it; readiness reports false until it is done. A failed warmup
+    is retried by the next caller.
+    """
+
+    def __init__(self, mode: str = STARTUP_MODE):
+        if mode not in STARTUP_MODES:
+            raise ValueError(f"Unknown STARTUP_MODE {mode!r}, expected one of {STARTUP_MODES}")
+        self.mode = mode
+        self.sdk: Optional[Any] = None
+        self.seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.sdk is not None
+
+    def start(self) -> asyncio.Task:
+        """Start warming up unless it is already running or done."""
+        if self._task is None or (self._task.done() and not self.ready):
+            self._task = asyncio.ensure_future(self._run())
+        return self._task
+
+    async def wait(self) -> Any:
+        """
+        Wait for the warmup, starting it if needed.
+
+        Returns:
+            Any: The CopilotKit remote endpoint
+
+        Raises:
+            RuntimeError: If the warmup failed
+        """
+        if self.sdk is None:
+            # shielded so a cancelled request does not cancel the warmup other requests wait on
+            await asyncio.shield(self.start())
+            if self.sdk is None:
+                raise RuntimeError(f"Warmup failed: {self.error}")
+        return self.sdk
+
+    async def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.sdk = await asyncio.to_thread(_build_sdk)
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Warmup failed: {str(e)}", exc_info=True)
+            return
+        self.seconds = time.perf_counter() - start
+        self.error = None
+        logger.info(f"Warmup finished in {self.seconds:.2f}s")
+
+
+def add_copilotkit_endpoint(app: FastAPI, warmup: Warmup, prefix: str = "/copilotkit") -> None:
+    """
+    Serve CopilotKit under a prefix, waiting for the warmup on the first requests.
+
+    Registers the same catch-all route as copilotkit's add_fastapi_endpoint,
+    without importing copilotkit until the warmup does.
+
+    Args:
+        app (FastAPI): The application
+        warmup (Warmup): The worker's warmup, which owns the CopilotKit endpoint
+        prefix (str): The route prefix
+    """
+
+    async def handle(request: Request):
+        sdk = await warmup.wait()
+        from copilotkit.integrations.fastapi import handler
+
+        return await handler(request, sdk)
+
+    app.add_api_route(f"/{prefix.strip('/')}/{{path:path}}", handle, methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
@@ -1,3 +1,4 @@
+from .digest import BlogPostDigest, digest_blog_post, digest_search_results
 from .state import AgentState
 
-__all__ = ["AgentState"]
+__all__ = ["AgentState", "BlogPostDigest", "digest_blog_post", "digest_search_results"]
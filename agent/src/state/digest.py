@@ -0,0 +1,64 @@
+import hashlib
+import re
+from functools import lru_cache
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.schema.schema import BlogPost, SearchResults
+
+HEADING_PATTERN = re.compile(r"^#{1,3}\s+(.+?)\s*#*\s*$", re.MULTILINE)
+
+
+class BlogPostDigest(BaseModel):
+    title: Optional[str] = Field(None, description="The title of the blog post")
+    headings: List[str] = Field(default_factory=list, description="The markdown section headings")
+    word_count: int = Field(0, description="The number of words in the content")
+    content_hash: str = Field("", description="Short hash identifying this version of the content")
+
+
+@lru_cache(maxsize=256)
+def _digest_blog_post(title: Optional[str], content: Optional[str]) -> BlogPostDigest:
+    content = content or ""
+    return BlogPostDigest(
+        title=title,
+        headings=HEADING_PATTERN.findall(content),
+        word_count=len(content.split()),
+        content_hash=hashlib.sha256(content.encode("utf-8")).hexdigest()[:12],
+    )
+
+
+def digest_blog_post(blog_post: Optional[BlogPost]) -> Optional[BlogPostDigest]:
+    """
+    Summarize a blog post as its title, headings, word count and content hash.
+
+    Digests are memoized on the post's title and content, so they are only
+    recomputed when the blog post changes.
+    """
+    if not blog_post or not (blog_post.title or blog_post.content):
+        return None
+    return _digest_blog_post(blog_post.title, blog_post.content)
+
+
+def digest_search_results(search_results: Optional[SearchResults]) -> List[str]:
+    """Return the questions that were searched, without the summarized results."""
+    if not search_results or not search_results.search_results:
+        return []
+    return [result.question or "" for result in search_results.search_results]
+
+
+def format_blog_post_digest(blog_post: Optional[BlogPost]) -> str:
+    """Render the blog post digest for a prompt."""
+    digest = digest_blog_post(blog_post)
+    if digest is None:
+        return "No blog post generated yet"
+    headings = "\n".join(f"- {heading}" for heading in digest.headings) or "- (no headings)"
+    return f"Title: {digest.title}\nWord count: {digest.word_count}\nVersion: {digest.content_hash}\nSections:\n{headings}"
+
+
+def format_search_results_digest(search_results: Optional[SearchResults]) -> str:
+    """Render the searched questions for a prompt."""
+    questions = digest_search_results(search_results)
+    if not questions:
+        return "No search results yet"
+    return f"{len(questions)} search results for the questions:\n" + "\n".join(f"- {question}" for question in questions)
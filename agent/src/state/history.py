@@ -0,0 +1,120 @@
+import os
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, SystemMessage, ToolMessage
+
+from src.prompts import HISTORY_SUMMARY_PROMPT
+from src.schema.nodes import BLOG_OUTLINE, BLOG_SECTION, CHAT, FEEDBACK, GENERATE_BLOG, GENERATE_QUESTIONS, HISTORY_SUMMARY, ROUTER
+from src.state.state import AgentState
+from src.utils.logger import get_logger
+from src.utils.models import get_model
+from src.utils.tokens import count_message_tokens, count_tokens
+
+logger = get_logger(__name__)
+
+# Constants for conversation history management
+HISTORY_KEEP_RECENT = int(os.getenv("HISTORY_KEEP_RECENT", "10"))
+HISTORY_SUMMARY_BATCH = int(os.getenv("HISTORY_SUMMARY_BATCH", "6"))
+DEFAULT_HISTORY_BUDGET = int(os.getenv("DEFAULT_HISTORY_BUDGET", "3000"))
+
+
+def _budget(node: str, default: int) -> int:
+    return int(os.getenv(f"{node.upper()}_HISTORY_BUDGET", str(default)))
+
+
+# Token budget for the conversation history each node sends to the model
+NODE_HISTORY_BUDGETS: Dict[str, int] = {
+    ROUTER: _budget(ROUTER, 1500),
+    GENERATE_QUESTIONS: _budget(GENERATE_QUESTIONS, 1500),
+    GENERATE_BLOG: _budget(GENERATE_BLOG, 3000),
+    BLOG_OUTLINE: _budget(BLOG_OUTLINE, 1500),
+    BLOG_SECTION: _budget(BLOG_SECTION, 500),
+    FEEDBACK: _budget(FEEDBACK, 4000),
+    CHAT: _budget(CHAT, 3000),
+}
+
+
+def _window_start(messages: Sequence[BaseMessage], budget: int) -> int:
+    """
+    Index of the oldest message in the most recent window that fits in the budget.
+
+    The latest message always fits. The window never starts with a tool
+    result, which is only valid after the AI message that called the tool:
+    leading tool results are dropped, or, if nothing else would be left, the
+    window reaches back to the call.
+    """
+    start, used = len(messages), 0
+    while start > 0:
+        tokens = count_message_tokens([messages[start - 1]])
+        if start < len(messages) and used + tokens > budget:
+            break
+        used += tokens
+        start -= 1
+
+    while start < len(messages) - 1 and isinstance(messages[start], ToolMessage):
+        start += 1
+    while start > 0 and isinstance(messages[start], ToolMessage):
+        start -= 1
+    return start
+
+
+def select_history(state: AgentState, node: str) -> List[BaseMessage]:
+    """
+    Select the most recent messages that fit in the node's token budget.
+
+    The latest message is always included. When older messages are left out
+    and a rolling summary exists, it is prepended as a system message.
+    """
+    start = _window_start(state.messages, NODE_HISTORY_BUDGETS.get(node, DEFAULT_HISTORY_BUDGET))
+    window: List[BaseMessage] = list(state.messages[start:])
+    if state.history_summary and start > 0:
+        window.insert(0, SystemMessage(content=f"Summary of the earlier conversation:\n{state.history_summary}"))
+    return window
+
+
+def log_prompt_tokens(node: str, messages: List[BaseMessage]) -> int:
+    """Log and return the prompt tokens a node is about to send."""
+    tokens = count_message_tokens(messages)
+    logger.info(f"{node} prompt tokens: {tokens}")
+    return tokens
+
+
+def _messages_to_summarize(state: AgentState) -> List[BaseMessage]:
+    """
+    Messages not yet in the rolling summary that some node's window drops.
+
+    That is every message before the window of the tightest node budget, and
+    every message older than the HISTORY_KEEP_RECENT most recent. Those the
+    tightest window drops are due at once, since a node is already missing
+    them; the rest wait until HISTORY_SUMMARY_BATCH of them have gathered.
+    """
+    messages = state.messages
+    window_start = _window_start(messages, min(NODE_HISTORY_BUDGETS.values()))
+    start, end = 0, max(window_start, len(messages) - HISTORY_KEEP_RECENT, 0)
+    if state.history_summary_until:
+        ids = [message.id for message in messages[:end]]
+        if state.history_summary_until in ids:
+            start = ids.index(state.history_summary_until) + 1
+    if start >= window_start and end - start < HISTORY_SUMMARY_BATCH:
+        return []
+    return messages[start:end]
+
+
+async def update_history_summary(state: AgentState) -> Optional[AgentState]:
+    """
+    Fold messages that node windows drop into the rolling summary.
+
+    The summary is extended incrementally from the previous one and stored in
+    state, so each message is summarized once. Returns the state update, or
+    None if nothing is due yet.
+    """
+    pending = _messages_to_summarize(state)
+    if not pending:
+        return None
+
+    logger.info(f"Summarizing {len(pending)} older messages into the history summary")
+    transcript = "\n".join(f"{message.type}: {message.content}" for message in pending)
+    messages = HISTORY_SUMMARY_PROMPT.messages(summary=state.history_summary or "None", transcript=transcript)
+    response = await get_model(HISTORY_SUMMARY).ainvoke(messages)
+    logger.info(f"History summary updated ({count_tokens(response.content)} tokens)")
+    return {"history_summary": response.content, "history_summary_until": pending[-1].id}
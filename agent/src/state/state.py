@@ -10,7 +10,13 @@ from src.schema.schema import BlogPost, SearchResults
 
 
 def add_messages(left: Messages, right: Messages) -> Messages:
-    """Wraps langchain's add_messages to add custom logic"""
+    """
+    Wraps langchain's add_messages to timestamp new messages.
+
+    The full history stays in state: clients re-send it every turn and it is
+    merged by message id, so a trimmed message would come back as a new one.
+    Nodes window it with select_history when building prompts.
+    """
     for message in right:
         if hasattr(message, 'additional_kwargs'):
             message.additional_kwargs["created_at"] = datetime.now().isoformat()
@@ -24,3 +30,7 @@ class AgentState(BaseModel):
     blog_post: BlogPost = Field(default_factory=BlogPost)
     route: Optional[str] = Field(default=None)
     search_results: SearchResults = Field(default_factory=lambda: SearchResults(search_results=[]))
+    history_summary: Optional[str] = Field(default=None)
+    history_summary_until: Optional[str] = Field(default=None)
+    # "single" or "sectioned" blog generation for this thread; None uses BLOG_GENERATION_MODE
+    generation_mode: Optional[str] = Field(default=None)
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+
+from src.utils.logger import get_logger
+from src.utils.models import get_embeddings
+
+logger = get_logger(__name__)
+
+# Constants for question embeddings. QUESTION_EMBEDDER is one of: hashing, openai, none
+QUESTION_EMBEDDER = os.getenv("QUESTION_EMBEDDER", "hashing").lower()
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+HASHING_EMBEDDING_DIM = int(os.getenv("HASHING_EMBEDDING_DIM", "1024"))
+
+# dotted versions such as 3.12 stay one token
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:\.[0-9]+)*")
+STOPWORDS = frozenset(
+    "a about an and are as at be by can current currently do does for from how i in is it its latest of on or recent should "
+    "that the their there these this to today was what when where which who why will with year years".split()
+)
+# Weight of a hashed feature by kind: n a number or version, w a content word, c a character trigram
+FEATURE_WEIGHTS = {"n": 1.5, "w": 1.0, "c": 0.35}
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length so dot products are cosine similarities; zero rows stay zero."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class Embedder(ABC):
+    """Turns texts into unit-length vectors whose dot product measures how similar they are."""
+
+    # Identifies the vector space; vectors from embedders with different names are not comparable
+    name: str = "embedder"
+    # Cosine similarity above which two questions are treated as asking the same thing
+    similarity_threshold: float = 0.9
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Return a float32 matrix with one unit-length row per text."""
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "es", "s"):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def _features(text: str) -> List[str]:
+    # the current year says no more than "latest", which is a stopword too
+    ignored = STOPWORDS | {str(time.localtime().tm_year)}
+    words = [_stem(word) for word in TOKEN_PATTERN.findall(text.lower()) if word not in ignored]
+    # a version or year has no inflections; 3.12 and 3.13 must not share trigrams
+    features = [f"n:{word}" if any(char.isdigit() for char in word) else f"w:{word}" for word in words]
+    features += [f"c:{gram}" for word in words if not any(char.isdigit() for char in word) for gram in (f"<{word}>"[i : i + 3] for i in range(len(word)))]
+    return features
+
+
+class HashingEmbedder(Embedder):
+    """
+    Local embedder hashing content words and their character trigrams into a fixed-size vector.
+
+    It needs no model or network call, costs microseconds per question and
+    catches rewordings that share vocabulary ("latest AI trends" and "what
+    are the trends in AI?"). Numbers weigh more than words, so questions
+    about different versions or years stay apart. It does not know
+    synonyms; use the OpenAI embedder for that.
+
+    The threshold is tuned on benchmarks/fixtures/question_pairs.jsonl:
+    must-not-merge pairs score up to about 0.74 and duplicates from about
+    0.82, apart from rewordings that add a content word.
+    """
+
+    name = "hashing-v2"
+    similarity_threshold = 0.78
+
+    def __init__(self, dim: int = HASHING_EMBEDDING_DIM):
+        self.dim = dim
+
+    def embed_sync(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in _features(text):
+                digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                # a shared word counts for more than a shared trigram; trigrams catch inflections and typos
+                weight = FEATURE_WEIGHTS[feature[0]]
+                matrix[row, digest % self.dim] += weight if digest >> 63 else -weight
+        return normalize_rows(matrix)
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        return self.embed_sync(texts)
+
+
+class OpenAIEmbedder(Embedder):
+    """Embeds through the OpenAI embeddings API on the shared LLM connection pool."""
+
+    similarity_threshold = 0.85
+
+    def __init__(self, model: str = EMBEDDING_MODEL):
+        self.model = model
+        self.name = f"openai:{model}"
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = await get_embeddings(self.model).aembed_documents(texts)
+        return normalize_rows(np.array(vectors, dtype=np.float32))
+
+
+def create_embedder(name: str = QUESTION_EMBEDDER) -> Optional[Embedder]:
+    """Create an embedder by name: hashing, openai, or none to disable embedding."""
+    if name == "none":
+        return None
+    if name == "hashing":
+        return HashingEmbedder()
+    if name == "openai":
+        return OpenAIEmbedder()
+    raise ValueError(f"Unknown question embedder: {name}")
+
+
+_embedder: Optional[Embedder] = None
+_configured = False
+
+
+def configure_embedder(embedder: Optional[Embedder]) -> None:
+    """Replace the process-wide embedder, e.g. with a local model; None disables embedding."""
+    global _embedder, _configured
+    _embedder = embedder
+    _configured = True
+
+
+def get_embedder() -> Optional[Embedder]:
+    """Get the process-wide embedder, creating it from QUESTION_EMBEDDER on first use."""
+    global _embedder, _configured
+    if not _configured:
+        _embedder = create_embedder()
+        _configured = True
+    return _embedder
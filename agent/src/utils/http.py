@@ -0,0 +1,86 @@
+import os
+from typing import Optional
+
+import httpx
+
+from src.utils.logger import get_logger
+from src.utils.metrics import InstrumentedTransport
+from src.utils.ratelimit import RateLimitedTransport
+from src.utils.replay import create_replay_transport
+from src.utils.resilience import ResilientTransport
+
+logger = get_logger(__name__)
+
+# Constants for the shared HTTP client configuration
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "10"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+
+_client: Optional[httpx.AsyncClient] = None
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def create_transport(limits: httpx.Limits, transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncBaseTransport:
+    """
+    Build the resilient, rate limited, instrumented transport for an outbound client.
+
+    httpx ignores a client's ``limits`` once a transport is passed, so the
+    default network transport is created here with the pool limits applied.
+    Requests are retried and circuit broken per upstream, and each attempt
+    waits for the upstream's shared rate limit before being sent and timed,
+    so HTTP latency metrics exclude time spent throttled.
+
+    Args:
+        limits (httpx.Limits): Connection pool limits for the network transport
+        transport (Optional[httpx.AsyncBaseTransport]): Transport to wrap, or None for the HTTP_REPLAY_MODE default
+
+    Returns:
+        httpx.AsyncBaseTransport: Resilient, rate limited transport that records request metrics
+    """
+    inner = transport or create_replay_transport() or httpx.AsyncHTTPTransport(limits=limits)
+    return ResilientTransport(RateLimitedTransport(InstrumentedTransport(inner)))
+
+
+async def configure_http_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+    """
+    Set the transport used by the shared client, closing the current client.
+
+    Passing an ``httpx.MockTransport`` lets search code run fully offline.
+    The next call to get_http_client builds a new client with the transport.
+
+    Args:
+        transport (Optional[httpx.AsyncBaseTransport]): Transport to use, or None for the HTTP_REPLAY_MODE default
+    """
+    global _transport
+    await close_http_client()
+    _transport = transport
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide async HTTP client.
+
+    The client is created lazily and reused so that outbound requests share a
+    keep-alive connection pool instead of opening a new connection per call.
+
+    Returns:
+        httpx.AsyncClient: Shared async HTTP client
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        logger.info("Creating shared async HTTP client")
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        )
+        _client = httpx.AsyncClient(transport=create_transport(limits, _transport), timeout=HTTP_TIMEOUT, limits=limits)
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared async HTTP client, if one was created."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        logger.info("Closed shared async HTTP client")
+    _client = None
@@ -0,0 +1,58 @@
+import time
+from typing import Any, Dict, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from src.utils.metrics import LLM_COST, LLM_IN_FLIGHT, LLM_LATENCY, LLM_TOKENS, PROMPT_CACHE_RATIO, estimate_cost
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """Callback handler attached to each shared chat model to record call latency, tokens and cost."""
+
+    run_inline = True
+
+    def __init__(self, node: str, model: str):
+        self.node = node
+        self.model = model
+        self._starts: Dict[UUID, float] = {}
+        self._in_flight = LLM_IN_FLIGHT.labels(node=node)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._starts[run_id] = time.perf_counter()
+        self._in_flight.inc()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "ok")
+        prompt_tokens, completion_tokens, cached_tokens = _token_usage(response)
+        if prompt_tokens or completion_tokens:
+            LLM_TOKENS.labels(node=self.node, model=self.model, kind="prompt").observe(prompt_tokens)
+            LLM_TOKENS.labels(node=self.node, model=self.model, kind="completion").observe(completion_tokens)
+            LLM_TOKENS.labels(node=self.node, model=self.model, kind="cached").observe(cached_tokens)
+            if prompt_tokens:
+                PROMPT_CACHE_RATIO.labels(node=self.node).observe(cached_tokens / prompt_tokens)
+            LLM_COST.labels(node=self.node, model=self.model).inc(estimate_cost(self.model, prompt_tokens, completion_tokens, cached_tokens))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "error")
+
+    def _finish(self, run_id: UUID, status: str) -> None:
+        start = self._starts.pop(run_id, None)
+        if start is None:
+            return
+        self._in_flight.dec()
+        LLM_LATENCY.labels(node=self.node, model=self.model, status=status).observe(time.perf_counter() - start)
+
+
+def _token_usage(response: LLMResult) -> Tuple[int, int, int]:
+    """Read (prompt, completion, cached prompt) token counts from a result's usage metadata or llm_output."""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                cached = (usage.get("input_token_details") or {}).get("cache_read") or 0
+                return usage.get("input_tokens", 0), usage.get("output_tokens", 0), cached
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    cached = (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+    return token_usage.get("prompt_tokens", 0), token_usage.get("completion_tokens", 0), cached
@@ -0,0 +1,194 @@
+import functools
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar
+
+import httpx
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Constants for the metrics surface
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "blog_agent")
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80, 160)
+WAIT_BUCKETS = (0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+# USD per 1M (prompt, completion) tokens, used for the cost counter
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+}
+# USD per 1M prompt tokens served from the provider's prompt cache
+CACHED_PROMPT_PRICES: Dict[str, float] = {
+    "gpt-4o": 1.25,
+    "gpt-4o-mini": 0.075,
+    "gpt-4.1": 0.50,
+    "gpt-4.1-mini": 0.10,
+}
+RATIO_BUCKETS = (0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0)
+
+# Multi-worker serving shares metric values through files in this directory
+if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+# Labels only ever take values from fixed sets (node names, configured models,
+# known upstreams, status classes) so series cardinality stays bounded.
+NODE_LATENCY = Histogram(
+    "node_duration_seconds", "Graph node execution time", ["node", "status"], namespace=METRICS_NAMESPACE, buckets=LATENCY_BUCKETS
+)
+NODE_IN_FLIGHT = Gauge("node_in_flight", "Graph node executions currently running", ["node"], namespace=METRICS_NAMESPACE, multiprocess_mode="livesum")
+LLM_LATENCY = Histogram(
+    "llm_duration_seconds", "Chat model call time, including streaming", ["node", "model", "status"], namespace=METRICS_NAMESPACE, buckets=LATENCY_BUCKETS
+)
+LLM_IN_FLIGHT = Gauge("llm_in_flight", "Chat model calls currently running", ["node"], namespace=METRICS_NAMESPACE, multiprocess_mode="livesum")
+LLM_TOKENS = Histogram(
+    "llm_tokens", "Tokens per chat model call: prompt, completion, and the cached part of the prompt", ["node", "model", "kind"], namespace=METRICS_NAMESPACE, buckets=TOKEN_BUCKETS
+)
+PROMPT_CACHE_RATIO = Histogram(
+    "llm_prompt_cache_ratio", "Fraction of each call's prompt tokens served from the provider's prompt cache", ["node"], namespace=METRICS_NAMESPACE, buckets=RATIO_BUCKETS
+)
+LLM_COST = Counter("llm_cost_usd", "Estimated chat model spend in USD", ["node", "model"], namespace=METRICS_NAMESPACE)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Outbound HTTP time to response headers", ["upstream", "status"], namespace=METRICS_NAMESPACE, buckets=LATENCY_BUCKETS
+)
+HTTP_IN_FLIGHT = Gauge("http_in_flight", "Outbound HTTP requests currently running", ["upstream"], namespace=METRICS_NAMESPACE, multiprocess_mode="livesum")
+HTTP_RETRIES = Counter("http_retries", "Outbound HTTP requests retried, by reason", ["upstream", "reason"], namespace=METRICS_NAMESPACE)
+CIRCUIT_STATE = Gauge(
+    "circuit_state", "Circuit breaker state per upstream: 0 closed, 1 half open, 2 open", ["upstream"], namespace=METRICS_NAMESPACE, multiprocess_mode="livemax"
+)
+CIRCUIT_REJECTED = Counter("circuit_rejected", "Outbound calls failed fast by an open circuit", ["upstream"], namespace=METRICS_NAMESPACE)
+DEADLINE_EXCEEDED = Counter("deadline_exceeded", "Outbound calls cut off by the turn latency budget", ["upstream"], namespace=METRICS_NAMESPACE)
+HEDGED_REQUESTS = Counter("hedged_requests", "Hedged duplicate requests launched, and those that won", ["upstream", "outcome"], namespace=METRICS_NAMESPACE)
+RATE_LIMIT_WAIT = Histogram(
+    "rate_limit_wait_seconds", "Time outbound requests waited for a rate limit token", ["upstream"], namespace=METRICS_NAMESPACE, buckets=WAIT_BUCKETS
+)
+ADMISSION_QUEUE_DEPTH = Gauge("admission_queue_depth", "Graph runs waiting for admission", namespace=METRICS_NAMESPACE, multiprocess_mode="livesum")
+ADMISSION_ACTIVE = Gauge("admission_active_runs", "Graph runs admitted and running", namespace=METRICS_NAMESPACE, multiprocess_mode="livesum")
+ADMISSION_WAIT = Histogram("admission_wait_seconds", "Time graph runs waited for admission", namespace=METRICS_NAMESPACE, buckets=WAIT_BUCKETS)
+ADMISSION_REJECTED = Counter("admission_rejected", "Graph runs rejected by admission control", ["reason"], namespace=METRICS_NAMESPACE)
+EVENT_LOOP_LAG = Histogram("event_loop_lag_seconds", "How late the health monitor's periodic event loop wakeups ran", namespace=METRICS_NAMESPACE, buckets=WAIT_BUCKETS)
+NOT_READY = Counter("readiness_failures", "Readiness checks answered not ready, by reason", ["reason"], namespace=METRICS_NAMESPACE)
+COALESCED_CALLS = Counter("coalesced_calls", "Calls that joined an identical call already in flight", ["call"], namespace=METRICS_NAMESPACE)
+SEARCH_PAYLOAD_TOKENS = Histogram(
+    "search_payload_tokens", "Tokens of a search payload as returned (raw) and as sent to the summarizer (compact)", ["stage"], buckets=TOKEN_BUCKETS, namespace=METRICS_NAMESPACE
+)
+QUESTION_DEDUP = Counter("question_dedup", "Search questions by dedup outcome: searched, merged into a near-duplicate, or answered by an earlier answer", ["outcome"], namespace=METRICS_NAMESPACE)
+FEEDBACK_EDITS = Counter("feedback_edits", "Feedback turns by outcome: patched in place, rewritten on request, or rewritten after edits failed to apply", ["outcome"], namespace=METRICS_NAMESPACE)
+SPECULATIONS = Counter("speculations", "Speculative searches on new-topic turns by outcome: committed, cancelled or failed", ["outcome"], namespace=METRICS_NAMESPACE)
+SPECULATION_SAVED = Histogram(
+    "speculation_saved_seconds", "Head start of a committed speculative search over search_web", namespace=METRICS_NAMESPACE, buckets=LATENCY_BUCKETS
+)
+CACHE_LOOKUPS = Counter("cache_lookups", "Cache lookups by outcome", ["cache", "result"], namespace=METRICS_NAMESPACE)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+
+def instrument_node(name: str, func: F) -> F:
+    """
+    Wrap an async graph node so every run records its latency and concurrency.
+
+    functools.wraps keeps the original signature visible, so LangGraph still
+    passes ``config`` to nodes that accept it.
+
+    Args:
+        name (str): The node name used as the metric label
+        func (F): The async node function
+
+    Returns:
+        F: The instrumented node
+    """
+    latency_ok = NODE_LATENCY.labels(node=name, status="ok")
+    latency_error = NODE_LATENCY.labels(node=name, status="error")
+    in_flight = NODE_IN_FLIGHT.labels(node=name)
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        in_flight.inc()
+        try:
+            result = await func(*args, **kwargs)
+        except BaseException:
+            latency_error.observe(time.perf_counter() - start)
+            raise
+        finally:
+            in_flight.dec()
+        latency_ok.observe(time.perf_counter() - start)
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """Estimate the USD cost of a call from MODEL_PRICES, with cached prompt tokens at CACHED_PROMPT_PRICES, or 0 for unknown models."""
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return 0.0
+    cached_price = CACHED_PROMPT_PRICES.get(model, prices[0])
+    return ((prompt_tokens - cached_tokens) * prices[0] + cached_tokens * cached_price + completion_tokens * prices[1]) / 1_000_000
+
+
+def upstream_label(host: str) -> str:
+    """Map a request host to one of a fixed set of upstream labels."""
+    if "openai" in host:
+        return "openai"
+    if "ydc-index" in host or "you.com" in host:
+        return "ydc"
+    return "other"
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper recording latency and concurrency of outbound requests."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        upstream = upstream_label(request.url.host)
+        in_flight = HTTP_IN_FLIGHT.labels(upstream=upstream)
+        start = time.perf_counter()
+        in_flight.inc()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            HTTP_LATENCY.labels(upstream=upstream, status="error").observe(time.perf_counter() - start)
+            raise
+        finally:
+            in_flight.dec()
+        HTTP_LATENCY.labels(upstream=upstream, status=f"{response.status_code // 100}xx").observe(time.perf_counter() - start)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache lookup for the named cache."""
+    CACHE_LOOKUPS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    With PROMETHEUS_MULTIPROC_DIR set (multi-worker serving), the values
+    written by every worker are aggregated so any worker can answer a scrape.
+
+    Returns:
+        Tuple[bytes, str]: The payload and its content type
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_worker_exited() -> None:
+    """Drop this worker's live gauges from the multi-process metrics directory."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(os.getpid())
@@ -0,0 +1,178 @@
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple, Type
+
+import httpx
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from pydantic import BaseModel, Field
+
+from src.schema.nodes import BLOG_OUTLINE, BLOG_SECTION, BLOG_TRANSITIONS, CHAT, FEEDBACK, GENERATE_BLOG, GENERATE_QUESTIONS, HISTORY_SUMMARY, ROUTER, WEB_SEARCH
+from src.utils.http import create_transport
+from src.utils.llm_metrics import LLMMetricsHandler
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Constants for the LLM connection pool
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+DEFAULT_MODEL = os.getenv("DEFAULT_MODEL", "gpt-4o")
+
+
+class ModelConfig(BaseModel):
+    model: str = Field(default=DEFAULT_MODEL, description="The OpenAI model name")
+    temperature: Optional[float] = Field(default=None, description="Sampling temperature, None for the provider default")
+    timeout: Optional[float] = Field(default=None, description="Request timeout in seconds")
+    max_retries: int = Field(default=0, description="Retries performed by the OpenAI client; the shared ResilientTransport retries by default")
+
+
+def _config_from_env(name: str, **defaults: Any) -> ModelConfig:
+    """Build a node's ModelConfig, letting <NAME>_MODEL, <NAME>_TEMPERATURE and <NAME>_TIMEOUT override defaults."""
+    prefix = name.upper()
+    config = ModelConfig(**defaults)
+    if os.getenv(f"{prefix}_MODEL"):
+        config.model = os.environ[f"{prefix}_MODEL"]
+    if os.getenv(f"{prefix}_TEMPERATURE"):
+        config.temperature = float(os.environ[f"{prefix}_TEMPERATURE"])
+    if os.getenv(f"{prefix}_TIMEOUT"):
+        config.timeout = float(os.environ[f"{prefix}_TIMEOUT"])
+    return config
+
+
+NODE_MODEL_CONFIGS: Dict[str, ModelConfig] = {
+    ROUTER: _config_from_env(ROUTER, timeout=30),
+    GENERATE_QUESTIONS: _config_from_env(GENERATE_QUESTIONS, timeout=60),
+    WEB_SEARCH: _config_from_env(WEB_SEARCH, timeout=60),
+    GENERATE_BLOG: _config_from_env(GENERATE_BLOG, timeout=180),
+    BLOG_OUTLINE: _config_from_env(BLOG_OUTLINE, timeout=60),
+    BLOG_SECTION: _config_from_env(BLOG_SECTION, timeout=90),
+    BLOG_TRANSITIONS: _config_from_env(BLOG_TRANSITIONS, model="gpt-4o-mini", timeout=30),
+    FEEDBACK: _config_from_env(FEEDBACK, timeout=180),
+    CHAT: _config_from_env(CHAT, timeout=60),
+    HISTORY_SUMMARY: _config_from_env(HISTORY_SUMMARY, model="gpt-4o-mini", temperature=0, timeout=30),
+}
+
+_lock = threading.Lock()
+_transport: Optional[httpx.AsyncBaseTransport] = None
+_http_async_client: Optional[httpx.AsyncClient] = None
+_models: Dict[str, ChatOpenAI] = {}
+_structured_models: Dict[Tuple[str, Type[BaseModel]], Runnable] = {}
+_embeddings: Dict[str, OpenAIEmbeddings] = {}
+
+
+def _get_http_async_client() -> httpx.AsyncClient:
+    global _http_async_client
+    if _http_async_client is None:
+        limits = httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        )
+        _http_async_client = httpx.AsyncClient(transport=create_transport(limits, _transport), limits=limits)
+    return _http_async_client
+
+
+async def configure_models(transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+    """
+    Set the transport under the models' connection pool, closing the current pool and dropping the cached models.
+
+    Passing an in-process transport, e.g. ``httpx.ASGITransport`` over a
+    stand-in server, lets model calls run offline through the full retry,
+    rate limit and metrics stack.
+
+    Args:
+        transport (Optional[httpx.AsyncBaseTransport]): Transport to use, or None for the HTTP_REPLAY_MODE default
+    """
+    global _transport
+    await close_models()
+    _transport = transport
+
+
+def get_model(name: str) -> ChatOpenAI:
+    """
+    Get the shared chat model for a node.
+
+    Models are created once per node from NODE_MODEL_CONFIGS and all share one
+    keep-alive connection pool. Each model reports call latency, tokens and
+    cost to the metrics registry through an LLMMetricsHandler.
+
+    Args:
+        name (str): The node name, one of the keys of NODE_MODEL_CONFIGS
+
+    Returns:
+        ChatOpenAI: The configured chat model
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _lock:
+        if name not in _models:
+            config = NODE_MODEL_CONFIGS.get(name, ModelConfig())
+            logger.info(f"Creating chat model for {name}: {config.model_dump()}")
+            _models[name] = ChatOpenAI(
+                model=config.model,
+                temperature=config.temperature,
+                timeout=config.timeout,
+                max_retries=config.max_retries,
+                stream_usage=True,
+                http_async_client=_get_http_async_client(),
+                callbacks=[LLMMetricsHandler(name, config.model)],
+            )
+        return _models[name]
+
+
+def get_structured_model(name: str, schema: Type[BaseModel]) -> Runnable:
+    """
+    Get the node's shared chat model pre-bound to a structured output schema.
+
+    Args:
+        name (str): The node name, one of the keys of NODE_MODEL_CONFIGS
+        schema (Type[BaseModel]): The output schema, e.g. AssessIntent or BlogPost
+
+    Returns:
+        Runnable: The model wrapped with with_structured_output(schema)
+    """
+    key = (name, schema)
+    model = _structured_models.get(key)
+    if model is not None:
+        return model
+
+    model = get_model(name).with_structured_output(schema)
+    with _lock:
+        return _structured_models.setdefault(key, model)
+
+
+def get_embeddings(model: str) -> OpenAIEmbeddings:
+    """
+    Get the shared OpenAI embeddings client for a model, on the models' connection pool.
+
+    Args:
+        model (str): The embedding model name, e.g. text-embedding-3-small
+
+    Returns:
+        OpenAIEmbeddings: The embeddings client
+    """
+    embeddings = _embeddings.get(model)
+    if embeddings is not None:
+        return embeddings
+
+    with _lock:
+        if model not in _embeddings:
+            # send the texts as strings; token-level chunking needs tiktoken downloads and our inputs are short
+            _embeddings[model] = OpenAIEmbeddings(model=model, max_retries=0, check_embedding_ctx_length=False, http_async_client=_get_http_async_client())
+        return _embeddings[model]
+
+
+async def close_models() -> None:
+    """Drop the shared models and close their connection pool."""
+    global _http_async_client
+    with _lock:
+        _models.clear()
+        _structured_models.clear()
+        _embeddings.clear()
+        client, _http_async_client = _http_async_client, None
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,153 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from src.utils.logger import get_logger
+from src.utils.metrics import RATE_LIMIT_WAIT, upstream_label
+
+logger = get_logger(__name__)
+
+# Constants for the outbound rate limits, in requests per second for the whole server. 0 disables a limit.
+# Each worker enforces its share, the limit divided by WEB_CONCURRENCY, so the workers together stay within it
+LLM_RATE_LIMIT = float(os.getenv("LLM_RATE_LIMIT", "8"))
+LLM_RATE_BURST = int(os.getenv("LLM_RATE_BURST", "16"))
+SEARCH_RATE_LIMIT = float(os.getenv("SEARCH_RATE_LIMIT", "5"))
+SEARCH_RATE_BURST = int(os.getenv("SEARCH_RATE_BURST", "10"))
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "30"))
+RATE_LIMIT_WORKERS = max(int(os.getenv("WEB_CONCURRENCY", "1")), 1)
+UPSTREAM_RATE_LIMITS: Dict[str, Tuple[float, int]] = {
+    "openai": (LLM_RATE_LIMIT, LLM_RATE_BURST),
+    "ydc": (SEARCH_RATE_LIMIT, SEARCH_RATE_BURST),
+}
+
+
+class RateLimitExceeded(httpx.TransportError):
+    """Raised without calling the upstream when a request would wait longer than the limiter's max_wait for a token."""
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second, holding at most ``burst``.
+
+    acquire() reserves a token up front and sleeps for its share of the
+    deficit, so concurrent callers are released in arrival order at the
+    configured rate without polling. The deficit is capped at ``max_wait``
+    seconds of refill: a caller that would wait longer fails at once with
+    RateLimitExceeded, and a caller cancelled while waiting gives its token
+    back.
+    """
+
+    def __init__(self, rate: float, burst: int, max_wait: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def reserve(self) -> Optional[float]:
+        """
+        Take a token, possibly going into debt, and return how long to wait before using it.
+
+        Returns:
+            Optional[float]: Seconds to wait, or None without taking a token if that would exceed max_wait
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.max_wait is not None and (1 - self._tokens) / self.rate > self.max_wait:
+                return None
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def refund(self) -> None:
+        """Give back a token reserved but never used."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.burst, self._tokens + 1)
+
+    async def acquire(self) -> float:
+        """
+        Wait until a token is available.
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            RateLimitExceeded: If the wait would exceed max_wait
+        """
+        delay = self.reserve()
+        if delay is None:
+            raise RateLimitExceeded(f"Rate limit of {self.rate}/s would delay the request by more than {self.max_wait}s")
+        if delay > 0:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.refund()
+                raise
+        return delay
+
+
+_limiters: Dict[str, Optional[TokenBucket]] = {}
+_limiters_lock = threading.Lock()
+
+
+def configure_rate_limit(upstream: str, rate: float, burst: int, max_wait: Optional[float] = RATE_LIMIT_MAX_WAIT) -> None:
+    """
+    Replace this process's limiter for an upstream. A rate of 0 disables limiting.
+
+    Args:
+        upstream (str): The upstream label, e.g. openai or ydc
+        rate (float): Requests per second for this process
+        burst (int): Requests allowed at once after an idle period
+        max_wait (Optional[float]): Longest a request may wait for a token, None for no limit
+    """
+    with _limiters_lock:
+        _limiters[upstream] = TokenBucket(rate, burst, max_wait) if rate > 0 else None
+
+
+def get_rate_limiter(upstream: str) -> Optional[TokenBucket]:
+    """Get the process-wide limiter shared by every client calling an upstream, or None if unlimited."""
+    if upstream not in _limiters:
+        rate, burst = UPSTREAM_RATE_LIMITS.get(upstream, (0, 0))
+        # this worker's share of the server-wide limit
+        rate, burst = rate / RATE_LIMIT_WORKERS, max(burst // RATE_LIMIT_WORKERS, 1)
+        with _limiters_lock:
+            if upstream not in _limiters:
+                _limiters[upstream] = TokenBucket(rate, burst, RATE_LIMIT_MAX_WAIT) if rate > 0 else None
+                if rate > 0:
+                    logger.info(f"Rate limiting {upstream} requests to {rate:g}/s with burst {burst} in this worker, 1/{RATE_LIMIT_WORKERS} of the server-wide limit")
+    return _limiters[upstream]
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """Transport wrapper holding each request until its upstream's token bucket allows it."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        upstream = upstream_label(request.url.host)
+        limiter = get_rate_limiter(upstream)
+        if limiter is not None:
+            RATE_LIMIT_WAIT.labels(upstream=upstream).observe(await limiter.acquire())
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
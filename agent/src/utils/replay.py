@@ -0,0 +1,347 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from src.utils.logger import get_logger
+from src.utils.ratelimit import TokenBucket
+
+logger = get_logger(__name__)
+
+# Constants for HTTP record/replay. HTTP_REPLAY_MODE is one of: off, record, replay, stub
+HTTP_REPLAY_MODE = os.getenv("HTTP_REPLAY_MODE", "off").lower()
+HTTP_REPLAY_DIR = os.getenv("HTTP_REPLAY_DIR", "fixtures/http")
+HTTP_REPLAY_LATENCY_SCALE = float(os.getenv("HTTP_REPLAY_LATENCY_SCALE", "1.0"))
+STUB_LLM_LATENCY = float(os.getenv("STUB_LLM_LATENCY", "0.3"))
+STUB_TOKEN_DELAY = float(os.getenv("STUB_TOKEN_DELAY", "0.002"))
+STUB_SEARCH_LATENCY = float(os.getenv("STUB_SEARCH_LATENCY", "0.4"))
+STUB_CONTENT_WORDS = int(os.getenv("STUB_CONTENT_WORDS", "800"))
+# Items in stub arrays of objects or numbers, like the sections of an outline
+STUB_ARRAY_ITEMS = 6
+# Arrays that need another length to be usable, e.g. one edit, since several would collide on the same section
+STUB_ARRAY_LENGTHS = {"edits": 1}
+# Synthetic provider rate limits for the stub, in requests per second. 0 disables them.
+STUB_LLM_RATE_LIMIT = float(os.getenv("STUB_LLM_RATE_LIMIT", "0"))
+STUB_SEARCH_RATE_LIMIT = float(os.getenv("STUB_SEARCH_RATE_LIMIT", "0"))
+
+# Like real question lists, one stub question is a rewording of another
+STUB_QUESTIONS = [
+    "What is {subject} and why does it matter?",
+    "What are the latest developments in {subject}?",
+    "How is {subject} used in production today?",
+    "Latest developments in {subject}?",
+    "What are the main challenges and pitfalls of {subject}?",
+    "Which tools and frameworks support {subject}?",
+]
+
+# Like the provider, the stub caches prompt prefixes of at least 1024 tokens in steps of 128 tokens (at 4 characters per token)
+PROMPT_CACHE_MIN_CHARS = 1024 * 4
+PROMPT_CACHE_BLOCK_CHARS = 128 * 4
+PROMPT_CACHE_MAX_ENTRIES = 100000
+
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}(T[\d:.]+)?")
+STREAM_CHUNK_WORDS = 4
+
+
+def request_key(request: httpx.Request) -> str:
+    """Stable fixture key for a request: method, URL and JSON body, with dates masked."""
+    body = request.content.decode("utf-8", errors="replace")
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True)
+    except ValueError:
+        pass
+    url = request.url.copy_with(query=None) if request.url.host.endswith("openai.com") else request.url
+    material = DATE_PATTERN.sub("<date>", f"{request.method} {url} {body}")
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+class _DelayedStream(httpx.AsyncByteStream):
+    """Yields response chunks with a delay before each, to replay streaming latency."""
+
+    def __init__(self, chunks: List[bytes], delay: float):
+        self.chunks = chunks
+        self.delay = delay
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield chunk
+
+
+def _sse_chunks(body: bytes) -> List[bytes]:
+    return [event + b"\n\n" for event in body.split(b"\n\n") if event.strip()]
+
+
+class RecordReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Records real HTTP exchanges to fixture files, or replays them offline.
+
+    Each exchange is stored as one JSON file named by request_key, with the
+    status, headers, body, time to headers and total latency. Replay sleeps
+    for the recorded latency (scaled by HTTP_REPLAY_LATENCY_SCALE), spreading
+    server-sent event bodies over it so streaming behaves as recorded.
+    """
+
+    def __init__(self, mode: str, directory: str = HTTP_REPLAY_DIR, latency_scale: float = HTTP_REPLAY_LATENCY_SCALE):
+        self.mode = mode
+        self.directory = directory
+        self.latency_scale = latency_scale
+        self._transport = httpx.AsyncHTTPTransport() if mode == "record" else None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        if self.mode == "record":
+            return await self._record(key, request)
+        return await self._replay(key, request)
+
+    async def _record(self, key: str, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        time_to_headers = time.perf_counter() - start
+        body = b"".join([chunk async for chunk in response.stream])
+        latency = time.perf_counter() - start
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+
+        fixture = {
+            "request": {"method": request.method, "url": str(request.url)},
+            "status": response.status_code,
+            "headers": headers,
+            "body": body.decode("utf-8"),
+            "time_to_headers": time_to_headers,
+            "latency": latency,
+        }
+        with open(self._path(key), "w", encoding="utf-8") as f:
+            json.dump(fixture, f, indent=2)
+        logger.info(f"Recorded {request.method} {request.url.host} as fixture {key}")
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def _replay(self, key: str, request: httpx.Request) -> httpx.Response:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                fixture = json.load(f)
+        except FileNotFoundError as e:
+            raise httpx.ConnectError(f"No recorded fixture {key} for {request.method} {request.url}", request=request) from e
+
+        await asyncio.sleep(fixture["time_to_headers"] * self.latency_scale)
+        body = fixture["body"].encode("utf-8")
+        remaining = max(fixture["latency"] - fixture["time_to_headers"], 0) * self.latency_scale
+        if "text/event-stream" in fixture["headers"].get("content-type", ""):
+            chunks = _sse_chunks(body)
+            stream = _DelayedStream(chunks, remaining / max(len(chunks), 1))
+        else:
+            stream = _DelayedStream([body], remaining)
+        return httpx.Response(fixture["status"], headers=fixture["headers"], stream=stream, request=request)
+
+
+def _stub_text(words: int, markdown: bool = True) -> str:
+    vocabulary = ["insight", "model", "agent", "trend", "data", "workflow", "research", "analysis", "content", "platform"]
+    body = " ".join(vocabulary[i % len(vocabulary)] for i in range(words))
+    if not markdown:
+        return body
+    paragraphs = [body[i : i + 600] for i in range(0, len(body), 600)]
+    sections = [f"## Section {i + 1}\n\n{paragraph}" for i, paragraph in enumerate(paragraphs)]
+    return "# Stub Blog Post\n\n" + "\n\n".join(sections) + "\n\nSource: [Stub source](https://example.com/stub)"
+
+
+def _stub_array(items: Dict[str, Any], name: str, definitions: Dict[str, Any], subject: str) -> List[Any]:
+    if name == "questions":
+        return [template.format(subject=subject) for template in STUB_QUESTIONS]
+    if "$ref" in items or items.get("type") == "object":
+        return [_stub_value(items, name, definitions, subject) for _ in range(STUB_ARRAY_LENGTHS.get(name, STUB_ARRAY_ITEMS))]
+    if items.get("type") == "integer":
+        return list(range(1, STUB_ARRAY_ITEMS + 1))
+    return []
+
+
+def _stub_value(schema: Dict[str, Any], name: str, definitions: Dict[str, Any], subject: str) -> Any:
+    if "$ref" in schema:
+        return _stub_value(definitions[schema["$ref"].split("/")[-1]], name, definitions, subject)
+    if "anyOf" in schema:
+        options = [option for option in schema["anyOf"] if option.get("type") != "null"]
+        return _stub_value(options[0], name, definitions, subject) if options else None
+    # Literal and Enum fields only validate with one of their values
+    if "enum" in schema or "const" in schema:
+        return schema["enum"][0] if "enum" in schema else schema["const"]
+    schema_type = schema.get("type")
+    if schema_type == "object":
+        return {key: _stub_value(value, key, definitions, subject) for key, value in schema.get("properties", {}).items()}
+    if schema_type == "array":
+        return _stub_array(schema.get("items", {}), name, definitions, subject)
+    if schema_type == "boolean":
+        return False
+    if schema_type in ("integer", "number"):
+        return 0
+    if name == "content":
+        return _stub_text(STUB_CONTENT_WORDS)
+    return f"Stub {name}"
+
+
+def _stub_subject(payload: Dict[str, Any]) -> str:
+    """The last user message, so generated questions differ per topic like real ones do."""
+    for message in reversed(payload.get("messages", [])):
+        if message.get("role") == "user" and isinstance(message.get("content"), str):
+            return message["content"][:120]
+    return "the topic"
+
+
+def _stub_completion_content(payload: Dict[str, Any]) -> str:
+    response_format = payload.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        schema = response_format["json_schema"]["schema"]
+        return json.dumps(_stub_value(schema, "", schema.get("$defs", {}), _stub_subject(payload)))
+    return _stub_text(150)
+
+
+class PromptCache:
+    """Emulates provider prompt caching: a prompt's longest block-aligned prefix sent before is served from the cache."""
+
+    def __init__(self):
+        self._seen = set()
+
+    def cached_chars(self, text: str) -> int:
+        """Characters of the prompt's prefix that were cached, after which the whole prompt is."""
+        if len(self._seen) > PROMPT_CACHE_MAX_ENTRIES:
+            self._seen.clear()
+        digest = hashlib.sha256()
+        cached = 0
+        for end in range(PROMPT_CACHE_BLOCK_CHARS, len(text) + 1, PROMPT_CACHE_BLOCK_CHARS):
+            # the running digest identifies the whole prefix up to end
+            digest.update(text[end - PROMPT_CACHE_BLOCK_CHARS : end].encode("utf-8"))
+            key = digest.digest()
+            if key in self._seen:
+                cached = end
+            else:
+                self._seen.add(key)
+        return cached if cached >= PROMPT_CACHE_MIN_CHARS else 0
+
+
+def _rate_limited(request: httpx.Request) -> httpx.Response:
+    error = {"message": "Rate limit reached (stub)", "type": "requests", "code": "rate_limit_exceeded"}
+    return httpx.Response(429, headers={"retry-after": "1"}, json={"error": error}, request=request)
+
+
+class StubTransport(httpx.AsyncBaseTransport):
+    """
+    Synthesizes OpenAI chat completion, embedding and YDC search responses offline.
+
+    Structured output requests get an object generated from their JSON schema,
+    plain requests a short markdown answer and embedding requests local
+    hashing embeddings. Usage reports the cached prompt tokens the provider's
+    prompt cache would have served. Streaming requests are served as
+    server-sent events with STUB_TOKEN_DELAY between chunks, after a first
+    byte delay of STUB_LLM_LATENCY; search requests take STUB_SEARCH_LATENCY.
+    With STUB_LLM_RATE_LIMIT or STUB_SEARCH_RATE_LIMIT set, requests beyond
+    the rate are answered with 429 like the real providers.
+    """
+
+    def __init__(
+        self,
+        llm_latency: float = STUB_LLM_LATENCY,
+        token_delay: float = STUB_TOKEN_DELAY,
+        search_latency: float = STUB_SEARCH_LATENCY,
+        llm_rate_limit: float = STUB_LLM_RATE_LIMIT,
+        search_rate_limit: float = STUB_SEARCH_RATE_LIMIT,
+    ):
+        self.llm_latency = llm_latency
+        self.token_delay = token_delay
+        self.search_latency = search_latency
+        self.llm_limit = TokenBucket(llm_rate_limit, max(1, int(llm_rate_limit))) if llm_rate_limit > 0 else None
+        self.search_limit = TokenBucket(search_rate_limit, max(1, int(search_rate_limit))) if search_rate_limit > 0 else None
+        self.prompt_cache = PromptCache()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/chat/completions"):
+            if self.llm_limit is not None and not self.llm_limit.try_acquire():
+                return _rate_limited(request)
+            return await self._chat_completion(request)
+        if request.url.path.endswith("/embeddings"):
+            if self.llm_limit is not None and not self.llm_limit.try_acquire():
+                return _rate_limited(request)
+            return await self._embeddings(request)
+        if request.url.path.endswith("/search"):
+            if self.search_limit is not None and not self.search_limit.try_acquire():
+                return _rate_limited(request)
+            return await self._search(request)
+        return httpx.Response(404, json={"error": f"No stub for {request.url}"}, request=request)
+
+    async def _search(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.search_latency)
+        query = request.url.params.get("query", "")
+        hits = [
+            {
+                "url": f"https://example.com/{i}",
+                "title": f"Result {i} for {query}",
+                "description": f"Description of result {i}",
+                "snippets": [f"Snippet {j} of result {i} about {query}." for j in range(3)],
+            }
+            for i in range(5)
+        ]
+        return httpx.Response(200, json={"hits": hits, "latency": self.search_latency}, request=request)
+
+    async def _embeddings(self, request: httpx.Request) -> httpx.Response:
+        # imported here because the embeddings module imports the models, which import this module
+        from src.utils.embeddings import HashingEmbedder
+
+        payload = json.loads(request.content)
+        texts = payload["input"] if isinstance(payload["input"], list) else [payload["input"]]
+        vectors = HashingEmbedder(dim=payload.get("dimensions") or 256).embed_sync([str(text) for text in texts])
+        data = [{"object": "embedding", "index": i, "embedding": vector.tolist()} for i, vector in enumerate(vectors)]
+        tokens = sum(len(str(text)) for text in texts) // 4
+        await asyncio.sleep(self.llm_latency / 3)
+        return httpx.Response(200, json={"object": "list", "data": data, "model": payload.get("model", "stub"), "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}, request=request)
+
+    async def _chat_completion(self, request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        content = _stub_completion_content(payload)
+        prompt = "".join(f"{message.get('role')}: {message.get('content', '')}\n" for message in payload.get("messages", []))
+        prompt_tokens = len(prompt) // 4
+        cached_tokens = self.prompt_cache.cached_chars(prompt) // 4
+        completion_tokens = len(content) // 4
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        }
+        base = {"id": "chatcmpl-stub", "created": int(time.time()), "model": payload.get("model", "stub"), "system_fingerprint": None}
+
+        await asyncio.sleep(self.llm_latency)
+        if not payload.get("stream"):
+            await asyncio.sleep(self.token_delay * completion_tokens)
+            message = {"role": "assistant", "content": content, "refusal": None}
+            choice = {"index": 0, "message": message, "finish_reason": "stop", "logprobs": None}
+            return httpx.Response(200, json={**base, "object": "chat.completion", "choices": [choice], "usage": usage}, request=request)
+
+        words = content.split(" ")
+        pieces = [" ".join(words[i : i + STREAM_CHUNK_WORDS]) + (" " if i + STREAM_CHUNK_WORDS < len(words) else "") for i in range(0, len(words), STREAM_CHUNK_WORDS)]
+        chunks = [{**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}]
+        chunks += [{**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]} for piece in pieces]
+        chunks.append({**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            chunks.append({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+        events = [f"data: {json.dumps(chunk)}\n\n".encode("utf-8") for chunk in chunks] + [b"data: [DONE]\n\n"]
+        delay = self.token_delay * STREAM_CHUNK_WORDS
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, stream=_DelayedStream(events, delay), request=request)
+
+
+def create_replay_transport(mode: str = HTTP_REPLAY_MODE) -> Optional[httpx.AsyncBaseTransport]:
+    """Create the transport for the HTTP_REPLAY_MODE, or None to use the network directly."""
+    if mode == "off":
+        return None
+    if mode in ("record", "replay"):
+        logger.info(f"HTTP {mode} mode using fixtures in {HTTP_REPLAY_DIR}")
+        return RecordReplayTransport(mode)
+    if mode == "stub":
+        logger.info("HTTP stub mode: serving synthetic LLM and search responses")
+        return StubTransport()
+    raise ValueError(f"Unknown HTTP_REPLAY_MODE: {mode}")
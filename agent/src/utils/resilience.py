@@ -0,0 +1,349 @@
+import asyncio
+import contextvars
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Iterator, Optional, TypeVar
+
+import httpx
+from pydantic import BaseModel, Field
+
+from src.utils.logger import get_logger
+from src.utils.metrics import CIRCUIT_REJECTED, CIRCUIT_STATE, DEADLINE_EXCEEDED, HEDGED_REQUESTS, HTTP_RETRIES, upstream_label
+
+logger = get_logger(__name__)
+
+# Constants for retries, deadlines and circuit breaking of outbound calls
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "8"))
+TURN_LATENCY_BUDGET = float(os.getenv("TURN_LATENCY_BUDGET", "300"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+T = TypeVar("T")
+
+
+class DeadlineExceeded(httpx.TimeoutException):
+    """Raised when the turn's latency budget is spent before or during an outbound call."""
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised without calling the upstream while its circuit breaker is open."""
+
+
+class RetryPolicy(BaseModel):
+    max_attempts: int = Field(default=RETRY_MAX_ATTEMPTS, description="Attempts per call, including the first; 1 disables retries")
+    base_delay: float = Field(default=RETRY_BASE_DELAY, description="Backoff before the first retry in seconds, doubled per attempt")
+    max_delay: float = Field(default=RETRY_MAX_DELAY, description="Upper bound on a single backoff in seconds")
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt`` (starting at 1)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+_turn_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("turn_deadline", default=None)
+
+
+@contextmanager
+def turn_budget(seconds: float = TURN_LATENCY_BUDGET, replace: bool = False) -> Iterator[None]:
+    """
+    Bound every outbound call made inside the block by a shared latency budget.
+
+    The deadline lives in a context variable, so it reaches every node and
+    task the graph run spawns. Nested budgets keep the outer, earlier
+    deadline unless ``replace`` is set, which gives the block a budget of its
+    own, e.g. one per topic of a batch.
+
+    Args:
+        seconds (float): The budget for the whole turn
+        replace (bool): Whether to replace an enclosing budget instead of staying within it
+    """
+    deadline = time.monotonic() + seconds
+    current = _turn_deadline.get()
+    token = _turn_deadline.set(deadline if current is None or replace else min(current, deadline))
+    try:
+        yield
+    finally:
+        _turn_deadline.reset(token)
+
+
+def remaining_budget() -> Optional[float]:
+    """Seconds left in the current turn's budget, or None outside a turn."""
+    deadline = _turn_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one upstream.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    fail fast with CircuitOpenError. After ``reset_timeout`` one probe call is
+    let through (half open); its success closes the circuit, its failure
+    opens it again.
+    """
+
+    def __init__(self, upstream: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.upstream = upstream
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self._set_state("closed")
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.warning(f"Circuit for {self.upstream} is now {state}")
+        self.state = state
+        CIRCUIT_STATE.labels(upstream=self.upstream).set(CIRCUIT_STATES[state])
+
+    def before_call(self, request: httpx.Request) -> None:
+        """Raise CircuitOpenError unless a call may go to the upstream now."""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._set_state("half_open")
+            if self.state == "closed":
+                return
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return
+        CIRCUIT_REJECTED.labels(upstream=self.upstream).inc()
+        raise CircuitOpenError(f"Circuit for {self.upstream} is open", request=request)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set_state("closed")
+
+    def release_probe(self) -> None:
+        """Let another probe through after a half-open call ended without an outcome, e.g. cancellation."""
+        with self._lock:
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state("open")
+
+
+_breakers: Dict[str, Optional[CircuitBreaker]] = {}
+_retry_policy = RetryPolicy()
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(upstream: str) -> Optional[CircuitBreaker]:
+    """Get the process-wide circuit breaker for an upstream, or None if breaking is disabled."""
+    if upstream not in _breakers:
+        with _registry_lock:
+            if upstream not in _breakers:
+                _breakers[upstream] = CircuitBreaker(upstream) if CIRCUIT_FAILURE_THRESHOLD > 0 else None
+    return _breakers[upstream]
+
+
+def circuit_states() -> Dict[str, str]:
+    """The state of every circuit breaker created so far, by upstream."""
+    return {upstream: breaker.state for upstream, breaker in list(_breakers.items()) if breaker is not None}
+
+
+def configure_resilience(retry_policy: Optional[RetryPolicy] = None, failure_threshold: Optional[int] = None, reset_timeout: float = CIRCUIT_RESET_TIMEOUT) -> None:
+    """
+    Replace the retry policy and reset the circuit breakers.
+
+    Args:
+        retry_policy (Optional[RetryPolicy]): The policy to use, or None for the environment defaults
+        failure_threshold (Optional[int]): Failures that open a circuit, 0 to disable breakers, None for the default
+        reset_timeout (float): Seconds an open circuit waits before a probe call
+    """
+    global _retry_policy
+    threshold = CIRCUIT_FAILURE_THRESHOLD if failure_threshold is None else failure_threshold
+    with _registry_lock:
+        _retry_policy = retry_policy or RetryPolicy()
+        _breakers.clear()
+        for upstream in ("openai", "ydc"):
+            _breakers[upstream] = CircuitBreaker(upstream, threshold, reset_timeout) if threshold > 0 else None
+
+
+def get_retry_policy() -> RetryPolicy:
+    return _retry_policy
+
+
+def _retry_after(response: httpx.Response) -> float:
+    try:
+        return min(float(response.headers.get("retry-after", 0)), 60.0)
+    except ValueError:
+        return 0.0
+
+
+def _cap_timeout(request: httpx.Request, remaining: float) -> None:
+    timeout = dict(request.extensions.get("timeout") or {})
+    for key in ("connect", "read", "write", "pool"):
+        value = timeout.get(key)
+        timeout[key] = remaining if value is None else min(value, remaining)
+    request.extensions["timeout"] = timeout
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper adding retries, turn deadlines and circuit breaking to every outbound request.
+
+    Retryable failures (timeouts, network errors, 408/429/5xx responses) are
+    retried with full-jitter exponential backoff, honouring Retry-After. Each
+    attempt's timeouts are capped by what is left of the turn budget, and no
+    retry is started once its backoff would overrun the budget. Failures are
+    counted against the upstream's circuit breaker.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        upstream = upstream_label(request.url.host)
+        breaker = get_circuit_breaker(upstream)
+        policy = get_retry_policy()
+
+        attempt = 1
+        while True:
+            remaining = self._check_budget(request, upstream)
+            if breaker is not None:
+                breaker.before_call(request)
+            try:
+                response = await self._send(request, upstream, breaker, remaining)
+            except DeadlineExceeded:
+                raise
+            except RETRYABLE_ERRORS as e:
+                delay = self._error_delay(e, upstream, breaker, policy, attempt)
+                if delay is None:
+                    raise
+                reason = "timeout" if isinstance(e, httpx.TimeoutException) else "network"
+            except BaseException:
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+            else:
+                delay = self._response_delay(response, upstream, breaker, policy, attempt)
+                if delay is None:
+                    return response
+                await response.aclose()
+                reason = "status"
+
+            HTTP_RETRIES.labels(upstream=upstream, reason=reason).inc()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _check_budget(request: httpx.Request, upstream: str) -> Optional[float]:
+        """Raise DeadlineExceeded if the turn budget is spent, else cap the request's timeouts by what is left of it."""
+        remaining = remaining_budget()
+        if remaining is None:
+            return None
+        if remaining <= 0:
+            DEADLINE_EXCEEDED.labels(upstream=upstream).inc()
+            raise DeadlineExceeded(f"Turn latency budget exhausted before calling {upstream}", request=request)
+        _cap_timeout(request, remaining)
+        return remaining
+
+    async def _send(self, request: httpx.Request, upstream: str, breaker: Optional[CircuitBreaker], remaining: Optional[float]) -> httpx.Response:
+        """Make one attempt, cut off when the turn budget runs out."""
+        if remaining is None:
+            return await self.transport.handle_async_request(request)
+        try:
+            return await asyncio.wait_for(self.transport.handle_async_request(request), remaining)
+        except asyncio.TimeoutError:
+            DEADLINE_EXCEEDED.labels(upstream=upstream).inc()
+            if breaker is not None:
+                breaker.record_failure()
+            raise DeadlineExceeded(f"Turn latency budget exhausted while calling {upstream}", request=request) from None
+
+    def _error_delay(self, error: Exception, upstream: str, breaker: Optional[CircuitBreaker], policy: RetryPolicy, attempt: int) -> Optional[float]:
+        """Count a failed attempt against the breaker; the backoff before retrying it, or None to give up."""
+        if breaker is not None:
+            breaker.record_failure()
+        delay = self._retry_delay(policy, attempt)
+        if delay is not None:
+            logger.warning(f"Retrying {upstream} request after {type(error).__name__} in {delay:.2f}s (attempt {attempt + 1}/{policy.max_attempts})")
+        return delay
+
+    def _response_delay(self, response: httpx.Response, upstream: str, breaker: Optional[CircuitBreaker], policy: RetryPolicy, attempt: int) -> Optional[float]:
+        """Record a response's outcome on the breaker; the backoff before retrying it, or None to return it."""
+        if breaker is not None:
+            # a 429 means the upstream is up and answering, so only 5xx trips the breaker
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if response.status_code not in RETRYABLE_STATUS_CODES and response.headers.get("x-should-retry") != "true":
+            return None
+        delay = self._retry_delay(policy, attempt, _retry_after(response))
+        if delay is not None:
+            logger.warning(f"Retrying {upstream} request after HTTP {response.status_code} in {delay:.2f}s (attempt {attempt + 1}/{policy.max_attempts})")
+        return delay
+
+    @staticmethod
+    def _retry_delay(policy: RetryPolicy, attempt: int, retry_after: float = 0.0) -> Optional[float]:
+        """The backoff before the next attempt, or None if no attempt should be made."""
+        if attempt >= policy.max_attempts:
+            return None
+        delay = max(policy.backoff(attempt), retry_after)
+        remaining = remaining_budget()
+        if remaining is not None and delay >= remaining:
+            return None
+        return delay
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+async def hedged(call: Callable[[], Awaitable[T]], hedge_after: float, upstream: str) -> T:
+    """
+    Run ``call``, starting a duplicate if it has not finished after ``hedge_after`` seconds.
+
+    The first successful result wins and the other attempt is cancelled. If
+    both fail, the first attempt's error is raised. A non-positive
+    ``hedge_after`` disables hedging.
+
+    Args:
+        call (Callable[[], Awaitable[T]]): Zero-argument coroutine factory for one attempt
+        hedge_after (float): Seconds to wait before the duplicate, e.g. the upstream's p95 latency
+        upstream (str): The upstream label for metrics
+
+    Returns:
+        T: The result of whichever attempt succeeded first
+    """
+    if hedge_after <= 0:
+        return await call()
+
+    primary = asyncio.ensure_future(call())
+    pending = {primary}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        HEDGED_REQUESTS.labels(upstream=upstream, outcome="launched").inc()
+        hedge = asyncio.ensure_future(call())
+        pending = {primary, hedge}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge:
+                        HEDGED_REQUESTS.labels(upstream=upstream, outcome="won").inc()
+                    return task.result()
+        return primary.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, TypeVar
+
+from src.utils.metrics import COALESCED_CALLS
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    The first caller for a key starts the call; callers arriving while it is
+    still running await the same result instead of repeating the work. The
+    call is shielded, so a cancelled caller does not cancel it for the rest.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.coalesced = 0
+        self._calls: Dict[str, "asyncio.Future"] = {}
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``call`` for ``key``, or join the run already in flight.
+
+        Args:
+            key (str): Identity of the call, e.g. a normalized search query
+            call (Callable[[], Awaitable[T]]): Zero-argument coroutine factory
+
+        Returns:
+            T: The shared result
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            COALESCED_CALLS.labels(call=self.name).inc()
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(call())
+        self._calls[key] = future
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(future)
+
+    def _finish(self, key: str, future: "asyncio.Future") -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # mark the error as retrieved even if every caller went away
+            future.exception()
@@ -0,0 +1,100 @@
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from copilotkit.langgraph import copilotkit_emit_state
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.schema.schema import BlogPost
+from src.state.state import AgentState
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Constants for streaming blog generation
+BLOG_STREAMING = os.getenv("BLOG_STREAMING", "true").lower() == "true"
+STREAM_EMIT_INTERVAL = float(os.getenv("STREAM_EMIT_INTERVAL", "0.25"))
+
+# Failures of the stream itself, which a one-shot call can avoid. Anything else,
+# e.g. an auth or validation error, would fail the same way again and is raised
+STREAMING_FAILURES = (NotImplementedError, httpx.StreamError, httpx.RemoteProtocolError, httpx.ReadError)
+
+
+def _as_blog_post(chunk: Any) -> Optional[BlogPost]:
+    if chunk is None or isinstance(chunk, BlogPost):
+        return chunk
+    if isinstance(chunk, dict):
+        return BlogPost(**chunk)
+    return None
+
+
+async def emit_blog_post(state: AgentState, blog_post: BlogPost, config: Optional[RunnableConfig]) -> None:
+    """Push an intermediate blog_post state update to CopilotKit."""
+    if config is None:
+        return
+    intermediate_state: Dict[str, Any] = state.model_dump(exclude={"messages"})
+    intermediate_state["blog_post"] = blog_post.model_dump()
+    await copilotkit_emit_state(config, intermediate_state)
+
+
+async def stream_blog_post(
+    model: Runnable,
+    messages: List[BaseMessage],
+    state: AgentState,
+    config: Optional[RunnableConfig] = None,
+) -> BlogPost:
+    """
+    Generate a BlogPost, streaming partial structured output to the UI as tokens arrive.
+
+    Partial posts are emitted as intermediate blog_post state at most once per
+    STREAM_EMIT_INTERVAL seconds. If streaming is disabled, or the stream
+    itself breaks before producing a chunk, this falls back to a single
+    ainvoke call; other errors are raised without calling the model again.
+
+    Args:
+        model (Runnable): A model bound to the BlogPost structured output schema
+        messages (List[BaseMessage]): The prompt messages
+        state (AgentState): The current state, used to build the intermediate state updates
+        config (Optional[RunnableConfig]): The node's config, needed to emit state to CopilotKit
+
+    Returns:
+        BlogPost: The final blog post
+    """
+    if not BLOG_STREAMING:
+        return await model.ainvoke(messages, config)
+
+    start = time.perf_counter()
+    first_chunk_at: Optional[float] = None
+    last_emit_at = 0.0
+    blog_post: Optional[BlogPost] = None
+
+    try:
+        async for chunk in model.astream(messages, config):
+            partial = _as_blog_post(chunk)
+            if partial is None:
+                continue
+            blog_post = partial
+
+            now = time.perf_counter()
+            if first_chunk_at is None:
+                first_chunk_at = now
+                logger.info(f"Blog post time to first token: {first_chunk_at - start:.2f}s")
+            if now - last_emit_at >= STREAM_EMIT_INTERVAL:
+                await emit_blog_post(state, blog_post, config)
+                last_emit_at = now
+
+    except STREAMING_FAILURES as e:
+        if blog_post is not None:
+            raise
+        logger.warning(f"Streaming unavailable, falling back to one-shot generation: {str(e)}")
+        return await model.ainvoke(messages, config)
+
+    if blog_post is None:
+        logger.warning("Streaming produced no output, falling back to one-shot generation")
+        return await model.ainvoke(messages, config)
+
+    await emit_blog_post(state, blog_post, config)
+    logger.info(f"Blog post streamed in {time.perf_counter() - start:.2f}s")
+    return blog_post
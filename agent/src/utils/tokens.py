@@ -0,0 +1,39 @@
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import tiktoken
+from langchain_core.messages import BaseMessage
+
+from src.utils.logger import get_logger
+from src.utils.models import DEFAULT_MODEL
+
+logger = get_logger(__name__)
+
+# Rough characters per token, used when no tiktoken encoding can be loaded
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=8)
+def _get_encoding(model: str) -> Optional[tiktoken.Encoding]:
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # tiktoken downloads encodings on first use, which fails offline
+        logger.warning(f"No tiktoken encoding available for {model}, estimating token counts: {str(e)}")
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """Count the tokens in a piece of text for the given model."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: Iterable[BaseMessage], model: str = DEFAULT_MODEL) -> int:
+    """Approximate the prompt tokens of a list of messages, ignoring per-message overhead."""
+    return sum(count_tokens(message.content if isinstance(message.content, str) else str(message.content), model) for message in messages)
@@ -56,7 +56,7 @@ class BlogPostGenerator:
                 return False
 
             messages = self._create_validation_prompt(result)
-            validation_response = self.llm.with_structured_output(BlogPostValidator).invoke(messages)
+            validation_response = await self.llm.with_structured_output(BlogPostValidator).ainvoke(messages)
 
             if not validation_response.is_valid:
                 print(f"Blog post validation failed. Feedback: {validation_response.feedback}")
@@ -0,0 +1,14 @@
+import os
+
+# Offline defaults, set before any src module reads its configuration at import
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("YDC_API_KEY", "test")
+os.environ.setdefault("HTTP_REPLAY_MODE", "stub")
+os.environ.setdefault("STUB_TOKEN_DELAY", "0")
+os.environ.setdefault("STUB_LLM_LATENCY", "0")
+os.environ.setdefault("STUB_SEARCH_LATENCY", "0")
+os.environ.setdefault("CHECKPOINTER_BACKEND", "memory")
+os.environ.setdefault("SEARCH_CACHE_PATH", "")
+os.environ.setdefault("SEARCH_INDEX_PATH", "")
+os.environ.setdefault("SUMMARY_CACHE_BACKEND", "memory")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
@@ -0,0 +1,116 @@
+import asyncio
+from typing import Dict, List
+
+import httpx
+import pytest
+
+from src.server.admission import AdmissionController, AdmissionMiddleware
+from src.utils.replay import StubTransport
+
+COMPLETION = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "Write a blog post about AI agents"}]}
+
+
+class GraphRun:
+    """ASGI stand-in for a graph run: one call to the rate-limited stub model, answered with its status."""
+
+    def __init__(self, model: StubTransport, fail: bool = False):
+        self.model = model
+        self.fail = fail
+        self.running: Dict[str, int] = {}
+        self.peak: Dict[str, int] = {}
+        self.started = asyncio.Event()
+
+    async def __call__(self, scope, receive, send):
+        key = dict(scope["headers"]).get(b"x-api-key", b"").decode()
+        self.running[key] = self.running.get(key, 0) + 1
+        self.peak[key] = max(self.peak.get(key, 0), self.running[key])
+        self.started.set()
+        try:
+            async with httpx.AsyncClient(transport=self.model, base_url="https://api.openai.com") as client:
+                response = await client.post("/v1/chat/completions", json=COMPLETION)
+            if self.fail:
+                raise RuntimeError("graph run failed")
+        finally:
+            self.running[key] -= 1
+        await send({"type": "http.response.start", "status": response.status_code, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+def post_all(app, keys: List[str]) -> List[httpx.Response]:
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://agent") as client:
+            return await asyncio.gather(*(client.post("/copilotkit/agent", headers={"x-api-key": key}) for key in keys))
+
+    return asyncio.run(scenario())
+
+
+def test_unbounded_runs_hit_the_provider_rate_limit_and_admission_avoids_it():
+    keys = ["tenant"] * 12
+    unbounded = post_all(GraphRun(StubTransport(llm_latency=0.05, llm_rate_limit=10)), keys)
+    assert [response.status_code for response in unbounded].count(429) == 2
+
+    controller = AdmissionController(max_concurrency=1, max_per_key=1, max_queue=len(keys), max_wait=5)
+    admitted = post_all(AdmissionMiddleware(GraphRun(StubTransport(llm_latency=0.05, llm_rate_limit=10)), controller, "/copilotkit"), keys)
+    assert [response.status_code for response in admitted] == [200] * len(keys)
+
+
+def test_full_queue_is_rejected_at_once_with_retry_after():
+    controller = AdmissionController(max_concurrency=1, max_per_key=1, max_queue=1, max_wait=5)
+    app = AdmissionMiddleware(GraphRun(StubTransport(llm_latency=0.2)), controller, "/copilotkit")
+
+    responses = post_all(app, ["tenant"] * 3)
+    assert sorted(response.status_code for response in responses) == [200, 200, 429]
+    rejected = next(response for response in responses if response.status_code == 429)
+    assert rejected.headers["retry-after"] == "2"
+    assert "queue_full" in rejected.json()["detail"]
+
+
+def test_queue_timeout_is_rejected_with_retry_after():
+    controller = AdmissionController(max_concurrency=1, max_per_key=1, max_queue=4, max_wait=0.05)
+    app = AdmissionMiddleware(GraphRun(StubTransport(llm_latency=0.3)), controller, "/copilotkit")
+
+    responses = post_all(app, ["tenant"] * 2)
+    rejected = [response for response in responses if response.status_code == 429]
+    assert len(rejected) == 1
+    assert rejected[0].headers["retry-after"] == "1"
+    assert "timeout" in rejected[0].json()["detail"]
+    assert (controller.active, controller.queued) == (0, 0)
+
+
+def test_per_key_cap_leaves_room_for_other_tenants():
+    run = GraphRun(StubTransport(llm_latency=0.05))
+    controller = AdmissionController(max_concurrency=4, max_per_key=1, max_queue=8, max_wait=5)
+
+    responses = post_all(AdmissionMiddleware(run, controller, "/copilotkit"), ["noisy"] * 4 + ["quiet"])
+
+    assert [response.status_code for response in responses] == [200] * 5
+    assert run.peak["noisy"] == 1
+    assert controller._per_key == {}
+
+
+def test_slot_is_released_when_the_run_fails():
+    controller = AdmissionController(max_concurrency=1, max_per_key=1, max_queue=0, max_wait=5)
+    app = AdmissionMiddleware(GraphRun(StubTransport(), fail=True), controller, "/copilotkit")
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            post_all(app, ["tenant"])
+    assert (controller.active, controller._per_key) == (0, {})
+
+
+def test_slot_is_released_when_the_run_is_cancelled():
+    controller = AdmissionController(max_concurrency=1, max_per_key=1, max_queue=0, max_wait=5)
+    run = GraphRun(StubTransport(llm_latency=10))
+    app = AdmissionMiddleware(run, controller, "/copilotkit")
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://agent") as client:
+            request = asyncio.ensure_future(client.post("/copilotkit/agent"))
+            await run.started.wait()
+            assert controller.active == 1
+            request.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await request
+
+    asyncio.run(scenario())
+    assert (controller.active, controller.queued, controller._per_key) == (0, 0, {})
@@ -0,0 +1,68 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.batch import BatchRunner
+from src.server.admission import AdmissionController
+from src.utils.resilience import remaining_budget, turn_budget
+
+
+class FakeGraph:
+    """Stand-in for the compiled graph recording the budget and concurrency each topic runs with."""
+
+    def __init__(self, seconds: float = 0.05):
+        self.seconds = seconds
+        self.active = 0
+        self.max_active = 0
+        self.budgets = []
+        self.posts = {}
+
+    async def aget_state(self, config):
+        post = self.posts.get(config["configurable"]["thread_id"])
+        return SimpleNamespace(values={"blog_post": post} if post else {}, next=())
+
+    async def aupdate_state(self, config, update, as_node=None):
+        pass
+
+    async def ainvoke(self, value, config):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.budgets.append(remaining_budget())
+        await asyncio.sleep(self.seconds)
+        self.active -= 1
+
+
+def run(runner: BatchRunner, topics):
+    async def collect():
+        return [result async for result in runner.run(topics)]
+
+    return asyncio.run(collect())
+
+
+def test_each_topic_gets_its_own_budget():
+    graph = FakeGraph()
+
+    async def scenario():
+        # an enclosing request budget that is almost spent must not starve the topics
+        with turn_budget(0.01):
+            return [result async for result in BatchRunner(graph, concurrency=1).run(["one", "two", "three"])]
+
+    results = asyncio.run(scenario())
+    assert [result.status for result in results] == ["completed"] * 3
+    assert min(graph.budgets) > 60
+
+
+def test_topics_share_admission_with_agent_runs():
+    graph = FakeGraph()
+    admission = AdmissionController(max_concurrency=2, max_per_key=2, max_queue=8, max_wait=5)
+    results = run(BatchRunner(graph, concurrency=8, admission=admission, tenant="key:test"), [f"topic {i}" for i in range(6)])
+    assert [result.status for result in results] == ["completed"] * 6
+    assert graph.max_active == 2
+    assert admission.active == 0
+
+
+def test_rejected_topics_wait_and_ask_again():
+    graph = FakeGraph(seconds=0.2)
+    admission = AdmissionController(max_concurrency=1, max_per_key=1, max_queue=1, max_wait=0.01)
+    results = run(BatchRunner(graph, concurrency=3, admission=admission), ["one", "two", "three"])
+    assert [result.status for result in results] == ["completed"] * 3
+    assert graph.max_active == 1
@@ -0,0 +1,76 @@
+import pytest
+
+from src.nodes.blog_edits import EditError, apply_edits, split_sections
+from src.schema.schema import BlogEdit, BlogPost
+
+POST = BlogPost(
+    title="AI Agents",
+    content="# AI Agents\n\nAgents are everywhere.\n\n## Tooling\n\nFrameworks matured.\n\n```\n## not a heading\n```\n\n## Takeaways\n\nStart small.\n",
+)
+
+
+def edit(operation: str, section=None, find=None, content=None) -> BlogEdit:
+    return BlogEdit(operation=operation, section=section, find=find, content=content)
+
+
+def test_sections_ignore_headings_in_code_fences():
+    sections = split_sections(POST.content)
+    assert len(sections) == 3
+    assert "".join(sections) == POST.content
+
+
+def test_each_operation_applies():
+    result = apply_edits(
+        POST,
+        [
+            edit("set_title", content="AI Agents in 2026"),
+            edit("replace_text", section=1, find="matured", content="grew up"),
+            edit("insert_after_section", section=1, content="## Costs\n\nTokens add up."),
+            edit("replace_section", section=2, content="## Takeaways\n\nStart with one workflow."),
+        ],
+    )
+    assert result.title == "AI Agents in 2026"
+    assert result.content.startswith("# AI Agents in 2026\n")
+    assert "Frameworks grew up." in result.content
+    assert result.content.index("## Costs") < result.content.index("## Takeaways")
+    assert "Start with one workflow." in result.content and "Start small." not in result.content
+
+
+def test_set_title_on_a_post_without_one():
+    result = apply_edits(POST.model_copy(update={"title": None}), [edit("set_title", content="AI Agents in 2026")])
+    assert result.title == "AI Agents in 2026"
+    # the content is left as it was, H1 included
+    assert result.content == POST.content
+
+
+def test_delete_section():
+    result = apply_edits(POST, [edit("delete_section", section=2)])
+    assert "## Takeaways" not in result.content
+    assert result.content.endswith("```\n")
+
+
+@pytest.mark.parametrize(
+    "edits, message",
+    [
+        ([], "No edits"),
+        ([edit("set_title", content=" ")], "needs the new title"),
+        ([edit("replace_text", section=1, content="x")], "needs the text to find"),
+        ([edit("replace_text", section=1, find="absent", content="x")], "found 0 occurrences"),
+        ([edit("replace_text", section=7, find="x", content="y")], "needs a section between 0 and 2"),
+        ([edit("insert_after_section", section=1, content="No heading")], "must start with an H2 heading"),
+        ([edit("replace_section", section=1, content="No heading")], "must start with its H2 heading"),
+        ([edit("replace_section", section=1)], "needs the new content"),
+        ([edit("delete_section", section=0)], "needs a section between 1 and 2"),
+        ([edit("delete_section", section=2), edit("replace_section", section=2, content="## X\n\ny")], "more than once"),
+        ([edit("replace_text", section=2, find="small", content="big"), edit("delete_section", section=2)], "both replaced and edited"),
+        ([edit("replace_text", section=1, find="matured", content="matured")], "unchanged"),
+    ],
+)
+def test_invalid_edits_fail_the_batch(edits, message):
+    with pytest.raises(EditError, match=message):
+        apply_edits(POST, edits)
+
+
+def test_introduction_may_be_replaced_without_a_heading():
+    result = apply_edits(POST, [edit("replace_section", section=0, content="# AI Agents\n\nAgents are here.")])
+    assert result.content.startswith("# AI Agents\n\nAgents are here.\n\n## Tooling")
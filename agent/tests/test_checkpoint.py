@@ -0,0 +1,98 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, StateGraph
+
+from src.checkpoint import CheckpointStore, MemoryCheckpointStore, RetentionPolicy, SQLiteCheckpointStore
+from src.checkpoint.revisions import BlogRevisionStore
+from src.schema.schema import BlogPost
+from src.state.state import AgentState
+
+POST = BlogPost(title="The Latest Trends in AI", content="# The Latest Trends in AI\n\n## Introduction\nAgents everywhere.\n")
+
+
+def reply(state: AgentState) -> dict:
+    return {"messages": [AIMessage(content="Here is your post")], "blog_post": POST}
+
+
+def compile_graph(checkpointer: CheckpointStore):
+    graph = StateGraph(AgentState)
+    graph.add_node("chat", reply)
+    graph.set_entry_point("chat")
+    graph.add_edge("chat", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def store(request, tmp_path) -> CheckpointStore:
+    retention = RetentionPolicy(keep_last=3)
+    return SQLiteCheckpointStore(str(tmp_path / "checkpoints.sqlite3"), retention) if request.param == "sqlite" else MemoryCheckpointStore(retention)
+
+
+def test_sync_state_api_works_on_the_event_loop_thread(store):
+    """CopilotKit calls graph.update_state synchronously from a request handler on continue turns."""
+    graph = compile_graph(store)
+    config = {"configurable": {"thread_id": "thread-1"}}
+
+    async def turn():
+        await graph.ainvoke({"messages": [HumanMessage(content="hi")]}, config)
+        edited = BlogPost(title=POST.title, content=POST.content + "More agents.\n")
+        graph.update_state(config, {"messages": [HumanMessage(content="Write a blog post about AI")], "blog_post": edited}, as_node="chat")
+        synced = graph.get_state(config)
+        awaited = await graph.aget_state(config)
+        await store.close()
+        return synced, awaited
+
+    synced, awaited = asyncio.run(turn())
+
+    assert [message.content for message in synced.values["messages"]] == ["hi", "Here is your post", "Write a blog post about AI"]
+    assert awaited.values["messages"] == synced.values["messages"]
+    assert awaited.config["configurable"]["checkpoint_id"] == synced.config["configurable"]["checkpoint_id"]
+    assert synced.values["blog_post"] == awaited.values["blog_post"] == BlogPost(title=POST.title, content=POST.content + "More agents.\n")
+
+
+def test_compaction_prunes_revisions_no_kept_checkpoint_refers_to(store):
+    graph = compile_graph(store)
+    config = {"configurable": {"thread_id": "thread-1"}}
+
+    async def edits():
+        for i in range(25):
+            await graph.aupdate_state(config, {"blog_post": BlogPost(title=POST.title, content=f"{POST.content}Edit {i}.\n")}, as_node="chat")
+        result = await store.compact()
+        history = [state async for state in graph.aget_state_history(config)]
+        revisions = await store.list_revisions("thread-1")
+        await store.close()
+        return result, history, revisions
+
+    result, history, revisions = asyncio.run(edits())
+
+    # the kept deltas start from the snapshot at revision 20
+    assert (result.checkpoints_deleted, result.revisions_deleted) == (22, 20)
+    assert [state.values["blog_post"].content.splitlines()[-1] for state in history] == ["Edit 24.", "Edit 23.", "Edit 22."]
+    assert [(revision.revision, revision.kind) for revision in revisions] == [(20, "full"), (21, "delta"), (22, "delta"), (23, "delta"), (24, "delta")]
+
+
+def test_revision_numbers_are_unique_across_workers(tmp_path):
+    path = str(tmp_path / "checkpoints.sqlite3")
+    workers = [BlogRevisionStore(path) for _ in range(4)]
+
+    def save(i: int) -> int:
+        return workers[i % len(workers)].save("thread-1", BlogPost(title="Post", content=f"Draft {i}\n"))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        numbers = list(pool.map(save, range(40)))
+
+    assert sorted(numbers) == list(range(40))
+    assert [workers[0].load("thread-1", number).content for number in numbers] == [f"Draft {i}\n" for i in range(40)]
+
+
+def test_missing_content_round_trips_as_none(tmp_path):
+    store = BlogRevisionStore(str(tmp_path / "checkpoints.sqlite3"))
+    titled = store.save("thread-1", BlogPost(title="Only a title"))
+    written = store.save("thread-1", BlogPost(title="Only a title", content=""))
+
+    assert titled != written
+    assert BlogRevisionStore(store.path).load("thread-1", titled) == BlogPost(title="Only a title", content=None)
+    assert BlogRevisionStore(store.path).load("thread-1", written) == BlogPost(title="Only a title", content="")
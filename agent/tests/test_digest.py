@@ -0,0 +1,37 @@
+from src.schema.schema import BlogPost, SearchResults
+from src.state.digest import digest_blog_post, digest_search_results, format_blog_post_digest
+
+CONTENT = "# AI Agents\n\nAgents plan and act.\n\n## Tools\n\nThey call tools.\n\n## Memory ##\n\nThey remember."
+
+
+def test_digest_is_stable_across_key_order():
+    first = digest_blog_post(BlogPost.model_validate({"title": "AI Agents", "content": CONTENT}))
+    second = digest_blog_post(BlogPost.model_validate({"content": CONTENT, "title": "AI Agents"}))
+
+    assert first == second
+    assert first.headings == ["AI Agents", "Tools", "Memory"]
+    assert first.word_count == 17
+    assert len(first.content_hash) == 12
+
+
+def test_digest_changes_with_the_content():
+    original = digest_blog_post(BlogPost(title="AI Agents", content=CONTENT))
+    edited = digest_blog_post(BlogPost(title="AI Agents", content=CONTENT.replace("remember", "forget")))
+    retitled = digest_blog_post(BlogPost(title="Agents in 2026", content=CONTENT))
+
+    assert edited.content_hash != original.content_hash
+    assert edited.word_count == original.word_count
+    assert retitled.content_hash == original.content_hash and retitled.title != original.title
+
+
+def test_empty_post_has_no_digest():
+    assert digest_blog_post(BlogPost()) is None
+    assert digest_blog_post(None) is None
+    assert format_blog_post_digest(BlogPost()) == "No blog post generated yet"
+
+
+def test_search_results_digest_keeps_only_the_questions():
+    results = SearchResults.model_validate({"search_results": [{"question": "What are AI agents?", "search_result": "A long answer. " * 100}, {"search_result": "No question"}]})
+
+    assert digest_search_results(results) == ["What are AI agents?", ""]
+    assert digest_search_results(None) == []
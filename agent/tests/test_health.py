@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+import pytest
+
+from src.server import health
+from src.server.admission import AdmissionController
+from src.server.health import HealthMonitor, LoopLagMonitor
+from src.server.runs import RunTracker
+from src.server.startup import Warmup
+
+
+class Probes:
+    """Dependency probes that count their calls: one answers, one fails, one hangs."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def ok(self):
+        self.calls += 1
+
+    async def broken(self):
+        self.calls += 1
+        raise ConnectionError("connection refused")
+
+    async def hanging(self):
+        self.calls += 1
+        await asyncio.sleep(10)
+
+
+def monitor(probes=None, ready=True, **kwargs) -> HealthMonitor:
+    warmup = Warmup()
+    if ready:
+        warmup.sdk = object()
+    return HealthMonitor(warmup, RunTracker(), AdmissionController(max_queue=4), probes=probes or {}, **kwargs)
+
+
+def test_ready_when_nothing_is_wrong():
+    readiness = asyncio.run(monitor({"checkpointer": Probes().ok}).readiness())
+    assert readiness.ready and readiness.reasons == []
+    assert readiness.dependencies["checkpointer"].ok
+
+
+def test_warming_up_is_not_ready_and_does_not_probe():
+    probes = Probes()
+    health_monitor = monitor({"checkpointer": probes.ok}, ready=False)
+
+    readiness = asyncio.run(health_monitor.readiness())
+    stats = asyncio.run(health_monitor.stats())
+
+    assert readiness.reasons == ["warming_up"]
+    assert stats["readiness"]["dependencies"] == {}
+    assert probes.calls == 0
+
+
+def test_loop_lag_is_not_ready(monkeypatch):
+    monkeypatch.setattr(health, "HEALTH_MAX_LOOP_LAG", 0.1)
+    lag_monitor = LoopLagMonitor(interval=0.01)
+
+    async def scenario():
+        lag_monitor.start()
+        await asyncio.sleep(0.02)
+        # a blocking call stalls the loop
+        time.sleep(0.2)
+        await asyncio.sleep(0.02)
+        try:
+            return await monitor(lag_monitor=lag_monitor).readiness()
+        finally:
+            await lag_monitor.stop()
+
+    readiness = asyncio.run(scenario())
+    assert readiness.reasons == ["loop_lag"]
+    assert readiness.loop_lag >= 0.15
+
+
+def test_admission_backlog_is_not_ready(monkeypatch):
+    monkeypatch.setattr(health, "HEALTH_MAX_QUEUE_DEPTH", 2)
+    health_monitor = monitor()
+    health_monitor.admission.queued = 2
+
+    readiness = asyncio.run(health_monitor.readiness())
+    assert readiness.reasons == ["backlog"]
+    assert readiness.queue_depth == 2
+
+
+@pytest.mark.parametrize("probe, error", [("broken", "connection refused"), ("hanging", "No answer within 0.05s")])
+def test_failing_required_dependency_is_not_ready(probe, error):
+    probes = Probes()
+    readiness = asyncio.run(monitor({"checkpointer": probes.ok, "search_cache": getattr(probes, probe)}, probe_timeout=0.05).readiness())
+
+    assert readiness.reasons == ["search_cache_unreachable"]
+    assert readiness.dependencies["search_cache"].error == error
+    assert readiness.dependencies["checkpointer"].ok
+
+
+def test_optional_dependency_failure_is_reported_only():
+    readiness = asyncio.run(monitor({"search_index": Probes().broken}).readiness())
+    assert readiness.ready
+    assert not readiness.dependencies["search_index"].ok
+
+
+def test_probe_results_are_reused_within_the_interval():
+    probes = Probes()
+    health_monitor = monitor({"checkpointer": probes.ok}, probe_interval=0.1)
+
+    async def scenario():
+        await asyncio.gather(*(health_monitor.readiness() for _ in range(5)))
+        await health_monitor.stats()
+        calls = probes.calls
+        await asyncio.sleep(0.1)
+        await health_monitor.readiness()
+        return calls
+
+    assert asyncio.run(scenario()) == 1
+    assert probes.calls == 2
@@ -0,0 +1,64 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from src.schema.nodes import BLOG_SECTION, CHAT
+from src.state import history
+from src.state.history import _messages_to_summarize, select_history
+from src.state.state import AgentState, add_messages
+
+LONG = " ".join(["word"] * 300)
+
+
+def conversation(*messages) -> AgentState:
+    for i, message in enumerate(messages):
+        message.id = f"m{i}"
+    return AgentState(messages=list(messages))
+
+
+def test_window_does_not_start_with_a_tool_result(monkeypatch):
+    monkeypatch.setitem(history.NODE_HISTORY_BUDGETS, CHAT, 60)
+    state = conversation(
+        HumanMessage(content=LONG),
+        AIMessage(content=LONG, tool_calls=[{"name": "search", "args": {"query": "agents"}, "id": "call-1"}]),
+        ToolMessage(content="results", tool_call_id="call-1"),
+        AIMessage(content="Here is what I found"),
+        HumanMessage(content="Thanks"),
+    )
+
+    window = select_history(state, CHAT)
+
+    assert not isinstance(window[0], ToolMessage)
+    assert [message.id for message in window] == ["m3", "m4"]
+
+
+def test_window_reaches_back_to_the_call_of_a_trailing_tool_result(monkeypatch):
+    monkeypatch.setitem(history.NODE_HISTORY_BUDGETS, CHAT, 10)
+    state = conversation(
+        HumanMessage(content="Search for agents"),
+        AIMessage(content="", tool_calls=[{"name": "search", "args": {"query": "agents"}, "id": "call-1"}]),
+        ToolMessage(content=LONG, tool_call_id="call-1"),
+    )
+
+    assert [message.id for message in select_history(state, CHAT)] == ["m1", "m2"]
+
+
+def test_summary_covers_what_the_tightest_window_drops(monkeypatch):
+    monkeypatch.setitem(history.NODE_HISTORY_BUDGETS, BLOG_SECTION, 100)
+    state = conversation(HumanMessage(content=LONG), AIMessage(content="Sure"), HumanMessage(content="Write about agents"))
+
+    # fewer than HISTORY_SUMMARY_BATCH messages and within HISTORY_KEEP_RECENT, but a window already drops the first
+    assert [message.id for message in _messages_to_summarize(state)] == ["m0"]
+
+    state.history_summary, state.history_summary_until = "The user wrote a long message.", "m0"
+    assert _messages_to_summarize(state) == []
+    window = select_history(state, BLOG_SECTION)
+    assert isinstance(window[0], SystemMessage) and [message.id for message in window[1:]] == ["m1", "m2"]
+
+
+def test_resent_history_keeps_its_order():
+    turns = [message for i in range(8) for message in (HumanMessage(content=f"question {i}", id=f"u{i}"), AIMessage(content=f"answer {i}", id=f"a{i}"))]
+    merged = add_messages(turns[:-2], [])
+
+    # the client sends the whole conversation again with the new turn, as CopilotKit does
+    merged = add_messages(merged, [message.model_copy() for message in turns])
+
+    assert [message.id for message in merged] == [message.id for message in turns]
@@ -0,0 +1,74 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.utils.metrics import instrument_node, render_metrics
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKER_SCRIPT = """
+import asyncio
+from src.utils.metrics import instrument_node
+
+async def summarize(state):
+    return state
+
+asyncio.run(instrument_node("summarize", summarize)({}))
+"""
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(f"blog_agent_{name}", labels) or 0.0
+
+
+def test_node_run_is_recorded_with_its_labels():
+    seen_in_flight = []
+
+    async def outline(state, config=None):
+        seen_in_flight.append(sample("node_in_flight", node="outline"))
+        return {"route": config["route"]}
+
+    runs = sample("node_duration_seconds_count", node="outline", status="ok")
+    node = instrument_node("outline", outline)
+
+    assert asyncio.run(node({}, config={"route": "chat"})) == {"route": "chat"}
+    assert node.__wrapped__ is outline
+    assert sample("node_duration_seconds_count", node="outline", status="ok") == runs + 1
+    assert sample("node_duration_seconds_count", node="outline", status="error") == 0
+    assert seen_in_flight == [1]
+    assert sample("node_in_flight", node="outline") == 0
+
+
+def test_failed_node_run_is_recorded_as_an_error():
+    async def broken(state):
+        raise ValueError("no outline")
+
+    node = instrument_node("broken", broken)
+
+    with pytest.raises(ValueError):
+        asyncio.run(node({}))
+    assert sample("node_duration_seconds_count", node="broken", status="error") == 1
+    assert sample("node_duration_seconds_count", node="broken", status="ok") == 0
+    assert sample("node_in_flight", node="broken") == 0
+
+
+def test_render_aggregates_every_worker_in_multiprocess_mode(tmp_path, monkeypatch):
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", WORKER_SCRIPT], cwd=AGENT_DIR, check=True)
+
+    payload, content_type = render_metrics()
+
+    assert content_type.startswith("text/plain")
+    assert 'blog_agent_node_duration_seconds_count{node="summarize",status="ok"} 2.0' in payload.decode()
+
+
+def test_render_without_multiprocess_dir_uses_this_process(monkeypatch):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    asyncio.run(instrument_node("render", lambda state: asyncio.sleep(0))({}))
+
+    payload, _ = render_metrics()
+    assert 'blog_agent_node_duration_seconds_count{node="render",status="ok"} 1.0' in payload.decode()
@@ -0,0 +1,62 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.prompts import PROMPTS
+from src.prompts.template import FIELD_PATTERN
+from src.utils.replay import StubTransport
+
+
+def render(template, date: str, result: str):
+    return template.messages(**{field: f"{field}: {result} as of {date}" for field in template.fields})
+
+
+@pytest.mark.parametrize("name", sorted(PROMPTS))
+def test_prefix_has_no_placeholders(name):
+    assert FIELD_PATTERN.search(PROMPTS[name].prefix) is None
+
+
+@pytest.mark.parametrize("name", sorted(PROMPTS))
+def test_prefix_bytes_do_not_change_between_requests(name):
+    template = PROMPTS[name]
+    first = render(template, "2025-01-01", "result-one")
+    second = render(template, "2026-10-18", "result-two")
+    assert first[0].content.encode("utf-8") == second[0].content.encode("utf-8") == template.prefix.encode("utf-8")
+    for value in ("2025-01-01", "2026-10-18", "result-one"):
+        assert value not in first[0].content
+
+
+@pytest.mark.parametrize("name", sorted(name for name, template in PROMPTS.items() if template.fields))
+def test_suffix_comes_after_the_prefix(name):
+    messages = render(PROMPTS[name], "2026-10-18", "result-one")
+    assert len(messages) == 2
+    assert messages[0].content == PROMPTS[name].prefix
+    assert "result-one as of 2026-10-18" in messages[1].content
+
+
+def test_every_request_starts_with_a_registered_prefix(monkeypatch):
+    from src.graph.graph import get_blog_post_generator_graph
+
+    requests = []
+    chat_completion = StubTransport._chat_completion
+
+    async def recording(self, request):
+        requests.append(json.loads(request.content))
+        return await chat_completion(self, request)
+
+    monkeypatch.setattr(StubTransport, "_chat_completion", recording)
+    graph = get_blog_post_generator_graph()
+
+    async def conversation():
+        for mode in ("single", "sectioned"):
+            config = {"configurable": {"thread_id": str(uuid4())}}
+            await graph.ainvoke({"messages": [HumanMessage(content="Write a blog post about AI agents")], "generation_mode": mode}, config)
+            await graph.ainvoke({"messages": [HumanMessage(content="Make the introduction shorter and punchier")]}, config)
+
+    asyncio.run(conversation())
+    prefixes = {template.prefix for template in PROMPTS.values()}
+    assert requests
+    assert [payload["messages"][0]["content"][:80] for payload in requests if payload["messages"][0]["content"] not in prefixes] == []
@@ -0,0 +1,54 @@
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.nodes.question_dedup import cluster_questions
+from src.utils.embeddings import HashingEmbedder
+
+PAIRS_PATH = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "fixtures", "question_pairs.jsonl")
+
+# the fixture writes the current year as {year}, which the embedder ignores
+YEAR = str(time.localtime().tm_year)
+
+with open(PAIRS_PATH, encoding="utf-8") as f:
+    PAIRS = [json.loads(line.replace("{year}", YEAR)) for line in f if line.strip()]
+
+embedder = HashingEmbedder()
+
+
+def similarity(a: str, b: str) -> float:
+    vectors = embedder.embed_sync([a, b])
+    return float(vectors[0] @ vectors[1])
+
+
+@pytest.mark.parametrize("pair", [pair for pair in PAIRS if not pair["duplicate"]], ids=lambda pair: pair["a"])
+def test_distinct_questions_are_not_merged(pair):
+    assert similarity(pair["a"], pair["b"]) < embedder.similarity_threshold
+
+
+def test_most_duplicates_are_merged():
+    duplicates = [pair for pair in PAIRS if pair["duplicate"]]
+    merged = [pair for pair in duplicates if similarity(pair["a"], pair["b"]) >= embedder.similarity_threshold]
+    assert len(merged) / len(duplicates) >= 0.9
+
+
+@pytest.mark.parametrize(
+    "a, b, duplicate",
+    [
+        ("latest trends in AI", f"current AI trends in {YEAR}", True),
+        ("What are the security risks of AI agents?", "AI agent security risks", True),
+        ("Python 3.12 performance improvements", "Python 3.13 performance improvements", False),
+        ("AI trends in 2024", "AI trends in 2025", False),
+    ],
+)
+def test_clustering_pins_known_cases(a, b, duplicate):
+    clusters = cluster_questions(embedder.embed_sync([a, b]), embedder.similarity_threshold)
+    assert (len(clusters) == 1) == duplicate
+
+
+def test_current_year_is_ignored():
+    vectors = embedder.embed_sync(["AI trends", f"AI trends in {YEAR}"])
+    assert np.isclose(float(vectors[0] @ vectors[1]), 1.0)
@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from src.utils.ratelimit import RateLimitExceeded, TokenBucket
+
+
+def test_debt_is_capped_at_max_wait():
+    bucket = TokenBucket(rate=10, burst=1, max_wait=0.25)
+    delays = [bucket.reserve() for _ in range(5)]
+    # the burst token, then 0.1s, 0.2s; 0.3s would exceed max_wait
+    assert delays[:3] == [0.0, pytest.approx(0.1, abs=0.01), pytest.approx(0.2, abs=0.01)]
+    assert delays[3:] == [None, None]
+
+
+def test_acquire_fails_fast_past_max_wait():
+    bucket = TokenBucket(rate=1, burst=1, max_wait=0.5)
+
+    async def scenario():
+        await bucket.acquire()
+        with pytest.raises(RateLimitExceeded):
+            await bucket.acquire()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_refunds_its_token():
+    bucket = TokenBucket(rate=1, burst=1)
+
+    async def scenario():
+        await bucket.acquire()
+        waiter = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        # without the refund the next caller would wait about two seconds
+        assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+    asyncio.run(scenario())
@@ -0,0 +1,49 @@
+import asyncio
+
+import httpx
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.nodes.blog_edits import apply_edits
+from src.nodes.web_search_node import SearchInput
+from src.schema.nodes import BLOG_OUTLINE, FEEDBACK, GENERATE_BLOG, GENERATE_QUESTIONS, ROUTER
+from src.schema.schema import AssessIntent, BlogEdits, BlogOutline, BlogPost
+from src.utils.models import close_models, get_structured_model
+from src.utils.replay import RecordReplayTransport
+
+
+def structured_stub_response(node: str, schema):
+    async def call():
+        try:
+            return await get_structured_model(node, schema).ainvoke([HumanMessage(content="Write a blog post about AI agents")])
+        finally:
+            await close_models()
+
+    return asyncio.run(call())
+
+
+@pytest.mark.parametrize(
+    "node, schema",
+    [(ROUTER, AssessIntent), (GENERATE_QUESTIONS, SearchInput), (GENERATE_BLOG, BlogPost), (BLOG_OUTLINE, BlogOutline), (FEEDBACK, BlogEdits)],
+)
+def test_stub_answers_validate_against_every_structured_output(node, schema):
+    assert isinstance(structured_stub_response(node, schema), schema)
+
+
+def test_stub_edits_apply_to_a_stub_post():
+    post = structured_stub_response(GENERATE_BLOG, BlogPost)
+    edits = structured_stub_response(FEEDBACK, BlogEdits)
+
+    assert apply_edits(post, edits.edits).content != post.content
+
+
+def test_replay_without_a_fixture_is_a_connect_error(tmp_path):
+    transport = RecordReplayTransport("replay", directory=str(tmp_path))
+
+    async def call():
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://api.example.com/missing")
+
+    with pytest.raises(httpx.ConnectError) as error:
+        asyncio.run(call())
+    assert isinstance(error.value.__cause__, FileNotFoundError)
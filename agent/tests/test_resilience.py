@@ -0,0 +1,143 @@
+import asyncio
+import time
+from typing import Sequence
+
+import httpx
+import pytest
+
+from src.utils.resilience import CircuitOpenError, DeadlineExceeded, ResilientTransport, RetryPolicy, configure_resilience, get_circuit_breaker, hedged, turn_budget
+
+
+class Upstream:
+    """ASGI stand-in answering each request with the next status code and delay from a script, then 200s."""
+
+    def __init__(self, statuses: Sequence[int] = (), delays: Sequence[float] = (), retry_after: float = 0):
+        self.statuses = list(statuses)
+        self.delays = list(delays)
+        self.retry_after = retry_after
+        self.requests = 0
+
+    async def __call__(self, scope, receive, send):
+        self.requests += 1
+        status = self.statuses.pop(0) if self.statuses else 200
+        delay = self.delays.pop(0) if self.delays else 0.0
+        if delay:
+            await asyncio.sleep(delay)
+        headers = [(b"content-type", b"application/json")]
+        if self.retry_after:
+            headers.append((b"retry-after", str(self.retry_after).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": f'{{"request": {self.requests}}}'.encode()})
+
+
+@pytest.fixture(autouse=True)
+def resilience():
+    # breakers off unless a test turns them on, so retries are counted on their own
+    configure_resilience(RetryPolicy(max_attempts=3, base_delay=0, max_delay=0), failure_threshold=0)
+    yield
+    configure_resilience()
+
+
+def call(upstream: Upstream) -> httpx.Response:
+    async def request():
+        async with httpx.AsyncClient(transport=ResilientTransport(httpx.ASGITransport(app=upstream)), base_url="https://api.ydc-index.io") as client:
+            return await client.get("/search")
+
+    return asyncio.run(request())
+
+
+def test_retries_until_success():
+    upstream = Upstream(statuses=[503, 502])
+    assert call(upstream).status_code == 200
+    assert upstream.requests == 3
+
+
+def test_gives_up_after_max_attempts():
+    upstream = Upstream(statuses=[503] * 5)
+    assert call(upstream).status_code == 503
+    assert upstream.requests == 3
+
+
+def test_client_errors_are_not_retried():
+    upstream = Upstream(statuses=[400])
+    assert call(upstream).status_code == 400
+    assert upstream.requests == 1
+
+
+def test_breaker_opens_then_probes_half_open():
+    configure_resilience(RetryPolicy(max_attempts=1), failure_threshold=2, reset_timeout=0.1)
+    breaker = get_circuit_breaker("ydc")
+    upstream = Upstream(statuses=[503, 503, 503])
+    call(upstream)
+    call(upstream)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        call(upstream)
+    assert upstream.requests == 2
+
+    # after the reset timeout one probe goes through; its failure opens the circuit again
+    time.sleep(0.1)
+    call(upstream)
+    assert upstream.requests == 3
+    assert breaker.state == "open"
+
+    # the next probe succeeds and closes it
+    time.sleep(0.1)
+    assert call(upstream).status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_deadline_cuts_off_a_slow_call_and_skips_the_next():
+    upstream = Upstream(delays=[1.0])
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=ResilientTransport(httpx.ASGITransport(app=upstream)), base_url="https://api.ydc-index.io") as client:
+            with turn_budget(0.1):
+                start = time.monotonic()
+                with pytest.raises(DeadlineExceeded):
+                    await client.get("/search")
+                assert time.monotonic() - start < 0.5
+                with pytest.raises(DeadlineExceeded):
+                    await client.get("/search")
+
+    asyncio.run(scenario())
+    assert upstream.requests == 1
+
+
+def test_no_retry_backoff_past_the_deadline():
+    upstream = Upstream(statuses=[503], retry_after=1)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=ResilientTransport(httpx.ASGITransport(app=upstream)), base_url="https://api.ydc-index.io") as client:
+            with turn_budget(0.3):
+                return await client.get("/search")
+
+    start = time.monotonic()
+    assert asyncio.run(scenario()).status_code == 503
+    assert time.monotonic() - start < 0.3
+    assert upstream.requests == 1
+
+
+def test_hedge_wins_over_a_slow_first_attempt():
+    upstream = Upstream(delays=[1.0, 0.0])
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=ResilientTransport(httpx.ASGITransport(app=upstream)), base_url="https://api.ydc-index.io") as client:
+            start = time.monotonic()
+            response = await hedged(lambda: client.get("/search"), hedge_after=0.05, upstream="ydc")
+            return response, time.monotonic() - start
+
+    response, elapsed = asyncio.run(scenario())
+    assert response.json() == {"request": 2}
+    assert elapsed < 0.5
+
+
+def test_hedge_not_launched_for_a_fast_call():
+    upstream = Upstream()
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=ResilientTransport(httpx.ASGITransport(app=upstream)), base_url="https://api.ydc-index.io") as client:
+            return await hedged(lambda: client.get("/search"), hedge_after=0.5, upstream="ydc")
+
+    assert asyncio.run(scenario()).json() == {"request": 1}
+    assert upstream.requests == 1
@@ -0,0 +1,49 @@
+from typing import Optional
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src.nodes.router_rules import ROUTER_RULE_CONFIDENCE, classify_intent
+from src.schema.nodes import CHAT, FEEDBACK, WEB_SEARCH
+from src.schema.schema import BlogPost
+from src.state.state import AgentState
+
+POST = BlogPost(title="The Latest Trends in AI", content="# The Latest Trends in AI\n\n## Introduction\n...")
+
+
+def route(text: str, blog_post: Optional[BlogPost] = None) -> Optional[str]:
+    """The route the rules commit to, or None when the LLM router decides."""
+    messages = [HumanMessage(content="Write a blog post about AI"), AIMessage(content="Here is your post")] if blog_post else []
+    decision = classify_intent(AgentState(messages=[*messages, HumanMessage(content=text)], blog_post=blog_post or BlogPost()))
+    return decision.route if decision is not None and decision.confidence >= ROUTER_RULE_CONFIDENCE else None
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Write a blog post about the latest trends in AI", WEB_SEARCH),
+        ("Can you generate a blog post on remote work productivity?", WEB_SEARCH),
+        ("hi", CHAT),
+        ("How do I write a good blog post?", CHAT),
+        ("What makes a good blog headline?", CHAT),
+        ("Do not write a blog post yet, I just want to chat about AI", None),
+        ("Don't write a post about AI, let's just talk", None),
+    ],
+)
+def test_routes_without_a_post(text, expected):
+    assert route(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Fix the typo in the intro", FEEDBACK),
+        ("Make it more concise", FEEDBACK),
+        ("Thanks!", CHAT),
+        ("What tone does this post use?", None),
+        ("Should I make it longer?", None),
+        ("Can you explain how to improve SEO in general?", None),
+    ],
+)
+def test_routes_with_a_post(text, expected):
+    assert route(text, POST) == expected
@@ -0,0 +1,67 @@
+import asyncio
+import os
+import signal
+
+from src.server.runs import RunTracker
+
+
+def test_sigterm_drains_before_the_server_handler_runs():
+    calls = []
+    original = signal.signal(signal.SIGTERM, lambda signum, frame: calls.append(signum))
+
+    async def scenario():
+        tracker = RunTracker()
+        release = asyncio.Event()
+
+        async def run():
+            async with tracker.track():
+                await release.wait()
+
+        assert tracker.drain_on_signal(timeout=5)
+        task = asyncio.ensure_future(run())
+        await asyncio.sleep(0)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0.05)
+        # draining while the server handler has not seen the signal yet
+        assert tracker.draining
+        assert calls == []
+        release.set()
+        await task
+        await asyncio.sleep(0.05)
+        assert calls == [signal.SIGTERM]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        signal.signal(signal.SIGTERM, original)
+
+
+def test_second_sigterm_is_passed_on_at_once():
+    calls = []
+    original = signal.signal(signal.SIGTERM, lambda signum, frame: calls.append(signum))
+
+    async def scenario():
+        tracker = RunTracker()
+        release = asyncio.Event()
+
+        async def run():
+            async with tracker.track():
+                await release.wait()
+
+        tracker.drain_on_signal(timeout=5)
+        task = asyncio.ensure_future(run())
+        await asyncio.sleep(0)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0.05)
+        os.kill(os.getpid(), signal.SIGTERM)
+        await asyncio.sleep(0.05)
+        assert calls == [signal.SIGTERM]
+        release.set()
+        await task
+        await asyncio.sleep(0.05)
+        assert calls == [signal.SIGTERM]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        signal.signal(signal.SIGTERM, original)
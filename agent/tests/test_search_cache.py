@@ -0,0 +1,73 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from src.cache import search_cache
+from src.cache.search_cache import SearchCache
+from src.nodes import web_search_node
+from src.utils.http import configure_http_client
+
+RESULTS = {"hits": [{"url": "https://example.com", "title": "Example", "description": "An example", "snippets": ["An example snippet"]}]}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch) -> SearchCache:
+    cache = SearchCache(path=str(tmp_path / "search_cache.sqlite3"))
+    monkeypatch.setattr(search_cache, "_search_cache", cache)
+    return cache
+
+
+def test_repeated_search_is_served_from_cache_offline(cache):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=RESULTS)
+
+    async def scenario():
+        await configure_http_client(httpx.MockTransport(handler))
+        try:
+            first = await web_search_node.fetch_search_results("What are the latest trends in AI?")
+            second = await web_search_node.fetch_search_results("  what are the latest   trends in AI ")
+        finally:
+            await configure_http_client(None)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second == RESULTS
+    assert len(requests) == 1
+    assert requests[0].url.params["query"] == "What are the latest trends in AI?"
+    assert (cache.stats.memory_hits, cache.stats.misses) == (1, 1)
+
+
+def test_disk_tier_survives_a_new_process(tmp_path):
+    path = str(tmp_path / "search_cache.sqlite3")
+    asyncio.run(SearchCache(path=path).aset("latest trends in AI", RESULTS))
+
+    restarted = SearchCache(path=path)
+    assert asyncio.run(restarted.aget("Latest trends in AI?")) == RESULTS
+    assert (restarted.stats.disk_hits, restarted.stats.misses) == (1, 0)
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = SearchCache(path=str(tmp_path / "search_cache.sqlite3"), ttl=0)
+    cache.set("latest trends in AI", RESULTS)
+
+    assert cache.get("latest trends in AI") is None
+    assert cache.stats.misses == 1
+    assert cache.stats.evictions >= 1
+
+
+
+def test_memory_hits_do_not_wait_for_the_disk_tier(cache):
+    cache.set("latest trends in AI", RESULTS)
+    found = []
+    # a disk read or write in progress in another worker thread
+    with cache._disk_lock:
+        lookup = threading.Thread(target=lambda: found.append(asyncio.run(cache.aget("latest trends in AI"))), daemon=True)
+        lookup.start()
+        lookup.join(timeout=1)
+        assert found == [RESULTS]
@@ -0,0 +1,54 @@
+import time
+
+import numpy as np
+
+from src.cache.search_index import SearchIndex
+from src.schema.schema import SearchResult
+
+DIM = 8
+
+
+def vector(axis: int) -> np.ndarray:
+    row = np.zeros((1, DIM), dtype=np.float32)
+    row[0, axis] = 1.0
+    return row
+
+
+def answer(question: str) -> SearchResult:
+    return SearchResult(question=question, search_result=f"Answer to {question}")
+
+
+def test_lookup_survives_compaction_by_another_worker(tmp_path):
+    reader = SearchIndex(str(tmp_path), max_age=60, initial_capacity=3)
+    writer = SearchIndex(str(tmp_path), max_age=0.2, initial_capacity=3)
+    reader.add(vector(0), [answer("old")], "test")
+    time.sleep(0.3)
+    reader.add(np.vstack([vector(1), vector(2)]), [answer("kept"), answer("other")], "test")
+
+    scan = reader._scan
+    scans = []
+
+    def scan_then_compact(vectors, embedder):
+        result = scan(vectors, embedder)
+        if not scans:
+            # the writer fills the index, compacting "old" away and renumbering "kept" from row 1 to row 0
+            writer.add(vector(3), [answer("new")], "test")
+        scans.append(result[0])
+        return result
+
+    reader._scan = scan_then_compact
+    [match] = reader.lookup(vector(1), 0.9, "test")
+    assert match is not None
+    assert match.result.question == "kept"
+    # the first scan's generation was stale, so the lookup scanned again
+    assert len(scans) == 2 and scans[0] != scans[1]
+    reader.close()
+    writer.close()
+
+
+def test_lookup_ignores_other_embedders(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.add(vector(0), [answer("question")], "test")
+    assert index.lookup(vector(0), 0.9, "other") == [None]
+    assert index.lookup(vector(0), 0.9, "test")[0].result.question == "question"
+    index.close()
@@ -0,0 +1,101 @@
+from src.nodes.search_payload import SearchHit, compact_search_payload, dedupe_hits, parse_hits, rank_hits, render_hits
+from src.utils.tokens import count_tokens
+
+QUESTION = "What are the latest trends in AI agents?"
+
+
+def hit(url: str, title: str = "", description: str = "", snippets=()) -> SearchHit:
+    return SearchHit(url=url, title=title, description=description, snippets=list(snippets))
+
+
+def test_parse_hits_reads_both_response_formats():
+    raw = {"url": "https://example.com/a?utm_source=x&id=1#top", "title": "  AI   agents ", "snippets": "One snippet", "favicon_url": "https://example.com/icon"}
+
+    assert parse_hits({"hits": [raw]}) == parse_hits({"results": {"web": [raw]}}) == [hit("https://example.com/a?id=1", "AI agents", snippets=["One snippet"])]
+
+
+def test_parse_hits_skips_malformed_entries():
+    payload = {"hits": [{"title": "No URL"}, "not a hit", {"url": "https://example.com", "snippets": ["", "  ", "Kept"]}]}
+
+    assert parse_hits(payload) == [hit("https://example.com", snippets=["Kept"])]
+    assert parse_hits(["not", "a", "payload"]) == []
+
+
+def test_dedupe_hits_merges_pages_and_drops_repeated_snippets():
+    hits = [
+        hit("https://www.example.com/post/", "Post", snippets=["Agents plan", "Agents act"]),
+        hit("http://example.com/post", "Post", description="About agents", snippets=["agents act", "Agents remember"]),
+        hit("https://other.com", "Other", description="Agents plan", snippets=["Agents plan", "Agents reflect"]),
+    ]
+
+    deduped = dedupe_hits(hits)
+
+    assert [h.url for h in deduped] == ["https://www.example.com/post/", "https://other.com"]
+    assert deduped[0].snippets == ["Agents plan", "Agents act", "Agents remember"]
+    assert deduped[0].description == "About agents"
+    # repeats another hit's snippet and its own description
+    assert deduped[1].snippets == ["Agents reflect"]
+    assert hits[0].snippets == ["Agents plan", "Agents act"]
+
+
+def test_rank_hits_orders_by_relevance_and_caps_snippets():
+    hits = [
+        hit("https://cooking.com", "Sourdough bread recipes", snippets=["Knead the dough and let it rise overnight"]),
+        hit(
+            "https://agents.com",
+            "Latest trends in AI agents",
+            snippets=["AI agents trends: multi-agent planning", "AI agents trends: multi-agent planning!", "Latest AI agents use tools", "Trends in AI agents memory"],
+        ),
+    ]
+
+    ranked = rank_hits(QUESTION, hits, max_hits=2, max_snippets=2, min_relevance=0.1)
+
+    assert [h.url for h in ranked] == ["https://agents.com"]
+    assert len(ranked[0].snippets) == 2
+    assert len({snippet.rstrip("!") for snippet in ranked[0].snippets}) == 2
+    assert ranked[0].relevance > 0.1
+
+
+def test_rank_hits_keeps_the_best_hit_below_the_threshold():
+    hits = [hit("https://cooking.com", "Sourdough bread recipes", snippets=["Knead the dough"]), hit("https://garden.com", "Growing tomatoes")]
+
+    ranked = rank_hits(QUESTION, hits, min_relevance=0.99)
+
+    assert len(ranked) == 1
+    assert rank_hits(QUESTION, []) == []
+
+
+def test_render_hits_numbers_and_truncates():
+    block = render_hits([hit("https://a.com", "A", description="word " * 50, snippets=["short"]), hit("https://b.com")], snippet_max_chars=40)
+
+    lines = block.splitlines()
+    assert lines[0] == "[1] A (https://a.com)"
+    assert lines[1].endswith(" …") and len(lines[1]) <= 42
+    assert lines[2] == "- short"
+    assert lines[-1] == "[2] https://b.com (https://b.com)"
+
+
+def test_compacted_payload_stays_within_the_token_budget():
+    payload = {
+        "hits": [
+            {
+                "url": f"https://example{i}.com/agents?utm_campaign=news",
+                "title": f"AI agents trends report {i}",
+                "description": "Latest trends in AI agents and how teams adopt them",
+                "snippets": [f"AI agents trend {i}.{j}: " + " ".join(["planning tools memory evaluation"] * 40) for j in range(6)],
+                "thumbnail_url": f"https://example{i}.com/thumb.png",
+            }
+            for i in range(20)
+        ]
+    }
+
+    block = compact_search_payload(QUESTION, payload)
+
+    # SEARCH_MAX_HITS hits of SEARCH_MAX_SNIPPETS_PER_HIT snippets, each cut to SEARCH_SNIPPET_MAX_CHARS
+    assert block.count("\n[") == 5
+    assert count_tokens(block) < count_tokens(str(payload)) / 5
+    assert "utm_campaign" not in block and "thumb.png" not in block
+
+
+def test_unrecognized_payload_is_sent_unchanged():
+    assert compact_search_payload(QUESTION, {"error": "quota"}) == str({"error": "quota"})
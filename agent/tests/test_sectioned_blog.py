@@ -0,0 +1,43 @@
+import asyncio
+
+from src.nodes import sectioned_blog
+from src.schema.schema import BlogOutline, OutlineSection, SectionTransitions
+
+OUTLINE = BlogOutline(
+    title="AI Agents in 2026",
+    sections=[OutlineSection(heading=heading, key_points=[], sources=[]) for heading in ("Introduction", "Tooling", "Takeaways")],
+    meta_description="What AI agents can do",
+    keywords=["ai agents"],
+)
+DRAFTS = ["## Introduction\n\nAgents are everywhere.", "## Tooling\n\nFrameworks matured.", "## Takeaways\n\nStart small."]
+
+
+class FakeTransitionsModel:
+    def __init__(self, transitions):
+        self.transitions = transitions
+        self.messages = None
+
+    async def ainvoke(self, messages):
+        self.messages = messages
+        return SectionTransitions(transitions=self.transitions)
+
+
+def generate(monkeypatch, transitions):
+    model = FakeTransitionsModel(transitions)
+    monkeypatch.setattr(sectioned_blog, "get_structured_model", lambda name, schema: model)
+    return asyncio.run(sectioned_blog.generate_transitions(OUTLINE, DRAFTS)), model
+
+
+def test_transitions_close_each_section_but_the_last(monkeypatch):
+    transitions, model = generate(monkeypatch, ["Next, the tools.", "So what should you do?"])
+    assert "Agents are everywhere." in model.messages[-1].content and "Frameworks matured." in model.messages[-1].content
+    content = sectioned_blog.stitch_sections(OUTLINE, DRAFTS, transitions)
+    assert "Agents are everywhere.\n\nNext, the tools.\n\n## Tooling" in content
+    assert "Frameworks matured.\n\nSo what should you do?\n\n## Takeaways" in content
+    assert "Start small.\n\n## Meta Description" in content
+
+
+def test_wrong_number_of_transitions_is_dropped(monkeypatch):
+    transitions, _ = generate(monkeypatch, ["Only one."])
+    assert transitions == []
+    assert sectioned_blog.stitch_sections(OUTLINE, DRAFTS, transitions) == sectioned_blog.stitch_sections(OUTLINE, DRAFTS)
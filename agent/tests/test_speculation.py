@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.nodes import speculation, web_search_node
+from src.nodes.speculation import claim_speculation, resolve_speculation, start_speculation
+from src.schema.nodes import CHAT, WEB_SEARCH
+from src.state.state import AgentState
+
+CONFIG = {"configurable": {"thread_id": "thread-1"}}
+QUESTIONS = ["What are AI agents?", "Which frameworks build AI agents?", "How are AI agents evaluated?"]
+
+
+def outcomes(outcome: str) -> float:
+    return REGISTRY.get_sample_value("blog_agent_speculations_total", {"outcome": outcome}) or 0.0
+
+
+class Upstream:
+    """Stand-ins for question generation and search, recording what the speculation started and what was cancelled."""
+
+    def __init__(self, fail: bool = False, delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.searched = []
+        self.cancelled = []
+
+    async def generate_questions(self, state):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return QUESTIONS
+
+    async def fetch_search_results(self, question):
+        self.searched.append(question)
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled.append(question)
+            raise
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    def patch(**kwargs) -> Upstream:
+        fake = Upstream(**kwargs)
+        monkeypatch.setattr(web_search_node, "generate_questions", fake.generate_questions)
+        monkeypatch.setattr(web_search_node, "fetch_search_results", fake.fetch_search_results)
+        monkeypatch.setattr(speculation, "SPECULATIVE_SEARCHES", 2)
+        return fake
+
+    yield patch
+    speculation._speculations.clear()
+
+
+def test_committed_speculation_is_claimed_by_search_web(upstream):
+    fake = upstream()
+    committed = outcomes("committed")
+
+    async def scenario():
+        start_speculation(AgentState(), CONFIG)
+        resolve_speculation(CONFIG, WEB_SEARCH)
+        questions = await claim_speculation(CONFIG)
+        await asyncio.sleep(0)
+        return questions
+
+    assert asyncio.run(scenario()) == QUESTIONS
+    assert fake.searched == QUESTIONS[:2]
+    assert outcomes("committed") == committed + 1
+    assert speculation._speculations == {}
+
+
+def test_speculation_is_cancelled_when_the_router_chooses_chat(upstream):
+    fake = upstream(delay=0.01)
+    cancelled = outcomes("cancelled")
+
+    async def scenario():
+        start_speculation(AgentState(), CONFIG)
+        await asyncio.sleep(0.05)
+        resolve_speculation(CONFIG, CHAT)
+        await asyncio.sleep(0)
+        return await claim_speculation(CONFIG)
+
+    assert asyncio.run(scenario()) is None
+    assert fake.cancelled == fake.searched == QUESTIONS[:2]
+    assert outcomes("cancelled") == cancelled + 1
+
+
+def test_failed_speculation_falls_back_to_generating_questions(upstream):
+    upstream(fail=True)
+    failed = outcomes("failed")
+
+    async def scenario():
+        start_speculation(AgentState(), CONFIG)
+        resolve_speculation(CONFIG, WEB_SEARCH)
+        return await claim_speculation(CONFIG)
+
+    assert asyncio.run(scenario()) is None
+    assert outcomes("failed") == failed + 1
+
+
+def test_claim_without_speculation(upstream):
+    upstream()
+
+    assert asyncio.run(claim_speculation(CONFIG)) is None
+    assert asyncio.run(claim_speculation(None)) is None
+
+
+def test_turns_with_search_results_do_not_speculate(upstream):
+    upstream()
+    state = AgentState.model_validate({"search_results": {"search_results": [{"question": QUESTIONS[0], "search_result": "Agents act."}]}})
+
+    async def scenario():
+        return start_speculation(state, CONFIG), start_speculation(AgentState(), {})
+
+    assert asyncio.run(scenario()) == (None, None)
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.graph import graph
+from src.server import startup
+from src.server.startup import Warmup
+
+
+class Build:
+    """Stand-in for _build_sdk that blocks until released, failing the first ``failures`` times."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.release = threading.Event()
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        if self.calls <= self.failures:
+            raise RuntimeError("graph compilation failed")
+        return f"sdk {self.calls}"
+
+
+@pytest.fixture
+def build(monkeypatch):
+    def patch(**kwargs) -> Build:
+        fake = Build(**kwargs)
+        monkeypatch.setattr(startup, "_build_sdk", fake)
+        return fake
+
+    return patch
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        Warmup("later")
+
+
+def test_ready_only_after_the_build_finishes(build):
+    fake = build()
+    warmup = Warmup("lazy")
+
+    async def scenario():
+        task = warmup.start()
+        await asyncio.sleep(0.05)
+        assert not warmup.ready and warmup.sdk is None
+        # a second start joins the running warmup
+        assert warmup.start() is task
+        fake.release.set()
+        assert await warmup.wait() == "sdk 1"
+
+    asyncio.run(scenario())
+    assert warmup.ready and warmup.seconds >= 0.05
+    assert fake.calls == 1
+
+
+def test_failed_warmup_sets_the_error_and_is_retried(build):
+    fake = build(failures=1)
+    fake.release.set()
+    warmup = Warmup("lazy")
+
+    async def scenario():
+        with pytest.raises(RuntimeError, match="graph compilation failed"):
+            await warmup.wait()
+        assert not warmup.ready and warmup.error == "graph compilation failed"
+        return await warmup.wait()
+
+    assert asyncio.run(scenario()) == "sdk 2"
+    assert warmup.ready and warmup.error is None
+
+
+@pytest.mark.parametrize("mode, ready_at_startup", [("eager", True), ("lazy", False)])
+def test_startup_mode(build, monkeypatch, mode, ready_at_startup):
+    from src import app
+
+    fake = build()
+    monkeypatch.setattr(app, "warmup", Warmup(mode))
+    monkeypatch.setattr(app.health, "start", lambda: None)
+    monkeypatch.setattr(app.run_tracker, "drain_on_signal", lambda timeout: False)
+
+    async def scenario():
+        if mode == "eager":
+            fake.release.set()
+        await app.startup()
+        ready = app.warmup.ready
+        fake.release.set()
+        await app.warmup.wait()
+        return ready
+
+    assert asyncio.run(scenario()) is ready_at_startup
+    assert app.warmup.ready
+
+
+def test_real_warmup_compiles_the_graph(monkeypatch):
+    monkeypatch.setattr(graph, "_graph", None)
+    warmup = Warmup("lazy")
+
+    async def scenario():
+        warmup.start()
+        assert not warmup.ready
+        await warmup.wait()
+
+    asyncio.run(scenario())
+    assert warmup.ready and graph.is_graph_compiled()
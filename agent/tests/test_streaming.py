@@ -0,0 +1,45 @@
+import asyncio
+
+import httpx
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.schema.schema import BlogPost
+from src.state.state import AgentState
+from src.utils import streaming
+
+POST = BlogPost(title="The Latest Trends in AI", content="Agents everywhere")
+
+
+class FailingStreamModel:
+    """Stand-in for a structured output model whose stream fails before the first chunk."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+        self.invocations = 0
+
+    async def astream(self, messages, config=None):
+        raise self.error
+        yield  # pragma: no cover
+
+    async def ainvoke(self, messages, config=None):
+        self.invocations += 1
+        return POST
+
+
+def generate(model: FailingStreamModel) -> BlogPost:
+    state = AgentState(messages=[HumanMessage(content="Write a blog post")])
+    return asyncio.run(streaming.stream_blog_post(model, state.messages, state))
+
+
+def test_broken_stream_falls_back_to_one_shot():
+    model = FailingStreamModel(httpx.RemoteProtocolError("peer closed connection"))
+    assert generate(model) == POST
+    assert model.invocations == 1
+
+
+def test_other_errors_are_raised_without_calling_the_model_again():
+    model = FailingStreamModel(ValueError("401 invalid api key"))
+    with pytest.raises(ValueError):
+        generate(model)
+    assert model.invocations == 0
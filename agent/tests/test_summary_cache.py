@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from src.cache.summary_cache import FileBackend, MemoryBackend, SQLiteBackend, SummaryCache
+from src.schema.schema import SearchResult
+
+RESULTS = {"hits": [{"url": "https://example.com", "snippets": ["An example snippet"]}]}
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite", "file"])
+def test_summaries_round_trip_through_every_backend(tmp_path, backend):
+    backends = {"memory": lambda: MemoryBackend(), "sqlite": lambda: SQLiteBackend(str(tmp_path / "summary_cache.sqlite3")), "file": lambda: FileBackend(str(tmp_path / "summary_cache"))}
+    cache = SummaryCache(backends[backend]())
+    result = SearchResult(question="What is LangGraph?", search_result="A library for stateful agents")
+
+    async def scenario():
+        missed = await cache.aget(result.question, RESULTS, "gpt-4o-mini")
+        await cache.aset(RESULTS, "gpt-4o-mini", result)
+        return missed, await cache.aget(result.question, RESULTS, "gpt-4o-mini"), await cache.aget(result.question, RESULTS, "gpt-4o")
+
+    missed, hit, other_model = asyncio.run(scenario())
+
+    assert missed is None and other_model is None
+    assert hit == result
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
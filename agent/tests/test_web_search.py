@@ -0,0 +1,39 @@
+import asyncio
+
+from src.nodes import web_search_node
+from src.schema.schema import SearchResult
+from src.state.state import AgentState
+
+QUESTIONS = ["What are AI agents?", "Which cooking oils have the highest smoke point?", "How do tomatoes grow in greenhouses?"]
+# the first question finishes last and the second never finishes
+DELAYS = {QUESTIONS[0]: 0.1, QUESTIONS[1]: 10, QUESTIONS[2]: 0.0}
+
+
+async def process_question(model, question, index, total, search_semaphore, summary_semaphore):
+    await asyncio.sleep(DELAYS[question])
+    return SearchResult(question=question, search_result=f"Answer {index}")
+
+
+def test_slow_question_times_out_to_none(monkeypatch):
+    monkeypatch.setattr(web_search_node, "process_question", process_question)
+    monkeypatch.setattr(web_search_node, "SEARCH_QUESTION_TIMEOUT", 0.2)
+
+    async def scenario():
+        semaphore = asyncio.Semaphore(1)
+        return await web_search_node.process_question_with_timeout(None, QUESTIONS[1], 2, 3, semaphore, semaphore)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_results_keep_question_order_without_timed_out_questions(monkeypatch):
+    async def generate_questions(state):
+        return QUESTIONS
+
+    monkeypatch.setattr(web_search_node, "process_question", process_question)
+    monkeypatch.setattr(web_search_node, "generate_questions", generate_questions)
+    monkeypatch.setattr(web_search_node, "SEARCH_QUESTION_TIMEOUT", 0.2)
+
+    update = asyncio.run(web_search_node.search_web(AgentState()))
+
+    results = update["search_results"].search_results
+    assert [(result.question, result.search_result) for result in results] == [(QUESTIONS[0], "Answer 1"), (QUESTIONS[2], "Answer 3")]
@@ -27,4 +27,5 @@ export interface AgentState {
   blog_post: BlogPost;
   route: string | null;
   search_results: SearchResults;
+  generation_mode?: string | null;
 } 
\ No newline at end of file